@@ -6,3 +6,6 @@ from pathlib import Path
 if "DATABASE_URL" not in os.environ:
     sqlite_path = Path(__file__).resolve().parent / "test.sqlite3"
     os.environ["DATABASE_URL"] = f"sqlite:///{sqlite_path}"
+    # A second SQLite database as "replica1"; tests route to it only when they opt in.
+    replica_path = Path(__file__).resolve().parent / "test_replica.sqlite3"
+    os.environ.setdefault("DATABASE_REPLICA_URLS", f"sqlite:///{replica_path}")
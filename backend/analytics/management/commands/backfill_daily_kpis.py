@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from analytics.tasks import parse_day, backfill_daily_kpis, month_chunks, rebuild_daily_kpis
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild DailyKPI rows for a date range with one grouped query per month. "
+        "Runs inline by default; --async fans the months out to Celery workers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", required=True, help="First day to rebuild (YYYY-MM-DD).")
+        parser.add_argument("--end", required=True, help="Last day to rebuild, inclusive (YYYY-MM-DD).")
+        parser.add_argument(
+            "--async",
+            action="store_true",
+            dest="run_async",
+            help="Queue one Celery task per month instead of running inline.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            first, last = parse_day(options["start"]), parse_day(options["end"])
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+        if last < first:
+            raise CommandError("--end must not be before --start.")
+
+        if options["run_async"]:
+            result = backfill_daily_kpis.delay(first.isoformat(), last.isoformat())
+            self.stdout.write(f"Queued backfill {first}..{last} (task {result.id}).")
+            return
+
+        total = 0
+        for chunk_first, chunk_last in month_chunks(first, last):
+            written = rebuild_daily_kpis(chunk_first, chunk_last)
+            total += written
+            self.stdout.write(f"{chunk_first}..{chunk_last}: {written} days")
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {total} daily KPI rows."))
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0001_initial"),
+        ("core", "0004_orderchange"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyProductKPI",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("units", models.PositiveIntegerField(default=0)),
+                ("revenue", models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ("orders", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_kpis",
+                        to="core.product",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Daily product KPI",
+                "verbose_name_plural": "Daily product KPIs",
+                "ordering": ["-date", "-revenue"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("date", "product"),
+                        name="analytics_dailyproductkpi_date_product_uniq",
+                    )
+                ],
+            },
+        ),
+    ]
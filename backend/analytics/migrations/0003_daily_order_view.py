@@ -0,0 +1,64 @@
+from django.conf import settings
+from django.db import migrations, models
+
+VIEW = "analytics_daily_order_mv"
+
+
+class CreateDailyOrderView(migrations.operations.base.Operation):
+    """
+    Materialized view over paid orders on Postgres (created empty; the first
+    refresh populates it), a plain table with the same columns elsewhere.
+    Days are bucketed in ``TIME_ZONE``, like ``DailyKPI``; recreate the view
+    if that setting changes.
+    """
+
+    reduces_to_sql = False
+    reversible = True
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            schema_editor.create_model(to_state.apps.get_model(app_label, "DailyOrderAggregate"))
+            return
+        quote = schema_editor.quote_name
+        schema_editor.execute(
+            f"CREATE MATERIALIZED VIEW {quote(VIEW)} AS "
+            f"SELECT (created_at AT TIME ZONE {schema_editor.quote_value(settings.TIME_ZONE)})::date AS date, "
+            f"SUM(amount)::numeric(14, 2) AS revenue, COUNT(*)::integer AS orders, now() AS refreshed_at "
+            f"FROM {quote('core_order')} WHERE status = 'paid' GROUP BY 1 WITH NO DATA"
+        )
+        # REFRESH ... CONCURRENTLY requires a unique index.
+        schema_editor.execute(f"CREATE UNIQUE INDEX {quote(VIEW + '_date')} ON {quote(VIEW)} (date)")
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            schema_editor.delete_model(from_state.apps.get_model(app_label, "DailyOrderAggregate"))
+            return
+        schema_editor.execute(f"DROP MATERIALIZED VIEW IF EXISTS {schema_editor.quote_name(VIEW)}")
+
+    def describe(self):
+        return "Create the daily paid-order aggregate view"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0002_dailyproductkpi"),
+        ("core", "0004_orderchange"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyOrderAggregate",
+            fields=[
+                ("date", models.DateField(primary_key=True, serialize=False)),
+                ("revenue", models.DecimalField(decimal_places=2, max_digits=14)),
+                ("orders", models.IntegerField()),
+                ("refreshed_at", models.DateTimeField()),
+            ],
+            options={"db_table": "analytics_daily_order_mv", "managed": False},
+        ),
+        CreateDailyOrderView(),
+    ]
@@ -18,3 +18,44 @@ class DailyKPI(models.Model):
 
     def __str__(self) -> str:
         return f"{self.date} • revenue={self.revenue} orders={self.orders}"
+
+
+class DailyOrderAggregate(models.Model):
+    """
+    Paid revenue and order count per local day, computed by the database.
+    A materialized view on Postgres and a plain table elsewhere; refreshed by
+    ``analytics.tasks.refresh_daily_order_view``. ``refreshed_at`` is the same
+    on every row: the moment of the last refresh.
+    """
+
+    date = models.DateField(primary_key=True)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2)
+    orders = models.IntegerField()
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = "analytics_daily_order_mv"
+
+    def __str__(self) -> str:
+        return f"{self.date} • revenue={self.revenue} orders={self.orders}"
+
+
+class DailyProductKPI(models.Model):
+    date = models.DateField()
+    product = models.ForeignKey("core.Product", on_delete=models.CASCADE, related_name="daily_kpis")
+    units = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    orders = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-date", "-revenue"]
+        constraints = [
+            models.UniqueConstraint(fields=["date", "product"], name="analytics_dailyproductkpi_date_product_uniq"),
+        ]
+        verbose_name = "Daily product KPI"
+        verbose_name_plural = "Daily product KPIs"
+
+    def __str__(self) -> str:
+        return f"{self.date} • product={self.product_id} units={self.units} revenue={self.revenue}"
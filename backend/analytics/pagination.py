@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime
+
+from asgiref.sync import sync_to_async
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _params(request):
+    """Query parameters of a DRF ``Request`` or a plain ``HttpRequest``."""
+    return getattr(request, "query_params", request.GET)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on ``(created_at, id)`` in descending order.
+
+    Each page is one ``WHERE (created_at, id) < cursor ORDER BY ... LIMIT n+1``
+    query: no ``COUNT(*)`` and no ``OFFSET``, so deep pages cost the same as the
+    first one. ``?estimate=1`` adds the planner's row estimate instead of a count.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    ordering = ("-created_at", "-id")
+
+    def __init__(self):
+        self.page_size = api_settings.PAGE_SIZE or 50
+
+    def paginate_queryset(self, queryset, request, view=None):
+        window = self._prepare(queryset, request)
+        self.estimated_count = estimate_count(queryset) if self._wants_estimate(request) else None
+        return self._set_page(list(window))
+
+    async def apaginate_queryset(self, queryset, request):
+        """Async :meth:`paginate_queryset`; accepts a plain ``HttpRequest``."""
+        window = self._prepare(queryset, request)
+        self.estimated_count = (
+            await sync_to_async(estimate_count)(queryset) if self._wants_estimate(request) else None
+        )
+        return self._set_page([row async for row in window])
+
+    def _prepare(self, queryset, request):
+        self.request = request
+        self.page_size = self._page_size(request)
+        position = self._decode(_params(request).get(self.cursor_query_param))
+        queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            created_at, pk = position
+            queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+        return queryset[: self.page_size + 1]
+
+    def _set_page(self, rows: list):
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[: self.page_size]
+        return self.page
+
+    @staticmethod
+    def _wants_estimate(request) -> bool:
+        return _params(request).get("estimate") in ("1", "true")
+
+    def get_paginated_data(self, data) -> dict:
+        payload = {"next": self.get_next_link(), "results": data}
+        if self.estimated_count is not None:
+            payload["estimated_count"] = self.estimated_count
+        return payload
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "estimated_count": {"type": "integer"},
+                "results": schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, "estimate")
+        return replace_query_param(url, self.cursor_query_param, self._encode(last.created_at, last.pk))
+
+    def _page_size(self, request) -> int:
+        try:
+            size = int(_params(request)[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    @staticmethod
+    def _encode(created_at: datetime, pk: int) -> str:
+        raw = json.dumps([created_at.isoformat(), pk]).encode()
+        return base64.urlsafe_b64encode(raw).decode()
+
+    @staticmethod
+    def _decode(cursor: str | None):
+        if not cursor:
+            return None
+        try:
+            created_at, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return datetime.fromisoformat(created_at), int(pk)
+        except (ValueError, TypeError):
+            raise NotFound("Invalid cursor.")
+
+
+def estimate_count(queryset) -> int | None:
+    """
+    Row estimate from the query planner (Postgres only); ``None`` elsewhere.
+    Cheap enough to show "about N orders" without a ``COUNT(*)``.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
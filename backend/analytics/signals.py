@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from datetime import date
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from analytics.models import DailyKPI
+from core.services import kpi_cache
+
+
+@receiver(post_save, sender=DailyKPI)
+@receiver(post_delete, sender=DailyKPI)
+def invalidate_kpis_on_rollup_change(sender, instance: DailyKPI, **kwargs) -> None:
+    day = instance.date
+    if isinstance(day, str):
+        day = date.fromisoformat(day)
+    transaction.on_commit(lambda: kpi_cache.invalidate_day(day))
@@ -1,12 +1,19 @@
 from __future__ import annotations
-from datetime import datetime, time, timedelta
+from datetime import date, datetime, timedelta
 from decimal import Decimal
 
-from celery import shared_task
+from collections import defaultdict
+
+from celery import group, shared_task
+from django.db import transaction
 from django.utils import timezone
 
-from analytics.models import DailyKPI
-from core.services.kpi_service import kpis
+from analytics.models import DailyKPI, DailyProductKPI
+from core.models import OrderChange
+from core.services import daily_order_view, kpi_cache, order_partitions
+from core.services.kpi_service import daily_order_totals
+from core.services.product_kpi_service import daily_product_totals
+from core.services.order_changes import lock_order_changes, read_one_snapshot
 
 
 def _normalize_decimal(value: float | int) -> Decimal:
@@ -32,19 +39,8 @@ def generate_daily_report(self, target_date: str | None = None) -> dict[str, flo
     else:
         day = (timezone.now() - timedelta(days=1)).date()
 
-    start_dt = timezone.make_aware(datetime.combine(day, time.min))
-    end_dt = start_dt + timedelta(days=1)
-
-    aggregates = kpis(start_dt, end_dt)
-
-    report, _created = DailyKPI.objects.update_or_create(
-        date=day,
-        defaults={
-            "revenue": _normalize_decimal(aggregates["revenue"]),
-            "orders": int(aggregates["orders"]),
-            "aov": _normalize_decimal(aggregates["aov"]),
-        },
-    )
+    rebuild_daily_kpis(day, day)
+    report = DailyKPI.objects.get(date=day)
 
     return {
         "date": str(report.date),
@@ -52,3 +48,272 @@ def generate_daily_report(self, target_date: str | None = None) -> dict[str, flo
         "orders": report.orders,
         "aov": float(report.aov),
     }
+
+
+def parse_day(value: str | date) -> date:
+    if isinstance(value, date):
+        return value
+    try:
+        return datetime.fromisoformat(value).date()
+    except ValueError as exc:
+        raise ValueError("Dates must be ISO formatted YYYY-MM-DD") from exc
+
+
+def month_chunks(first: date, last: date) -> list[tuple[date, date]]:
+    """Split ``first..last`` (inclusive) into calendar-month slices."""
+    chunks = []
+    chunk_first = first
+    while chunk_first <= last:
+        next_month = (chunk_first.replace(day=1) + timedelta(days=32)).replace(day=1)
+        chunk_last = min(last, next_month - timedelta(days=1))
+        chunks.append((chunk_first, chunk_last))
+        chunk_first = next_month
+    return chunks
+
+
+def rebuild_daily_kpis(first: date, last: date) -> int:
+    """
+    Recompute ``DailyKPI`` for every day in ``first..last`` with one grouped
+    query and one bulk upsert. Days without orders are written as zeros, and
+    pending ``OrderChange`` rows for those days are discarded because the
+    fresh aggregate already includes them. Returns the number of rows written.
+
+    The aggregates are read from one snapshot before ``lock_order_changes``,
+    which is then held only for the upsert and for trimming the change rows
+    that snapshot saw; later changes stay queued for ``apply_order_changes``.
+    If a drain or another rebuild rewrote one of these rollups in between, or
+    the caller already has a transaction open, the slice is computed under the
+    lock instead.
+
+    Days before ``order_partitions.retention_cutoff()`` are skipped: their
+    orders were detached, so the rollups are the only totals left.
+    """
+    cutoff = order_partitions.retention_cutoff()
+    if cutoff is not None and first < cutoff:
+        first = cutoff
+    if first > last:
+        return 0
+
+    if not transaction.get_connection().in_atomic_block:
+        with transaction.atomic():
+            read_one_snapshot()
+            rows, product_rows = _aggregate(first, last)
+            change_ids = list(_pending_changes(first, last).values_list("id", flat=True))
+            stamps = _rollup_stamps(first, last)
+        with transaction.atomic():
+            lock_order_changes()
+            if _rollup_stamps(first, last) == stamps:
+                return _write_rollups(rows, product_rows, OrderChange.objects.filter(id__in=change_ids))
+
+    with transaction.atomic():
+        lock_order_changes()
+        rows, product_rows = _aggregate(first, last)
+        return _write_rollups(rows, product_rows, _pending_changes(first, last))
+
+
+def _aggregate(first: date, last: date) -> tuple[list[DailyKPI], list[DailyProductKPI]]:
+    rows = _daily_rows(daily_order_totals(first, last), first, last)
+    return rows, _daily_product_rows([row.date for row in rows])
+
+
+def _pending_changes(first: date, last: date):
+    return OrderChange.objects.filter(day__gte=first, day__lte=last)
+
+
+def _rollup_stamps(first: date, last: date) -> dict[date, datetime]:
+    return dict(DailyKPI.objects.filter(date__gte=first, date__lte=last).values_list("date", "updated_at"))
+
+
+def _write_rollups(rows: list[DailyKPI], product_rows: list[DailyProductKPI], changes) -> int:
+    DailyKPI.objects.bulk_create(
+        rows,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=["date"],
+        update_fields=["revenue", "orders", "aov", "updated_at"],
+    )
+    changes.delete()
+    days = [row.date for row in rows]
+    _replace_daily_product_rows(days, product_rows)
+    # bulk_create sends no post_save, so invalidate cached ranges explicitly.
+    transaction.on_commit(lambda: kpi_cache.invalidate_days(days))
+    return len(rows)
+
+
+def rebuild_daily_product_kpis(days: list[date]) -> int:
+    """Replace ``DailyProductKPI`` rows for ``days`` from one grouped item aggregate."""
+    if not days:
+        return 0
+    return _replace_daily_product_rows(days, _daily_product_rows(days))
+
+
+def _daily_product_rows(days: list[date]) -> list[DailyProductKPI]:
+    if not days:
+        return []
+    return [
+        DailyProductKPI(
+            date=row["day"],
+            product_id=row["product_id"],
+            units=row["units"] or 0,
+            revenue=_normalize_decimal(row["revenue"] or 0),
+            orders=row["orders"] or 0,
+        )
+        for row in daily_product_totals(days)
+    ]
+
+
+def _replace_daily_product_rows(days: list[date], rows: list[DailyProductKPI]) -> int:
+    with transaction.atomic():
+        DailyProductKPI.objects.filter(date__in=days).delete()
+        DailyProductKPI.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+def _daily_rows(totals, first: date, last: date) -> list[DailyKPI]:
+    rows = []
+    day = first
+    while day <= last:
+        revenue, orders = totals.get(day, (Decimal("0"), 0))
+        aov = revenue / orders if orders else 0
+        rows.append(
+            DailyKPI(
+                date=day,
+                revenue=_normalize_decimal(revenue),
+                orders=orders,
+                aov=_normalize_decimal(aov),
+            )
+        )
+        day += timedelta(days=1)
+    return rows
+
+
+@shared_task(
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_backoff_max=3600,
+    retry_jitter=True,
+    retry_kwargs={"max_retries": 5},
+)
+def backfill_daily_kpi_chunk(self, first: str, last: str) -> dict[str, str | int]:
+    """Rebuild one contiguous slice of days (at most a month when fanned out)."""
+    written = rebuild_daily_kpis(parse_day(first), parse_day(last))
+    return {"first": first, "last": last, "days": written}
+
+
+@shared_task
+def backfill_daily_kpis(first: str, last: str) -> dict[str, int]:
+    """Fan a date range out to one ``backfill_daily_kpi_chunk`` per month."""
+    chunks = month_chunks(parse_day(first), parse_day(last))
+    group(
+        backfill_daily_kpi_chunk.s(chunk_first.isoformat(), chunk_last.isoformat())
+        for chunk_first, chunk_last in chunks
+    ).apply_async()
+    return {"chunks": len(chunks)}
+
+
+def missing_days(first: date, last: date) -> list[tuple[date, date]]:
+    """Contiguous runs of days in ``first..last`` that have no ``DailyKPI`` row."""
+    present = set(DailyKPI.objects.filter(date__gte=first, date__lte=last).values_list("date", flat=True))
+    runs: list[tuple[date, date]] = []
+    day = first
+    while day <= last:
+        if day not in present:
+            if runs and runs[-1][1] == day - timedelta(days=1):
+                runs[-1] = (runs[-1][0], day)
+            else:
+                runs.append((day, day))
+        day += timedelta(days=1)
+    return runs
+
+
+@shared_task
+def fill_missing_daily_kpis(lookback_days: int = 90) -> dict[str, int]:
+    """Detect days the nightly beat missed and rebuild each gap in one pass."""
+    last = (timezone.now() - timedelta(days=1)).date()
+    first = last - timedelta(days=lookback_days - 1)
+    runs = missing_days(first, last)
+    filled = sum(rebuild_daily_kpis(run_first, run_last) for run_first, run_last in runs)
+    return {"gaps": len(runs), "days": filled}
+
+
+@shared_task(
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_backoff_max=60,
+    retry_kwargs={"max_retries": 5},
+)
+def apply_order_changes(self, batch_size: int = 1000) -> dict[str, int]:
+    """
+    Drain the ``OrderChange`` log in id order and fold per-day deltas into
+    ``DailyKPI``. Days without a rollup row yet are rebuilt from orders instead,
+    which also consumes their pending changes. Runs every few seconds from beat.
+    """
+    applied = 0
+    touched: set[date] = set()
+    while True:
+        with transaction.atomic():
+            lock_order_changes()
+            changes = list(OrderChange.objects.order_by("id")[:batch_size])
+            if not changes:
+                break
+
+            deltas: dict[date, list] = defaultdict(lambda: [Decimal("0"), 0])
+            for change in changes:
+                deltas[change.day][0] += change.revenue_delta
+                deltas[change.day][1] += change.orders_delta
+
+            rows = list(DailyKPI.objects.select_for_update().filter(date__in=deltas))
+            cutoff = order_partitions.retention_cutoff()
+            if cutoff is not None:
+                # Orders of detached days cannot be rebuilt; start from zero.
+                present = {row.date for row in rows}
+                rows += [
+                    DailyKPI.objects.create(date=day, revenue=0, orders=0, aov=0)
+                    for day in sorted(deltas)
+                    if day < cutoff and day not in present
+                ]
+            now = timezone.now()
+            for row in rows:
+                revenue_delta, orders_delta = deltas.pop(row.date)
+                row.revenue = _normalize_decimal(row.revenue + revenue_delta)
+                row.orders = max(row.orders + orders_delta, 0)
+                row.aov = _normalize_decimal(row.revenue / row.orders if row.orders else 0)
+                row.updated_at = now
+            DailyKPI.objects.bulk_update(rows, ["revenue", "orders", "aov", "updated_at"])
+
+            # Product rollups are recomputed for the touched days: OrderItem
+            # rows carry no deltas, but item writes log a zero-delta change.
+            # Detached days keep theirs.
+            rebuild_daily_product_kpis([row.date for row in rows if cutoff is None or row.date >= cutoff])
+            for day in deltas:  # no rollup yet: build it from scratch
+                rebuild_daily_kpis(day, day)
+
+            OrderChange.objects.filter(id__in=[change.id for change in changes]).delete()
+            days = [row.date for row in rows]
+            transaction.on_commit(lambda days=days: kpi_cache.invalidate_days(days))
+
+        applied += len(changes)
+        touched.update(change.day for change in changes)
+        if len(changes) < batch_size:
+            break
+    return {"changes": applied, "days": len(touched)}
+
+
+@shared_task(
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_backoff_max=300,
+    retry_kwargs={"max_retries": 3},
+)
+def refresh_daily_order_view(self) -> dict[str, str]:
+    """Refresh the ``DailyOrderAggregate`` view; scheduled when ``KPI_ROLLUP_SOURCE=order_view``."""
+    return {"mode": daily_order_view.refresh_daily_order_view()}
+
+
+@shared_task
+def maintain_order_partitions() -> dict[str, list[str]]:
+    """Create upcoming ``core_order`` partitions and detach expired ones; a no-op unless partitioned."""
+    return order_partitions.maintain()
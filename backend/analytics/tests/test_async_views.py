@@ -0,0 +1,97 @@
+import threading
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from analytics.models import DailyKPI
+from core.models import Customer, Order
+from core.services.kpi_service import akpis, kpis
+from core.utils.async_db import run_parallel
+
+User = get_user_model()
+
+
+def _at(day: int, hour: int = 0) -> datetime:
+    return datetime(2025, 3, day, hour, tzinfo=dt_timezone.utc)
+
+
+class AsyncAnalyticsViewTests(TestCase):
+    def setUp(self):
+        User.objects.create_user(username="async", password="pass1234")
+        self.client.post("/api/auth/token/", {"username": "async", "password": "pass1234"})
+        self.async_client.cookies = self.client.cookies
+
+        customer = Customer.objects.create(name="Async", email="async@example.com")
+        now = timezone.now()
+        for minutes, amount in ((5, 100), (10, 200), (15, 300)):
+            Order.objects.create(
+                customer=customer, amount=amount, status="paid", created_at=now - timedelta(minutes=minutes)
+            )
+        Order.objects.create(customer=customer, amount=999, status="pending", created_at=now)
+
+    async def test_requires_authentication(self):
+        self.async_client.cookies.clear()
+        response = await self.async_client.get("/api/analytics/async/kpis/")
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("detail", response.json())
+        self.assertIn("WWW-Authenticate", response)
+
+    async def test_kpis_match_sync_view_and_share_its_cache(self):
+        response = await self.async_client.get("/api/analytics/async/kpis/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.json(), {"revenue": 600.0, "orders": 3, "aov": 200.0})
+        self.assertRegex(response["Server-Timing"], r'db;dur=[\d.]+;desc="[1-9]\d* queries"')
+
+        again = await self.async_client.get("/api/analytics/async/kpis/")
+        self.assertEqual(again["X-Cache"], "HIT")
+
+    async def test_orders_use_keyset_pages(self):
+        first = (await self.async_client.get("/api/analytics/async/orders/", {"page_size": 2})).json()
+        self.assertEqual([row["amount"] for row in first["results"]], ["100.00", "200.00"])
+        self.assertIn("cursor=", first["next"])
+
+        path = first["next"].split("testserver", 1)[1]
+        second = (await self.async_client.get(path)).json()
+        self.assertEqual([row["amount"] for row in second["results"]], ["300.00"])
+        self.assertIsNone(second["next"])
+
+    async def test_dashboard_combines_kpis_series_and_orders(self):
+        response = await self.async_client.get("/api/analytics/dashboard/", {"granularity": "day"})
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["kpis"]["orders"], 3)
+        self.assertEqual(sum(bucket["orders"] for bucket in body["series"]["buckets"]), 3)
+        self.assertEqual(len(body["orders"]), 3)
+
+        invalid = await self.async_client.get("/api/analytics/dashboard/", {"granularity": "fortnight"})
+        self.assertEqual(invalid.status_code, 400)
+        self.assertIn("granularity", invalid.json())
+
+
+class AsyncKPIServiceTests(TestCase):
+    async def test_akpis_matches_kpis_with_rollups(self):
+        customer = await Customer.objects.acreate(name="Rollup", email="rollup@example.com")
+        await DailyKPI.objects.acreate(date=date(2025, 3, 2), revenue=1000, orders=4, aov=250)
+        for created_at, amount in ((_at(1, 18), 100), (_at(3, 8), 50), (_at(2, 10), 1)):
+            await Order.objects.acreate(customer=customer, amount=amount, status="paid", created_at=created_at)
+
+        expected = {"revenue": 1150.0, "orders": 6, "aov": round(1150 / 6, 2)}
+        self.assertEqual(await akpis(_at(1, 12), _at(4)), expected)
+        self.assertEqual(await sync_to_async(kpis)(_at(1, 12), _at(4)), expected)
+
+
+class RunParallelTests(TransactionTestCase):
+    async def test_runs_on_a_separate_thread_outside_transactions(self):
+        caller = threading.get_ident()
+        self.assertNotEqual(await run_parallel(threading.get_ident), caller)
+
+    def test_stays_on_the_request_thread_inside_a_transaction(self):
+        with transaction.atomic():
+            Customer.objects.create(name="Tx", email="tx@example.com")
+            names = async_to_sync(run_parallel)(lambda: list(Customer.objects.values_list("name", flat=True)))
+        self.assertEqual(names, ["Tx"])
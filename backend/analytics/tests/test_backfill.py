@@ -0,0 +1,120 @@
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from analytics.models import DailyKPI
+from analytics.tasks import (
+    backfill_daily_kpi_chunk,
+    backfill_daily_kpis,
+    fill_missing_daily_kpis,
+    missing_days,
+    month_chunks,
+    rebuild_daily_kpis,
+)
+from core.models import Customer, Order
+from core.services import kpi_cache
+
+
+class DailyKPIBackfillTests(TestCase):
+    def setUp(self):
+        self.customer = Customer.objects.create(name="Backfill", email="backfill@example.com")
+
+    def _order(self, day: date, amount: int, status: str = "paid") -> None:
+        Order.objects.create(
+            customer=self.customer,
+            amount=amount,
+            status=status,
+            created_at=datetime(day.year, day.month, day.day, 13, tzinfo=dt_timezone.utc),
+        )
+
+    def test_month_chunks(self):
+        self.assertEqual(
+            month_chunks(date(2025, 1, 20), date(2025, 3, 2)),
+            [
+                (date(2025, 1, 20), date(2025, 1, 31)),
+                (date(2025, 2, 1), date(2025, 2, 28)),
+                (date(2025, 3, 1), date(2025, 3, 2)),
+            ],
+        )
+
+    def test_rebuild_upserts_every_day_in_constant_queries(self):
+        DailyKPI.objects.create(date=date(2025, 2, 2), revenue=999, orders=99, aov=10)
+        self._order(date(2025, 2, 1), 100)
+        self._order(date(2025, 2, 1), 50)
+        self._order(date(2025, 2, 3), 30)
+        self._order(date(2025, 2, 3), 70, status="pending")
+
+        with self.assertNumQueries(9):  # fixed cost: 2 grouped SELECTs, writes and savepoints
+            written = rebuild_daily_kpis(date(2025, 2, 1), date(2025, 2, 3))
+
+        self.assertEqual(written, 3)
+        rows = {row.date: row for row in DailyKPI.objects.all()}
+        self.assertEqual(rows[date(2025, 2, 1)].orders, 2)
+        self.assertEqual(float(rows[date(2025, 2, 1)].aov), 75.0)
+        self.assertEqual(rows[date(2025, 2, 2)].orders, 0)
+        self.assertEqual(float(rows[date(2025, 2, 3)].revenue), 30.0)
+
+    def test_backfill_across_a_detached_month_keeps_its_rollups(self):
+        DailyKPI.objects.create(date=date(2025, 1, 31), revenue=500, orders=5, aov=100)
+        self._order(date(2025, 2, 1), 40)
+
+        out = StringIO()
+        with mock.patch("core.services.order_partitions.retention_cutoff", return_value=date(2025, 2, 1)):
+            call_command("backfill_daily_kpis", start="2025-01-30", end="2025-02-02", stdout=out)
+
+        self.assertIn("Rebuilt 2 daily KPI rows.", out.getvalue())
+        rows = {row.date: row for row in DailyKPI.objects.all()}
+        self.assertEqual(sorted(rows), [date(2025, 1, 31), date(2025, 2, 1), date(2025, 2, 2)])
+        self.assertEqual((float(rows[date(2025, 1, 31)].revenue), rows[date(2025, 1, 31)].orders), (500.0, 5))
+        self.assertEqual(rows[date(2025, 2, 1)].orders, 1)
+
+    def test_rebuild_invalidates_cached_ranges(self):
+        kpi_cache.cached_kpis(datetime(2025, 2, 1, tzinfo=dt_timezone.utc), datetime(2025, 2, 2, tzinfo=dt_timezone.utc))
+        self._order(date(2025, 2, 1), 100)
+        with self.captureOnCommitCallbacks(execute=True):
+            rebuild_daily_kpis(date(2025, 2, 1), date(2025, 2, 1))
+
+        data, hit = kpi_cache.cached_kpis(
+            datetime(2025, 2, 1, tzinfo=dt_timezone.utc), datetime(2025, 2, 2, tzinfo=dt_timezone.utc)
+        )
+        self.assertFalse(hit)
+        self.assertEqual(data["orders"], 1)
+
+    def test_backfill_fans_out_one_task_per_month(self):
+        with mock.patch("analytics.tasks.group") as group:
+            result = backfill_daily_kpis.run("2025-01-15", "2025-03-10")
+        self.assertEqual(result, {"chunks": 3})
+        signatures = list(group.call_args.args[0])
+        self.assertEqual([sig.args for sig in signatures][0], ("2025-01-15", "2025-01-31"))
+        group.return_value.apply_async.assert_called_once()
+
+    def test_chunk_task_and_command(self):
+        self._order(date(2025, 1, 31), 10)
+        self.assertEqual(backfill_daily_kpi_chunk.run("2025-01-30", "2025-01-31")["days"], 2)
+
+        out = StringIO()
+        call_command("backfill_daily_kpis", start="2025-01-30", end="2025-02-02", stdout=out)
+        self.assertIn("Rebuilt 4 daily KPI rows.", out.getvalue())
+        self.assertEqual(DailyKPI.objects.count(), 4)
+
+    def test_fill_missing_detects_gaps(self):
+        yesterday = (timezone.now() - timedelta(days=1)).date()
+        for offset in (0, 3):
+            day = yesterday - timedelta(days=offset)
+            DailyKPI.objects.create(date=day, revenue=0, orders=0, aov=0)
+        self._order(yesterday - timedelta(days=1), 40)
+
+        self.assertEqual(
+            missing_days(yesterday - timedelta(days=4), yesterday),
+            [
+                (yesterday - timedelta(days=4), yesterday - timedelta(days=4)),
+                (yesterday - timedelta(days=2), yesterday - timedelta(days=1)),
+            ],
+        )
+        result = fill_missing_daily_kpis.run(lookback_days=5)
+        self.assertEqual(result, {"gaps": 2, "days": 3})
+        self.assertEqual(DailyKPI.objects.get(date=yesterday - timedelta(days=1)).orders, 1)
@@ -0,0 +1,74 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import Customer, Order
+
+User = get_user_model()
+
+COHORTS_URL = "/api/analytics/cohorts/"
+RANGE = {"start": "2025-01-01T00:00:00", "end": "2025-03-15T00:00:00"}
+
+
+def _at(month: int, day: int = 10) -> datetime:
+    return datetime(2025, month, day, 12, tzinfo=dt_timezone.utc)
+
+
+class CohortTests(APITestCase):
+    """🧮 Cohort retention matrix"""
+
+    def setUp(self):
+        self.client.force_authenticate(User.objects.create_user(username="cohorts", password="pass1234"))
+
+    def _customer(self, name: str, orders) -> None:
+        customer = Customer.objects.create(name=name, email=f"{name}@example.com")
+        for created_at, amount, *order_status in orders:
+            Order.objects.create(
+                customer=customer,
+                amount=amount,
+                status=order_status[0] if order_status else "paid",
+                created_at=created_at,
+            )
+
+    def test_matrix_in_one_query(self):
+        self._customer("ann", [(_at(1), 10), (_at(1, 20), 5), (_at(3), 20)])
+        self._customer("bob", [(_at(1), 30), (_at(2), 40)])
+        self._customer("cat", [(_at(2), 50), (_at(4), 60)])  # April is after `end`
+        self._customer("dan", [(datetime(2024, 12, 1, tzinfo=dt_timezone.utc), 1), (_at(1), 1)])  # older cohort
+        self._customer("eve", [(_at(1), 70, "pending"), (_at(2), 80)])  # first *paid* order is February
+
+        with self.assertNumQueries(1):
+            response = self.client.get(COHORTS_URL, RANGE)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        january, february = response.data["cohorts"]
+        self.assertEqual(january["cohort"], "2025-01")
+        self.assertEqual(january["customers"], 2)
+        self.assertEqual([p["customers"] for p in january["periods"]], [2, 1, 1])
+        self.assertEqual([p["retention"] for p in january["periods"]], [1.0, 0.5, 0.5])
+        self.assertEqual([p["revenue"] for p in january["periods"]], [45.0, 40.0, 20.0])
+        self.assertEqual([p["month"] for p in january["periods"]], ["2025-01", "2025-02", "2025-03"])
+
+        self.assertEqual(february["customers"], 2)
+        self.assertEqual([p["customers"] for p in february["periods"]], [2, 0])
+
+    def test_matrix_is_cached_per_range(self):
+        self._customer("ann", [(_at(1), 10)])
+        self.assertEqual(self.client.get(COHORTS_URL, RANGE)["X-Cache"], "MISS")
+        self.assertEqual(self.client.get(COHORTS_URL, RANGE)["X-Cache"], "HIT")
+
+    def test_earlier_order_outside_the_range_invalidates_the_matrix(self):
+        self._customer("ann", [(_at(2), 10)])
+        self.assertEqual(len(self.client.get(COHORTS_URL, RANGE).data["cohorts"]), 1)
+
+        # Ann's first paid order moves to before ``start``: she leaves every cohort.
+        with self.captureOnCommitCallbacks(execute=True):
+            Order.objects.create(
+                customer=Customer.objects.get(), amount=5, created_at=datetime(2024, 6, 1, tzinfo=dt_timezone.utc)
+            )
+
+        response = self.client.get(COHORTS_URL, RANGE)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["cohorts"], [])
@@ -0,0 +1,122 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from analytics.tasks import apply_order_changes, refresh_daily_order_view
+from core.models import Customer, Order
+
+User = get_user_model()
+
+KPIS = "/api/analytics/kpis/?start=2025-03-01T00:00:00&end=2025-03-08T00:00:00"
+ORDERS = "/api/analytics/orders/"
+
+
+def _at(day: int, hour: int = 12) -> datetime:
+    return datetime(2025, 3, day, hour, tzinfo=dt_timezone.utc)
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.client.force_authenticate(User.objects.create_user(username="poller", password="x"))
+        self.customer = Customer.objects.create(name="Poll", email="poll@example.com")
+        self._order(_at(2), 100)
+
+    def _order(self, created_at: datetime, amount: int) -> Order:
+        with self.captureOnCommitCallbacks(execute=True):
+            return Order.objects.create(
+                customer=self.customer, amount=amount, status="paid", created_at=created_at
+            )
+
+    def _revalidate(self, url: str):
+        etag = self.client.get(url)["ETag"]
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        return etag, response, ctx.captured_queries
+
+    def test_kpis_304_skips_the_database(self):
+        etag, response, queries = self._revalidate(KPIS)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertIn("no-cache", response["Cache-Control"])
+        self.assertNotIn("X-Cache", response)
+        # The ETag comes from the cache generations alone.
+        self.assertEqual(queries, [])
+
+    def test_kpis_etag_changes_with_data_in_range_only(self):
+        etag = self.client.get(KPIS)["ETag"]
+
+        self._order(_at(20), 50)  # outside the range
+        self.assertEqual(self.client.get(KPIS, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self._order(_at(3), 50)
+        response = self.client.get(KPIS, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["revenue"], 150)
+        self.assertNotEqual(response["ETag"], etag)
+
+    @override_settings(KPI_ROLLUP_SOURCE="order_view")
+    def test_kpis_etag_moves_when_the_order_view_is_refreshed(self):
+        refresh_daily_order_view.run()
+        order = Order.objects.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            order.amount = 500
+            order.save()
+        apply_order_changes.run()
+
+        stale = self.client.get(KPIS)
+        self.assertEqual(stale.data["revenue"], 100)  # the view is not refreshed yet
+
+        with self.captureOnCommitCallbacks(execute=True):
+            refresh_daily_order_view.run()
+        response = self.client.get(KPIS, HTTP_IF_NONE_MATCH=stale["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["revenue"], 500)
+
+    def test_kpis_etag_depends_on_the_query(self):
+        plain = self.client.get(KPIS)
+        compared = self.client.get(f"{KPIS}&compare=previous")
+
+        self.assertNotEqual(plain["ETag"], compared["ETag"])
+        self.assertEqual(self.client.get(f"{KPIS}&compare=bogus").status_code, 400)
+
+    def test_orders_304_and_last_modified(self):
+        etag, response, queries = self._revalidate(ORDERS)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertIn("Last-Modified", response)
+        # Only the watermark's MAX(updated_at) touches the table, never a page.
+        self.assertFalse([q for q in queries if '"core_order"."amount"' in q["sql"]])
+
+    def test_orders_etag_moves_on_write_and_on_drain(self):
+        first = self.client.get(ORDERS)["ETag"]
+        self._order(_at(4), 10)
+        second = self.client.get(ORDERS)["ETag"]
+        apply_order_changes.run()
+        third = self.client.get(ORDERS)["ETag"]
+
+        self.assertEqual(len({first, second, third}), 3)
+        self.assertEqual(self.client.get(ORDERS, HTTP_IF_NONE_MATCH=third).status_code, 304)
+
+    def test_orders_etag_moves_on_listed_fields_and_bulk_writes(self):
+        etags = [self.client.get(ORDERS)["ETag"]]
+
+        self.customer.name = "Renamed"
+        self.customer.save()
+        etags.append(self.client.get(ORDERS)["ETag"])
+
+        other = Customer.objects.create(name="Other", email="other@example.com")
+        etags.append(self.client.get(ORDERS)["ETag"])
+        order = Order.objects.get()
+        order.customer = other
+        order.save()
+        etags.append(self.client.get(ORDERS)["ETag"])
+
+        Order.objects.bulk_create([Order(customer=other, amount=5, status="paid", created_at=_at(3))])
+        etags.append(self.client.get(ORDERS)["ETag"])
+
+        self.assertEqual(len(set(etags)), len(etags))
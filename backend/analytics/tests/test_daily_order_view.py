@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+
+from analytics.models import DailyKPI, DailyOrderAggregate
+from analytics.tasks import refresh_daily_order_view
+from core.models import Customer, Order
+from core.services import kpi_cache
+from core.services.kpi_service import compare_kpis, day_start, kpis
+
+
+def _at(day: int, hour: int = 12) -> datetime:
+    return datetime(2025, 3, day, hour, tzinfo=dt_timezone.utc)
+
+
+@override_settings(KPI_ROLLUP_SOURCE="order_view")
+class DailyOrderViewTests(TestCase):
+    def setUp(self):
+        customer = Customer.objects.create(name="View", email="view@example.com")
+        orders = ((1, 100, "paid"), (1, 50, "paid"), (2, 80, "paid"), (2, 999, "pending"), (3, 20, "paid"))
+        for day, amount, status in orders:
+            Order.objects.create(customer=customer, amount=amount, status=status, created_at=_at(day))
+
+    def _sentinel(self, day: int, revenue: str = "1000.00") -> None:
+        # A value no raw aggregate could produce proves where a day was read from.
+        DailyOrderAggregate.objects.filter(date=_at(day).date()).update(revenue=Decimal(revenue))
+
+    def test_refresh_aggregates_paid_orders_per_day(self):
+        self.assertEqual(refresh_daily_order_view.run(), {"mode": "table"})
+
+        rows = {row.date.day: (row.revenue, row.orders) for row in DailyOrderAggregate.objects.order_by("date")}
+        self.assertEqual(rows, {1: (Decimal("150.00"), 2), 2: (Decimal("80.00"), 1), 3: (Decimal("20.00"), 1)})
+
+    def test_refresh_invalidates_cached_ranges_of_changed_days(self):
+        refresh_daily_order_view.run()
+        kpi_cache.cached_kpis(_at(1, 0), _at(2, 0))
+        kpi_cache.cached_kpis(_at(3, 0), _at(4, 0))
+
+        self._sentinel(1)
+        with self.captureOnCommitCallbacks(execute=True):
+            refresh_daily_order_view.run()
+
+        self.assertFalse(kpi_cache.cached_kpis(_at(1, 0), _at(2, 0))[1])
+        self.assertTrue(kpi_cache.cached_kpis(_at(3, 0), _at(4, 0))[1])
+
+    def test_kpis_read_whole_days_from_the_view(self):
+        before = kpis(_at(1, 0), _at(4, 0))
+        refresh_daily_order_view.run()
+        self.assertEqual(kpis(_at(1, 0), _at(4, 0)), before)
+
+        self._sentinel(2)
+        self.assertEqual(kpis(_at(1, 0), _at(4, 0))["revenue"], 1170.0)
+        self.assertFalse(DailyKPI.objects.exists())
+
+    def test_partial_and_unsettled_days_come_from_orders(self):
+        refresh_daily_order_view.run()
+        self._sentinel(1)
+        self._sentinel(3)
+        almost_midnight = day_start(_at(3).date()) + timedelta(hours=23, minutes=59, seconds=30)
+        DailyOrderAggregate.objects.filter(date=_at(3).date()).update(refreshed_at=almost_midnight)
+
+        # Day 1 is only partly in range; day 3 was refreshed before it settled.
+        self.assertEqual(kpis(_at(1, 6), _at(4, 0))["revenue"], 250.0)
+
+    def test_compare_reads_the_view_too(self):
+        refresh_daily_order_view.run()
+        self._sentinel(1)
+
+        result = compare_kpis(_at(2, 0), _at(3, 0), "previous")
+        self.assertEqual((result["revenue"], result["previous"]["revenue"]), (80.0, 1000.0))
+
+    @override_settings(KPI_ROLLUP_SOURCE="daily_kpi")
+    def test_daily_kpi_remains_the_default_source(self):
+        refresh_daily_order_view.run()
+        self._sentinel(2)
+        self.assertEqual(kpis(_at(1, 0), _at(4, 0))["revenue"], 250.0)
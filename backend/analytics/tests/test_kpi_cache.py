@@ -0,0 +1,118 @@
+from datetime import date, datetime, timezone as dt_timezone
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from analytics.models import DailyKPI
+from core.models import Customer, Order
+from core.services import kpi_cache
+
+User = get_user_model()
+
+
+def _at(day: int, hour: int = 0, minute: int = 0) -> datetime:
+    return datetime(2025, 3, day, hour, minute, tzinfo=dt_timezone.utc)
+
+
+@override_settings(KPI_CACHE_BUCKET_SECONDS=300)
+class KPICacheTests(TestCase):
+    def setUp(self):
+        self.customer = Customer.objects.create(name="Cache", email="cache@example.com")
+
+    def _order(self, created_at: datetime, amount: int) -> Order:
+        with self.captureOnCommitCallbacks(execute=True):
+            return Order.objects.create(
+                customer=self.customer, amount=amount, status="paid", created_at=created_at
+            )
+
+    def test_bucket_now_rounds_up_to_the_bucket_boundary(self):
+        with mock.patch("django.utils.timezone.now", return_value=_at(2, 10, 1)):
+            self.assertEqual(kpi_cache.bucket_now(), _at(2, 10, 5))
+        with mock.patch("django.utils.timezone.now", return_value=_at(2, 10, 5)):
+            self.assertEqual(kpi_cache.bucket_now(), _at(2, 10, 5))
+
+    def test_explicit_ranges_are_computed_exactly(self):
+        self._order(_at(1, 10, 2), 100)
+        self._order(_at(2, 10, 3), 50)
+
+        data, _ = kpi_cache.cached_kpis(_at(1, 10, 3), _at(2, 10, 3))
+        self.assertEqual(data["orders"], 0)
+        data, hit = kpi_cache.cached_kpis(_at(1, 10, 2), _at(2, 10, 4))
+        self.assertFalse(hit)
+        self.assertEqual(data["orders"], 2)
+
+    def test_repeated_requests_hit_cache(self):
+        self._order(_at(1, 12), 100)
+
+        first, hit = kpi_cache.cached_kpis(_at(1, 0, 1), _at(3, 0, 2))
+        self.assertFalse(hit)
+        with self.assertNumQueries(0):
+            second, hit = kpi_cache.cached_kpis(_at(1, 0, 1), _at(3, 0, 2))
+        self.assertTrue(hit)
+        self.assertEqual(first, second)
+        self.assertEqual(kpi_cache.stats(), {"hits": 1, "misses": 1, "hit_ratio": 0.5})
+
+    def test_order_write_invalidates_only_ranges_covering_its_day(self):
+        self._order(_at(1, 12), 100)
+        kpi_cache.cached_kpis(_at(1), _at(2))
+        kpi_cache.cached_kpis(_at(5), _at(6))
+
+        order = self._order(_at(1, 15), 50)
+
+        data, hit = kpi_cache.cached_kpis(_at(1), _at(2))
+        self.assertFalse(hit)
+        self.assertEqual(data["orders"], 2)
+        _, hit = kpi_cache.cached_kpis(_at(5), _at(6))
+        self.assertTrue(hit)
+
+        # Moving an order to another day invalidates both the old and the new day.
+        kpi_cache.cached_kpis(_at(5), _at(6))
+        with self.captureOnCommitCallbacks(execute=True):
+            order.created_at = _at(5, 9)
+            order.save()
+        data, hit = kpi_cache.cached_kpis(_at(1), _at(2))
+        self.assertFalse(hit)
+        self.assertEqual(data["orders"], 1)
+        data, hit = kpi_cache.cached_kpis(_at(5), _at(6))
+        self.assertFalse(hit)
+        self.assertEqual(data["orders"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            order.delete()
+        data, hit = kpi_cache.cached_kpis(_at(5), _at(6))
+        self.assertFalse(hit)
+        self.assertEqual(data["orders"], 0)
+
+    @override_settings(
+        DATABASE_REPLICAS=["replica1"], DATABASE_REPLICA_MAX_LAG=10, DATABASE_REPLICA_LAG_CHECK_INTERVAL=5
+    )
+    def test_recent_writes_stay_on_the_primary_for_lag_plus_check_interval(self):
+        self.assertEqual(kpi_cache._replica_window(), 16)
+
+    def test_rollup_write_invalidates_its_day(self):
+        kpi_cache.cached_kpis(_at(1), _at(3))
+        with self.captureOnCommitCallbacks(execute=True):
+            DailyKPI.objects.create(date=date(2025, 3, 2), revenue=70, orders=7, aov=10)
+
+        data, hit = kpi_cache.cached_kpis(_at(1), _at(3))
+        self.assertFalse(hit)
+        self.assertEqual(data["orders"], 7)
+
+
+@override_settings(KPI_CACHE_BUCKET_SECONDS=3600)
+class KPIViewCacheTests(APITestCase):
+    def setUp(self):
+        self.client.force_authenticate(User.objects.create_user(username="cached", password="pass1234"))
+        customer = Customer.objects.create(name="Cache", email="view-cache@example.com")
+        Order.objects.create(customer=customer, amount=80, status="paid", created_at=timezone.now())
+
+    def test_default_range_is_shared_between_requests(self):
+        first = self.client.get("/api/analytics/kpis/")
+        second = self.client.get("/api/analytics/kpis/")
+
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.data["orders"], 1)
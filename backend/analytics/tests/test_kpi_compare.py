@@ -0,0 +1,89 @@
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APITestCase
+
+from analytics.models import DailyKPI
+from core.models import Customer, Order
+from core.services.kpi_service import compare_kpis, kpis
+
+User = get_user_model()
+
+
+def _at(month: int, day: int, hour: int = 0, year: int = 2025) -> datetime:
+    return datetime(year, month, day, hour, tzinfo=dt_timezone.utc)
+
+
+class CompareKPITests(TestCase):
+    def setUp(self):
+        self.customer = Customer.objects.create(name="Compare", email="compare@example.com")
+
+    def _order(self, created_at: datetime, amount: int, status: str = "paid") -> None:
+        Order.objects.create(customer=self.customer, amount=amount, status=status, created_at=created_at)
+
+    def test_previous_period_in_two_queries(self):
+        DailyKPI.objects.create(date=date(2025, 3, 2), revenue=300, orders=3, aov=100)
+        self._order(_at(3, 4, 12), 100)
+        self._order(_at(3, 5, 12), 50)
+        self._order(_at(3, 1, 12), 80)
+        self._order(_at(3, 3, 12), 20, status="pending")
+
+        with self.assertNumQueries(2):
+            result = compare_kpis(_at(3, 4), _at(3, 7), "previous")
+
+        self.assertEqual(result["orders"], 2)
+        self.assertEqual(result["revenue"], 150.0)
+        previous = result["previous"]
+        self.assertEqual((previous["revenue"], previous["orders"]), (380.0, 4))
+        self.assertEqual(previous["start"], _at(3, 1).isoformat())
+        self.assertEqual(previous["end"], _at(3, 4).isoformat())
+        self.assertEqual(result["delta"], {"revenue": -230.0, "orders": -2, "aov": -20.0})
+        self.assertEqual(result["delta_pct"]["orders"], -50.0)
+
+        self.assertEqual(
+            {key: result[key] for key in ("revenue", "orders", "aov")}, kpis(_at(3, 4), _at(3, 7))
+        )
+        self.assertEqual(
+            {key: previous[key] for key in ("revenue", "orders", "aov")}, kpis(_at(3, 1), _at(3, 4))
+        )
+
+    def test_year_over_year_with_empty_previous_year(self):
+        self._order(_at(3, 10, 9), 40)
+        self._order(_at(3, 10, 9, year=2024), 10)
+
+        result = compare_kpis(_at(3, 10), _at(3, 11), "yoy")
+
+        self.assertEqual(result["previous"]["revenue"], 10.0)
+        self.assertEqual(result["delta"]["revenue"], 30.0)
+        self.assertEqual(result["delta_pct"]["revenue"], 300.0)
+
+        empty = compare_kpis(_at(3, 10), _at(3, 11, year=2025), "previous")
+        self.assertIsNone(empty["delta_pct"]["revenue"])
+
+
+class CompareKPIViewTests(APITestCase):
+    def setUp(self):
+        self.client.force_authenticate(User.objects.create_user(username="cmp", password="pass1234"))
+        customer = Customer.objects.create(name="View", email="view@example.com")
+        Order.objects.create(customer=customer, amount=70, status="paid", created_at=_at(3, 2, 12))
+        self.customer = customer
+
+    def test_compare_param_and_invalidation_of_previous_window(self):
+        params = {"start": "2025-03-03T00:00:00", "end": "2025-03-04T00:00:00", "compare": "previous"}
+        response = self.client.get("/api/analytics/kpis/", params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["previous"]["revenue"], 70.0)
+        self.assertEqual(response["X-Cache"], "MISS")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Order.objects.create(customer=self.customer, amount=30, status="paid", created_at=_at(3, 2, 13))
+
+        response = self.client.get("/api/analytics/kpis/", params)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["previous"]["revenue"], 100.0)
+
+    def test_unknown_compare_mode_is_rejected(self):
+        response = self.client.get("/api/analytics/kpis/", {"compare": "quarter"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("compare", response.data)
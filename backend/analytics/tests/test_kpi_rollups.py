@@ -0,0 +1,63 @@
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.test import TestCase
+
+from analytics.models import DailyKPI
+from core.models import Customer, Order
+from core.services.kpi_service import kpis, plan_range
+
+
+def _at(day: int, hour: int = 0) -> datetime:
+    return datetime(2025, 3, day, hour, tzinfo=dt_timezone.utc)
+
+
+class KPIRollupPlannerTests(TestCase):
+    def setUp(self):
+        self.customer = Customer.objects.create(name="Rollup", email="rollup@example.com")
+
+    def _order(self, created_at: datetime, amount: int, status: str = "paid") -> None:
+        Order.objects.create(customer=self.customer, amount=amount, status=status, created_at=created_at)
+
+    def test_plan_splits_partial_days_and_missing_rollups(self):
+        DailyKPI.objects.create(date=date(2025, 3, 2), revenue=10, orders=1, aov=10)
+        DailyKPI.objects.create(date=date(2025, 3, 4), revenue=20, orders=2, aov=10)
+
+        plan = plan_range(_at(1, 12), _at(5, 6))
+
+        self.assertEqual(sorted(plan.rollups), [date(2025, 3, 2), date(2025, 3, 4)])
+        self.assertEqual(
+            plan.raw_segments,
+            [(_at(1, 12), _at(2)), (_at(3), _at(4)), (_at(5), _at(5, 6))],
+        )
+
+    def test_plan_within_a_single_day_is_raw(self):
+        plan = plan_range(_at(1, 3), _at(1, 9))
+        self.assertEqual(plan.rollups, {})
+        self.assertEqual(plan.raw_segments, [(_at(1, 3), _at(1, 9))])
+
+    def test_kpis_merge_rollups_with_raw_orders(self):
+        # Rollup deliberately differs from raw data to prove which source is read.
+        DailyKPI.objects.create(date=date(2025, 3, 2), revenue=1000, orders=4, aov=250)
+        self._order(_at(2, 10), 1)
+        self._order(_at(1, 18), 100)
+        self._order(_at(3, 8), 50)
+        self._order(_at(3, 9), 70, status="pending")
+        self._order(_at(4, 1), 999)  # outside the window
+
+        with self.assertNumQueries(2):
+            result = kpis(_at(1, 12), _at(4))
+
+        self.assertEqual(result["orders"], 6)
+        self.assertAlmostEqual(result["revenue"], 1150.0)
+        self.assertAlmostEqual(result["aov"], round(1150 / 6, 2))
+
+    def test_kpis_fall_back_to_orders_without_rollups(self):
+        self._order(_at(2, 10), 40)
+        self._order(_at(3, 10), 60)
+
+        result = kpis(_at(1), _at(5))
+
+        self.assertEqual(result, {"revenue": 100.0, "orders": 2, "aov": 50.0})
+
+    def test_kpis_empty_range(self):
+        self.assertEqual(kpis(_at(5), _at(1)), {"revenue": 0.0, "orders": 0, "aov": 0.0})
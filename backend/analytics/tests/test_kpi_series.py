@@ -0,0 +1,94 @@
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from analytics.models import DailyKPI
+from core.models import Customer, Order
+
+User = get_user_model()
+
+SERIES_URL = "/api/analytics/kpis/series/"
+
+
+def _at(day: int, hour: int = 0) -> datetime:
+    return datetime(2025, 3, day, hour, tzinfo=dt_timezone.utc)
+
+
+class KPISeriesTests(APITestCase):
+    """📈 Integration tests for the bucketed KPI series endpoint"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="series", password="pass1234")
+        self.client.force_authenticate(user=self.user)
+        self.customer = Customer.objects.create(name="Series", email="series@example.com")
+
+    def _order(self, created_at: datetime, amount: int) -> None:
+        Order.objects.create(customer=self.customer, amount=amount, status="paid", created_at=created_at)
+
+    def test_daily_series_zero_fills_and_merges_rollups(self):
+        DailyKPI.objects.create(date=date(2025, 3, 2), revenue=300, orders=3, aov=100)
+        self._order(_at(1, 10), 50)
+        self._order(_at(4, 23), 20)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                SERIES_URL, {"start": "2025-03-01T00:00:00", "end": "2025-03-05T00:00:00"}
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        buckets = response.data["buckets"]
+        self.assertEqual([b["bucket"][:10] for b in buckets], ["2025-03-01", "2025-03-02", "2025-03-03", "2025-03-04"])
+        self.assertEqual([b["orders"] for b in buckets], [1, 3, 0, 1])
+        self.assertEqual([b["revenue"] for b in buckets], [50.0, 300.0, 0.0, 20.0])
+        self.assertEqual(buckets[1]["aov"], 100.0)
+
+    def test_monthly_series_groups_days(self):
+        self._order(_at(1, 10), 50)
+        self._order(_at(20, 10), 25)
+
+        response = self.client.get(
+            SERIES_URL,
+            {"start": "2025-02-15T00:00:00", "end": "2025-04-01T00:00:00", "granularity": "month"},
+        )
+
+        buckets = response.data["buckets"]
+        self.assertEqual([b["bucket"][:7] for b in buckets], ["2025-02", "2025-03"])
+        self.assertEqual([b["orders"] for b in buckets], [0, 2])
+
+    def test_series_respects_requested_timezone(self):
+        # 23:30 UTC on the 1st is already the 2nd in Tbilisi (UTC+4).
+        self._order(datetime(2025, 3, 1, 23, 30, tzinfo=dt_timezone.utc), 40)
+
+        response = self.client.get(
+            SERIES_URL,
+            {"start": "2025-03-01T00:00:00", "end": "2025-03-03T00:00:00", "tz": "Asia/Tbilisi"},
+        )
+
+        buckets = response.data["buckets"]
+        self.assertEqual(buckets[0]["bucket"], "2025-03-01T00:00:00+04:00")
+        self.assertEqual([b["orders"] for b in buckets], [0, 1])
+
+    def test_hourly_series(self):
+        self._order(_at(1, 2), 10)
+
+        response = self.client.get(
+            SERIES_URL,
+            {"start": "2025-03-01T00:00:00", "end": "2025-03-01T04:00:00", "granularity": "hour"},
+        )
+
+        self.assertEqual([b["orders"] for b in response.data["buckets"]], [0, 0, 1, 0])
+
+    def test_invalid_parameters_are_rejected(self):
+        response = self.client.get(SERIES_URL, {"granularity": "minute"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(SERIES_URL, {"tz": "Mars/Olympus"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(
+            SERIES_URL,
+            {"start": "2000-01-01T00:00:00", "end": "2025-01-01T00:00:00", "granularity": "hour"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,149 @@
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase, TransactionTestCase
+
+from analytics.models import DailyKPI
+from analytics.tasks import apply_order_changes, rebuild_daily_kpis
+from core.models import Customer, Order, OrderChange
+from core.services import kpi_cache
+
+
+def _at(day: int, hour: int = 12) -> datetime:
+    return datetime(2025, 3, day, hour, tzinfo=dt_timezone.utc)
+
+
+class OrderChangeCaptureTests(TestCase):
+    def setUp(self):
+        self.customer = Customer.objects.create(name="Outbox", email="outbox@example.com")
+
+    def _changes(self):
+        return list(OrderChange.objects.order_by("id").values_list("day", "revenue_delta", "orders_delta"))
+
+    def test_create_edit_and_delete_are_logged_per_day(self):
+        order = Order.objects.create(customer=self.customer, amount=100, status="paid", created_at=_at(1))
+        order.amount = 120
+        order.save(update_fields=["amount"])
+        order.created_at = _at(2)
+        order.save()
+        order.status = "pending"
+        order.save()
+        Order.objects.create(customer=self.customer, amount=5, status="pending", created_at=_at(1))
+        paid = Order.objects.create(customer=self.customer, amount=30, status="paid", created_at=_at(3))
+        paid.delete()
+
+        self.assertEqual(
+            self._changes(),
+            [
+                (date(2025, 3, 1), Decimal("100"), 1),
+                (date(2025, 3, 1), Decimal("20"), 0),
+                (date(2025, 3, 1), Decimal("-120"), -1),
+                (date(2025, 3, 2), Decimal("120"), 1),
+                (date(2025, 3, 2), Decimal("-120"), -1),
+                (date(2025, 3, 3), Decimal("30"), 1),
+                (date(2025, 3, 3), Decimal("-30"), -1),
+            ],
+        )
+
+
+class ApplyOrderChangesTests(TestCase):
+    def setUp(self):
+        self.customer = Customer.objects.create(name="Consumer", email="consumer@example.com")
+
+    def _order(self, created_at: datetime, amount: int) -> Order:
+        return Order.objects.create(customer=self.customer, amount=amount, status="paid", created_at=created_at)
+
+    def test_deltas_fold_into_existing_rollups(self):
+        self._order(_at(1), 100)
+        rebuild_daily_kpis(date(2025, 3, 1), date(2025, 3, 1))
+        self.assertFalse(OrderChange.objects.exists())
+
+        self._order(_at(1, 15), 50)
+        late = self._order(_at(1, 18), 30)
+        late.delete()
+
+        result = apply_order_changes.run()
+
+        self.assertEqual(result, {"changes": 3, "days": 1})
+        row = DailyKPI.objects.get(date=date(2025, 3, 1))
+        self.assertEqual((row.revenue, row.orders, row.aov), (Decimal("150.00"), 2, Decimal("75.00")))
+        self.assertFalse(OrderChange.objects.exists())
+
+    def test_missing_rollup_is_built_from_orders(self):
+        self._order(_at(4), 40)
+        self._order(_at(4, 20), 60)
+
+        apply_order_changes.run()
+
+        row = DailyKPI.objects.get(date=date(2025, 3, 4))
+        self.assertEqual((row.revenue, row.orders), (Decimal("100.00"), 2))
+        self.assertFalse(OrderChange.objects.exists())
+
+    def test_detached_days_take_deltas_without_a_rebuild(self):
+        DailyKPI.objects.create(date=date(2025, 3, 1), revenue=500, orders=5, aov=100)
+        self._order(_at(1), 50)
+        self._order(_at(4), 40)
+
+        with mock.patch("core.services.order_partitions.retention_cutoff", return_value=date(2025, 4, 1)):
+            apply_order_changes.run()
+
+        rows = {row.date: (row.revenue, row.orders) for row in DailyKPI.objects.all()}
+        self.assertEqual(
+            rows,
+            {date(2025, 3, 1): (Decimal("550.00"), 6), date(2025, 3, 4): (Decimal("40.00"), 1)},
+        )
+
+    def test_drains_in_batches_and_invalidates_cache(self):
+        DailyKPI.objects.create(date=date(2025, 3, 5), revenue=0, orders=0, aov=0)
+        for hour in range(5):
+            self._order(_at(5, hour), 10)
+        range_ = (_at(5, 0), _at(6, 0))
+        kpi_cache.cached_kpis(*range_)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            result = apply_order_changes.run(batch_size=2)
+
+        self.assertEqual(result["changes"], 5)
+        self.assertEqual(DailyKPI.objects.get(date=date(2025, 3, 5)).orders, 5)
+        data, hit = kpi_cache.cached_kpis(*range_)
+        self.assertFalse(hit)
+        self.assertEqual(data["orders"], 5)
+
+
+class RebuildLockScopeTests(TransactionTestCase):
+    """Outside a transaction the rebuild aggregates first and locks only to write."""
+
+    def setUp(self):
+        self.customer = Customer.objects.create(name="Rebuild", email="rebuild@example.com")
+        Order.objects.create(customer=self.customer, amount=100, status="paid", created_at=_at(1))
+
+    def test_changes_after_the_snapshot_stay_queued(self):
+        def late_write():
+            Order.objects.create(customer=self.customer, amount=50, status="paid", created_at=_at(1, 15))
+
+        with mock.patch("analytics.tasks.lock_order_changes", side_effect=late_write):
+            rebuild_daily_kpis(date(2025, 3, 1), date(2025, 3, 1))
+
+        self.assertEqual(DailyKPI.objects.get().orders, 1)
+        self.assertEqual(OrderChange.objects.count(), 1)
+
+        apply_order_changes.run()
+        row = DailyKPI.objects.get()
+        self.assertEqual((row.revenue, row.orders), (Decimal("150.00"), 2))
+
+    def test_rollup_rewritten_meanwhile_is_recomputed_under_the_lock(self):
+        calls = []
+
+        def rival_rebuild():
+            calls.append(1)
+            if len(calls) == 1:
+                DailyKPI.objects.create(date=date(2025, 3, 1), revenue=1, orders=1, aov=1)
+
+        with mock.patch("analytics.tasks.lock_order_changes", side_effect=rival_rebuild):
+            rebuild_daily_kpis(date(2025, 3, 1), date(2025, 3, 1))
+
+        self.assertEqual(len(calls), 2)
+        row = DailyKPI.objects.get()
+        self.assertEqual((row.revenue, row.orders), (Decimal("100.00"), 1))
+        self.assertFalse(OrderChange.objects.exists())
@@ -0,0 +1,65 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import Customer, Order
+
+User = get_user_model()
+
+
+class OrderCursorPaginationTests(APITestCase):
+    """🔍 Keyset pagination for the Orders analytics endpoint"""
+
+    def setUp(self):
+        self.client.force_authenticate(User.objects.create_user(username="cursor", password="pass1234"))
+        customers = [
+            Customer.objects.create(name=f"Customer {i}", email=f"cursor{i}@example.com") for i in range(3)
+        ]
+        base = timezone.now()
+        self.orders = []
+        for i in range(7):
+            # Pairs share a timestamp so the id tie-breaker is exercised.
+            self.orders.append(
+                Order.objects.create(
+                    customer=customers[i % 3],
+                    amount=10 + i,
+                    status="paid",
+                    created_at=base - timedelta(minutes=i // 2),
+                )
+            )
+        Order.objects.create(customer=customers[0], amount=5, status="pending", created_at=base)
+
+    def test_walks_all_pages_without_count_or_duplicates(self):
+        seen = []
+        url = "/api/analytics/orders/?pagination=cursor&page_size=3"
+        pages = 0
+        while url:
+            with self.assertNumQueries(2):  # data watermark + page
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            seen.extend(row["id"] for row in response.data["results"])
+            url = response.data["next"]
+            pages += 1
+
+        expected = [o.id for o in sorted(self.orders, key=lambda o: (o.created_at, o.id), reverse=True)]
+        self.assertEqual(seen, expected)
+        self.assertEqual(pages, 3)
+
+    def test_page_number_mode_joins_customer_once(self):
+        with self.assertNumQueries(3):  # data watermark + COUNT + page with the customer join
+            response = self.client.get("/api/analytics/orders/")
+        self.assertEqual(response.data["count"], 7)
+        self.assertEqual(response.data["results"][0]["customer"], "Customer 1")
+
+    def test_estimate_is_null_safe_off_postgres(self):
+        response = self.client.get("/api/analytics/orders/?pagination=cursor&estimate=1")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("estimated_count", response.data)
+
+    def test_invalid_cursor(self):
+        response = self.client.get("/api/analytics/orders/?cursor=not-a-cursor")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
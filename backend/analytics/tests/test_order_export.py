@@ -0,0 +1,75 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone as dt_timezone
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import Customer, Order
+
+User = get_user_model()
+
+RANGE = {"start": "2025-01-01T00:00:00", "end": "2025-04-01T00:00:00"}
+
+
+class OrderExportTests(APITestCase):
+    """📤 Streaming export of orders"""
+
+    def setUp(self):
+        self.client.force_authenticate(User.objects.create_user(username="finance", password="pass1234"))
+        customer = Customer.objects.create(name="Acme, Inc.", email="acme@example.com")
+        for day, amount, state in [(5, 10, "paid"), (20, 25, "paid"), (21, 7, "pending")]:
+            Order.objects.create(
+                customer=customer,
+                amount=amount,
+                status=state,
+                created_at=datetime(2025, 2, day, 12, tzinfo=dt_timezone.utc),
+            )
+        Order.objects.create(
+            customer=customer, amount=99, status="paid", created_at=datetime(2025, 5, 1, tzinfo=dt_timezone.utc)
+        )
+
+    def _body(self, response) -> str:
+        return b"".join(response.streaming_content).decode()
+
+    def test_csv_export_streams_paid_orders_in_range(self):
+        response = self.client.get("/api/analytics/orders/export/csv/", RANGE)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn("orders-2025-01-01-2025-04-01.csv", response["Content-Disposition"])
+        rows = list(csv.reader(io.StringIO(self._body(response))))
+        self.assertEqual(rows[0], ["id", "customer", "amount", "status", "created_at"])
+        self.assertEqual([row[2] for row in rows[1:]], ["10.00", "25.00"])
+        self.assertEqual(rows[1][1], "Acme, Inc.")
+
+    def test_ndjson_export_with_all_statuses(self):
+        response = self.client.get("/api/analytics/orders/export/ndjson/", {**RANGE, "status": "all"})
+
+        records = [json.loads(line) for line in self._body(response).splitlines()]
+        self.assertEqual([r["status"] for r in records], ["paid", "paid", "pending"])
+        self.assertEqual(records[0]["amount"], "10.00")
+
+    def test_rejects_unknown_format_and_status(self):
+        self.assertEqual(
+            self.client.get("/api/analytics/orders/export/xlsx/").status_code, status.HTTP_404_NOT_FOUND
+        )
+        self.assertEqual(
+            self.client.get("/api/analytics/orders/export/csv/", {"status": "bogus"}).status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+    async def test_asgi_export_streams_asynchronously(self):
+        await sync_to_async(self.client.post)("/api/auth/token/", {"username": "finance", "password": "pass1234"})
+        self.async_client.cookies = self.client.cookies
+
+        response = await self.async_client.get("/api/analytics/orders/export/ndjson/", RANGE)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.is_async)
+        body = b"".join([chunk async for chunk in response.streaming_content]).decode()
+        self.assertEqual([json.loads(line)["amount"] for line in body.splitlines()], ["10.00", "25.00"])
@@ -0,0 +1,97 @@
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from analytics.models import DailyKPI, DailyProductKPI
+from analytics.tasks import apply_order_changes, generate_daily_report
+from core.models import Customer, Order, OrderItem, Product
+
+User = get_user_model()
+
+TOP_URL = "/api/analytics/products/top/"
+
+
+def _at(day: int, hour: int = 12) -> datetime:
+    return datetime(2025, 3, day, hour, tzinfo=dt_timezone.utc)
+
+
+class ProductKPITests(APITestCase):
+    """🏆 Product rollups and the top-products endpoint"""
+
+    def setUp(self):
+        self.client.force_authenticate(User.objects.create_user(username="products", password="pass1234"))
+        self.customer = Customer.objects.create(name="Buyer", email="buyer@example.com")
+        self.starter = Product.objects.create(sku="SKU-1", title="Starter", unit_price=10)
+        self.pro = Product.objects.create(sku="SKU-2", title="Pro", unit_price=50)
+
+    def _order(self, created_at: datetime, lines, status: str = "paid") -> Order:
+        order = Order.objects.create(customer=self.customer, status=status, created_at=created_at)
+        for product, qty in lines:
+            OrderItem.objects.create(order=order, product=product, qty=qty, unit_price=product.unit_price)
+        return order
+
+    def test_nightly_task_fills_product_rollups(self):
+        self._order(_at(1), [(self.starter, 3), (self.pro, 1)])
+        self._order(_at(1, 18), [(self.starter, 2)])
+        self._order(_at(1, 19), [(self.pro, 5)], status="pending")
+
+        generate_daily_report.run("2025-03-01")
+
+        rows = {row.product_id: row for row in DailyProductKPI.objects.filter(date=date(2025, 3, 1))}
+        self.assertEqual((rows[self.starter.id].units, rows[self.starter.id].orders), (5, 2))
+        self.assertEqual(rows[self.starter.id].revenue, Decimal("50.00"))
+        self.assertEqual((rows[self.pro.id].units, rows[self.pro.id].revenue), (1, Decimal("50.00")))
+
+    def test_top_products_merge_rollups_with_raw_items(self):
+        # Rollup for the 2nd deliberately disagrees with raw items to prove it is read.
+        DailyKPI.objects.create(date=date(2025, 3, 2), revenue=0, orders=0, aov=0)
+        DailyProductKPI.objects.create(date=date(2025, 3, 2), product=self.starter, units=100, revenue=1000, orders=40)
+        self._order(_at(2), [(self.pro, 1)])
+        self._order(_at(1, 20), [(self.pro, 2)])
+        self._order(_at(3, 6), [(self.starter, 1), (self.pro, 1)])
+
+        response = self.client.get(
+            TOP_URL, {"start": "2025-03-01T12:00:00", "end": "2025-03-03T12:00:00"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["results"]
+        self.assertEqual([r["sku"] for r in results], ["SKU-1", "SKU-2"])
+        self.assertEqual(results[0]["units"], 101)
+        self.assertEqual(results[1], {
+            "product_id": self.pro.id, "sku": "SKU-2", "title": "Pro", "units": 3, "revenue": 150.0, "orders": 2,
+        })
+
+    def test_days_without_product_rollups_are_read_raw(self):
+        # An order rollup from before product rollups existed: no product rows.
+        self._order(_at(2), [(self.pro, 2)])
+        DailyKPI.objects.create(date=date(2025, 3, 2), revenue=100, orders=1, aov=100)
+
+        response = self.client.get(TOP_URL, {"start": "2025-03-02T00:00:00", "end": "2025-03-03T00:00:00"})
+
+        self.assertEqual([(r["sku"], r["units"]) for r in response.data["results"]], [("SKU-2", 2)])
+
+    def test_item_edits_refresh_product_rollups(self):
+        order = self._order(_at(1), [(self.starter, 1)])
+        generate_daily_report.run("2025-03-01")
+        apply_order_changes.run()
+
+        OrderItem.objects.filter(order=order).get().delete()
+        OrderItem.objects.create(order=order, product=self.pro, qty=4, unit_price=self.pro.unit_price)
+        apply_order_changes.run()
+
+        rows = DailyProductKPI.objects.filter(date=date(2025, 3, 1))
+        self.assertEqual([(row.product_id, row.units) for row in rows], [(self.pro.id, 4)])
+
+    def test_rank_by_units_and_limit(self):
+        self._order(_at(1), [(self.starter, 9), (self.pro, 1)])
+
+        response = self.client.get(
+            TOP_URL, {"start": "2025-03-01T00:00:00", "end": "2025-03-02T00:00:00", "by": "units", "limit": 1}
+        )
+
+        self.assertEqual([r["sku"] for r in response.data["results"]], ["SKU-1"])
+        self.assertEqual(self.client.get(TOP_URL, {"by": "margin"}).status_code, status.HTTP_400_BAD_REQUEST)
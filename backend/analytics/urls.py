@@ -1,8 +1,19 @@
 from django.urls import path
-from analytics.views.kpi_views import KPIView
+from analytics.views.async_views import AsyncKPIView, AsyncOrderListView, DashboardView
+from analytics.views.cohort_views import CohortView
+from analytics.views.export_views import OrderExportView
+from analytics.views.kpi_views import KPISeriesView, KPIView
 from analytics.views.order_views import OrderListView
+from analytics.views.product_views import TopProductsView
 
 urlpatterns = [
     path("kpis/", KPIView.as_view(), name="kpis"),
+    path("kpis/series/", KPISeriesView.as_view(), name="kpi-series"),
     path("orders/", OrderListView.as_view(), name="orders"),
+    path("orders/export/<str:fmt>/", OrderExportView.as_view(), name="orders-export"),
+    path("cohorts/", CohortView.as_view(), name="cohorts"),
+    path("products/top/", TopProductsView.as_view(), name="top-products"),
+    path("async/kpis/", AsyncKPIView.as_view(), name="kpis-async"),
+    path("async/orders/", AsyncOrderListView.as_view(), name="orders-async"),
+    path("dashboard/", DashboardView.as_view(), name="dashboard"),
 ]
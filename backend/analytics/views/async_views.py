@@ -0,0 +1,113 @@
+from __future__ import annotations
+import asyncio
+from functools import partial
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.views import View
+from rest_framework.exceptions import APIException, AuthenticationFailed, NotAuthenticated, ValidationError
+from analytics.pagination import KeysetPagination
+from analytics.views.kpi_views import parse_series_params
+from analytics.views.order_views import OrderSerializer, paid_orders
+from core.services.kpi_cache import acached_kpis, bucket_now
+from core.services.kpi_service import kpi_series
+from core.utils.async_db import run_parallel
+from core.utils.date_ranges import parse_range
+from revalyt.authentication import CookieJWTAuthentication
+from revalyt.renderers import dumps
+
+DASHBOARD_RECENT_ORDERS = 10
+
+
+def json_response(data, status: int = 200, headers: dict | None = None) -> HttpResponse:
+    """``JsonResponse`` rendered like the DRF views (orjson when installed)."""
+    return HttpResponse(dumps(data), status=status, headers=headers, content_type="application/json")
+
+
+class AsyncAPIView(View):
+    """
+    Async counterpart of a DRF ``APIView`` for ASGI deployments: same cookie/
+    header JWT authentication and the same error body shapes, but handlers are
+    coroutines, so a slow query awaits instead of holding a worker thread.
+    """
+
+    http_method_names = ["get", "options"]
+    authenticator = CookieJWTAuthentication()
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            await self.authenticate(request)
+            return await super().dispatch(request, *args, **kwargs)
+        except APIException as exc:
+            return self.handle_exception(request, exc)
+
+    async def authenticate(self, request) -> None:
+        result = await sync_to_async(self.authenticator.authenticate)(request)
+        if result is None:
+            raise NotAuthenticated()
+        request.user, request.auth = result
+
+    def handle_exception(self, request, exc: APIException) -> HttpResponse:
+        detail = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+        response = json_response(detail, status=exc.status_code)
+        if isinstance(exc, (NotAuthenticated, AuthenticationFailed)):
+            response["WWW-Authenticate"] = self.authenticator.authenticate_header(request)
+        return response
+
+
+class AsyncKPIView(AsyncAPIView):
+    """
+    📊 Async ``/kpis/``: rollup lookup and raw aggregate on the async ORM,
+    sharing the KPI cache with the sync view. Requires authentication.
+    """
+
+    async def get(self, request):
+        start, end = parse_range(request.GET.get("start"), request.GET.get("end"), now=bucket_now())
+        data, hit = await acached_kpis(start, end)
+        return json_response(data, headers={"X-Cache": "HIT" if hit else "MISS"})
+
+
+class AsyncOrderListView(AsyncAPIView):
+    """
+    📦 Async paid-order listing with keyset pagination (same cursors and
+    payload as ``/orders/?pagination=cursor``). Requires authentication.
+    """
+
+    async def get(self, request):
+        paginator = KeysetPagination()
+        page = await paginator.apaginate_queryset(paid_orders(), request)
+        return json_response(paginator.get_paginated_data(OrderSerializer(page, many=True).data))
+
+
+def _recent_orders(limit: int) -> list[dict]:
+    return OrderSerializer(list(paid_orders()[:limit]), many=True).data
+
+
+class DashboardView(AsyncAPIView):
+    """
+    🧭 KPI totals, a KPI series and the latest orders in one call. The three
+    are independent, so they run concurrently and the response takes about
+    as long as the slowest of them. Accepts the ``/kpis/series/`` parameters.
+    Requires authentication.
+    """
+
+    async def get(self, request):
+        granularity, tz_name, tz = parse_series_params(request.GET)
+        start, end = parse_range(request.GET.get("start"), request.GET.get("end"), tz, now=bucket_now())
+
+        try:
+            (totals, hit), buckets, orders = await asyncio.gather(
+                acached_kpis(start, end),
+                run_parallel(partial(kpi_series, start, end, granularity, tz)),
+                run_parallel(partial(_recent_orders, DASHBOARD_RECENT_ORDERS)),
+            )
+        except ValueError as exc:
+            raise ValidationError({"detail": [str(exc)]})
+
+        return json_response(
+            {
+                "kpis": totals,
+                "series": {"granularity": granularity, "tz": tz_name, "buckets": buckets},
+                "orders": orders,
+            },
+            headers={"X-Cache": "HIT" if hit else "MISS"},
+        )
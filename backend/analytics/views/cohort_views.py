@@ -0,0 +1,27 @@
+from __future__ import annotations
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from core.services.cohort_service import cohort_matrix
+from core.services.kpi_cache import bucket_now, cached_for_range
+from core.utils.date_ranges import parse_range
+
+
+class CohortView(APIView):
+    """
+    🧮 Return a cohort × month retention and revenue matrix, where cohorts are
+    customers grouped by the month of their first paid order.
+    Cached per range. Requires authentication.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        start, end = parse_range(
+            request.query_params.get("start"),
+            request.query_params.get("end"),
+            now=bucket_now(),
+        )
+        # Cohorts start at each customer's first order, which can lie before
+        # ``start``: any order write invalidates them.
+        data, hit = cached_for_range("cohorts", start, end, cohort_matrix, history=True)
+        return Response(data, headers={"X-Cache": "HIT" if hit else "MISS"})
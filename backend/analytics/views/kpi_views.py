@@ -1,15 +1,23 @@
 from __future__ import annotations
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from rest_framework.exceptions import ValidationError
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from core.services.kpi_service import kpis
+from analytics.views.conditional import ConditionalGet
+from core.services.kpi_cache import bucket_now, cached_compare_kpis, cached_kpis, kpis_token
+from core.services.kpi_service import COMPARE_MODES, SERIES_GRANULARITIES, kpi_series
+from core.services.watermarks import Watermark
 from core.utils.date_ranges import parse_range
 
 
 class KPIView(APIView):
     """
     📊 Return computed KPI metrics for the analytics dashboard.
-    Requires authentication.
+    ``?compare=previous|yoy`` adds the comparison window and its deltas.
+    Results are served from the shared KPI cache when possible, and a poll
+    whose ``If-None-Match`` still matches the cache generations of the range
+    gets a 304 without touching the database. Requires authentication.
     """
     permission_classes = [IsAuthenticated]
 
@@ -17,7 +25,71 @@ class KPIView(APIView):
         start, end = parse_range(
             request.query_params.get("start"),
             request.query_params.get("end"),
+            now=bucket_now(),
         )
 
-        data = kpis(start, end)
-        return Response(data)
+        compare = request.query_params.get("compare")
+        if compare is not None and compare not in COMPARE_MODES:
+            raise ValidationError({"compare": [f"Choose one of: {', '.join(COMPARE_MODES)}."]})
+
+        # The ETag covers the range the cache answers for, so default
+        # "last 30 days" polls revalidate once the bucket rolls over, and
+        # moves with every write that would invalidate the cached value.
+        conditional = ConditionalGet(request, Watermark(kpis_token(start, end, compare), None), start, end)
+        not_modified = conditional.not_modified()
+        if not_modified is not None:
+            return not_modified
+
+        if compare is None:
+            data, hit = cached_kpis(start, end)
+        else:
+            data, hit = cached_compare_kpis(start, end, compare)
+        return conditional.apply(Response(data, headers={"X-Cache": "HIT" if hit else "MISS"}))
+
+
+def parse_series_params(params) -> tuple[str, str, ZoneInfo]:
+    """Validate ``granularity`` and ``tz`` query parameters; raises ``ValidationError``."""
+    granularity = params.get("granularity", "day")
+    if granularity not in SERIES_GRANULARITIES:
+        raise ValidationError(
+            {"granularity": [f"Choose one of: {', '.join(SERIES_GRANULARITIES)}."]}
+        )
+
+    tz_name = params.get("tz", "UTC")
+    try:
+        tz = ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValidationError({"tz": [f"Unknown time zone: {tz_name}."]})
+    return granularity, tz_name, tz
+
+
+class KPISeriesView(APIView):
+    """
+    📈 Return revenue/orders/AOV per time bucket (hour, day, week or month).
+    Empty buckets are zero-filled. Requires authentication.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        granularity, tz_name, tz = parse_series_params(request.query_params)
+
+        start, end = parse_range(
+            request.query_params.get("start"),
+            request.query_params.get("end"),
+            tz,
+        )
+
+        try:
+            buckets = kpi_series(start, end, granularity, tz)
+        except ValueError as exc:
+            raise ValidationError({"detail": [str(exc)]})
+
+        return Response(
+            {
+                "granularity": granularity,
+                "tz": tz_name,
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+                "buckets": buckets,
+            }
+        )
@@ -2,7 +2,10 @@ from __future__ import annotations
 from rest_framework import serializers
 from rest_framework.generics import ListAPIView
 from rest_framework.permissions import IsAuthenticated
+from analytics.pagination import KeysetPagination
+from analytics.views.conditional import ConditionalGet
 from core.models import Order
+from core.services.watermarks import order_list_watermark
 
 
 class OrderSerializer(serializers.ModelSerializer):
@@ -15,13 +18,42 @@ class OrderSerializer(serializers.ModelSerializer):
         fields = ["id", "customer", "amount", "status", "created_at"]
 
 
+def paid_orders():
+    """Paid orders newest first, with the customer joined in."""
+    return (
+        Order.objects.filter(status="paid")
+        .select_related("customer")
+        .order_by("-created_at", "-id")
+    )
+
+
 class OrderListView(ListAPIView):
     """
     📦 Return paid orders with pagination for analytics.
+    Page-number pagination by default; ``?pagination=cursor`` (or any request
+    carrying a ``cursor``) switches to keyset pagination without a count query.
+    A matching ``If-None-Match`` gets a 304 before any page is queried.
     Requires authentication.
     """
     serializer_class = OrderSerializer
     permission_classes = [IsAuthenticated]
 
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            params = self.request.query_params
+            if params.get("pagination") == "cursor" or KeysetPagination.cursor_query_param in params:
+                self._paginator = KeysetPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
     def get_queryset(self):
-        return Order.objects.filter(status="paid").order_by("-created_at")
+        return paid_orders()
+
+    def list(self, request, *args, **kwargs):
+        conditional = ConditionalGet(request, order_list_watermark())
+        not_modified = conditional.not_modified()
+        if not_modified is not None:
+            return not_modified
+        return conditional.apply(super().list(request, *args, **kwargs))
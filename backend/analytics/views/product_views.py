@@ -0,0 +1,34 @@
+from __future__ import annotations
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from core.services.product_kpi_service import TOP_PRODUCT_METRICS, top_products
+from core.utils.date_ranges import parse_range
+
+MAX_TOP_PRODUCTS = 100
+
+
+class TopProductsView(APIView):
+    """
+    🏆 Return the best-selling products in a date range, ranked by revenue,
+    units or orders. Reads daily product rollups for whole days.
+    Requires authentication.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        by = request.query_params.get("by", "revenue")
+        if by not in TOP_PRODUCT_METRICS:
+            raise ValidationError({"by": [f"Choose one of: {', '.join(TOP_PRODUCT_METRICS)}."]})
+        try:
+            limit = int(request.query_params.get("limit", 10))
+        except ValueError:
+            raise ValidationError({"limit": ["Must be an integer."]})
+        limit = max(1, min(limit, MAX_TOP_PRODUCTS))
+
+        start, end = parse_range(
+            request.query_params.get("start"),
+            request.query_params.get("end"),
+        )
+        return Response({"by": by, "results": top_products(start, end, limit=limit, by=by)})
@@ -5,6 +5,8 @@ import shutil
 import sys
 from pathlib import Path
 
+import pytest
+
 BASE_DIR = Path(__file__).resolve().parent
 PROJECT_ROOT = BASE_DIR.parent
 
@@ -25,3 +27,26 @@ def pytest_configure(config):  # noqa: D401
     example_file = BASE_DIR / ".env.example"
     if not env_file.exists() and example_file.exists():
         shutil.copy(example_file, env_file)
+
+
+@pytest.fixture(autouse=True)
+def _reset_cache():
+    """Start every test with empty caches; LocMem and the token cache survive between tests otherwise."""
+
+    from django.core.cache import cache
+    from revalyt.authentication import token_cache
+
+    cache.clear()
+    token_cache.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def _primary_reads(settings):
+    """Read from the primary unless a test enables ``DATABASE_REPLICAS`` itself."""
+
+    from revalyt.db_router import reset_lag
+
+    settings.DATABASE_REPLICAS = []
+    reset_lag()
+    yield
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import json
+import platform
+import secrets
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.utils import timezone
+
+from analytics.pagination import KeysetPagination
+from analytics.tasks import generate_daily_report
+from core.models import Order
+from core.services.demo_data import generate_scale_dataset, truncate_sales_data
+from core.services.kpi_service import kpis
+
+BENCHMARK_USERNAME = "benchmark"
+KPI_RANGES = (1, 7, 30, 90, 365)
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def _percentile(samples: list[float], pct: int) -> float:
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[pct - 1]
+
+
+def _git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=settings.BASE_DIR,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the analytics and auth hot paths (kpis(), order list pages, "
+        "generate_daily_report, cookie login/refresh) and write p50/p95 latency, "
+        "query counts and peak Python memory to a JSON file. --seed replaces all "
+        "sales data, so never point it at production. The benchmark user is only "
+        "created with --seed or under DEBUG."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", action="store_true", help="Replace sales data with a synthetic dataset first.")
+        parser.add_argument("--orders", type=int, default=100_000, help="Orders to seed with --seed.")
+        parser.add_argument("--days", type=int, default=365, help="Days to spread seeded orders over.")
+        parser.add_argument("--customers", type=int, default=5_000, help="Customers to seed with --seed.")
+        parser.add_argument("--repeat", type=int, default=20, help="Timed runs per scenario.")
+        parser.add_argument("--output", default="benchmark-results.json", help="Where to write the JSON report.")
+        parser.add_argument("--compare", help="Previous JSON report to print p50 changes against.")
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 1:
+            raise CommandError("--repeat must be >= 1.")
+        if options["seed"]:
+            truncate_sales_data()
+            generate_scale_dataset(
+                orders=options["orders"],
+                days=options["days"],
+                customers=options["customers"],
+            )
+        if not Order.objects.exists():
+            raise CommandError("No orders to benchmark; pass --seed.")
+
+        user = self._ensure_user(create=options["seed"] or settings.DEBUG)
+        results = {}
+        try:
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+                for name, run in self._scenarios().items():
+                    results[name] = self._measure(run, options["repeat"])
+                    self._print(name, results[name])
+        finally:
+            user.set_unusable_password()
+            user.save(update_fields=["password"])
+
+        report = {
+            "commit": _git_commit(),
+            "created_at": timezone.now().isoformat(),
+            "database": connection.vendor,
+            "python": platform.python_version(),
+            "dataset": {"orders": Order.objects.count()},
+            "repeat": options["repeat"],
+            "results": results,
+        }
+        Path(options["output"]).write_text(json.dumps(report, indent=2) + "\n")
+        self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+
+        if options["compare"]:
+            self._compare(json.loads(Path(options["compare"]).read_text()), report)
+
+    def _ensure_user(self, create: bool):
+        """
+        Give the benchmark user a random password that only lives for this run;
+        ``handle`` makes it unusable again once the scenarios are done.
+        """
+        User = get_user_model()
+        user = User.objects.filter(username=BENCHMARK_USERNAME).first()
+        if user is None:
+            if not create:
+                raise CommandError(f'No "{BENCHMARK_USERNAME}" user; pass --seed (or run with DEBUG) to create it.')
+            user = User(username=BENCHMARK_USERNAME, email="benchmark@revalytiq.com", is_active=True)
+        self._password = secrets.token_urlsafe(32)
+        user.set_password(self._password)
+        user.save()
+        return user
+
+    def _scenarios(self):
+        now = timezone.now()
+        scenarios = {}
+        for days in KPI_RANGES:
+            scenarios[f"kpis() {days}d"] = lambda days=days: kpis(now - timedelta(days=days), now)
+
+        yesterday = (now - timedelta(days=1)).date().isoformat()
+        scenarios["generate_daily_report"] = lambda: generate_daily_report.run(yesterday)
+
+        api = self._login()
+        page_size = settings.REST_FRAMEWORK.get("PAGE_SIZE") or 50
+        paid = Order.objects.filter(status="paid").order_by("-created_at", "-id")
+        deep_page = max(1, paid.count() // page_size)
+        scenarios["orders page 1"] = lambda: self._get(api, "/api/analytics/orders/")
+        scenarios[f"orders page {deep_page}"] = lambda: self._get(api, f"/api/analytics/orders/?page={deep_page}")
+        scenarios["orders cursor first"] = lambda: self._get(api, "/api/analytics/orders/?pagination=cursor")
+        anchor = paid[(deep_page - 1) * page_size : (deep_page - 1) * page_size + 1].first()
+        if anchor is not None:
+            cursor = KeysetPagination._encode(anchor.created_at, anchor.pk)
+            scenarios[f"orders cursor at page {deep_page}"] = lambda: self._get(
+                api, f"/api/analytics/orders/?cursor={cursor}"
+            )
+
+        scenarios["auth cookie login"] = self._login
+        scenarios["auth cookie refresh"] = self._refresh
+        return scenarios
+
+    @staticmethod
+    def _get(client: Client, url: str) -> None:
+        response = client.get(url)
+        if response.status_code != 200:
+            raise CommandError(f"GET {url} returned {response.status_code}")
+
+    def _login(self, client: Client | None = None) -> Client:
+        client = client or Client()
+        response = client.post(
+            "/api/auth/token/",
+            data={"username": BENCHMARK_USERNAME, "password": self._password},
+            content_type="application/json",
+        )
+        if response.status_code != 200:
+            raise CommandError(f"Login returned {response.status_code}")
+        return client
+
+    def _refresh(self) -> None:
+        # The client keeps whichever refresh cookie the last rotation issued.
+        if not hasattr(self, "_refresh_client"):
+            self._refresh_client = self._login()
+        response = self._refresh_client.post("/api/auth/token/refresh/", content_type="application/json")
+        if response.status_code != 200:
+            raise CommandError(f"Refresh returned {response.status_code}")
+
+    def _measure(self, run, repeat: int) -> dict[str, float | int]:
+        counter = _QueryCounter()
+        with connection.execute_wrapper(counter):
+            run()  # warm-up; also the run whose queries are counted
+
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            samples.append((time.perf_counter() - started) * 1000)
+
+        tracemalloc.start()
+        try:
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return {
+            "queries": counter.count,
+            "p50_ms": round(_percentile(samples, 50), 3),
+            "p95_ms": round(_percentile(samples, 95), 3),
+            "min_ms": round(min(samples), 3),
+            "peak_kib": round(peak / 1024, 1),
+        }
+
+    def _print(self, name: str, result: dict) -> None:
+        self.stdout.write(
+            f"{name:<32} p50 {result['p50_ms']:>9.2f} ms  p95 {result['p95_ms']:>9.2f} ms  "
+            f"{result['queries']:>3} queries  peak {result['peak_kib']:>9.1f} KiB"
+        )
+
+    def _compare(self, baseline: dict, report: dict) -> None:
+        self.stdout.write(self.style.MIGRATE_HEADING(f"== vs {baseline.get('commit') or 'baseline'} =="))
+        for name, result in report["results"].items():
+            previous = baseline.get("results", {}).get(name)
+            if not previous or not previous["p50_ms"]:
+                continue
+            change = (result["p50_ms"] - previous["p50_ms"]) / previous["p50_ms"] * 100
+            queries = result["queries"] - previous["queries"]
+            self.stdout.write(f"{name:<32} p50 {change:+7.1f}%  queries {queries:+d}")
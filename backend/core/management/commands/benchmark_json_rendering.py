@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import gzip
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from revalyt import compression
+from revalyt.renderers import FastJSONRenderer, orjson
+
+GZIP_LEVEL = 6  # what GZipMiddleware uses
+
+
+def order_page(rows: int, seed: int = 7) -> dict:
+    """A paginated order payload with raw ``Decimal``/``datetime`` values, ``rows`` long."""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+    return {
+        "count": rows,
+        "next": None,
+        "previous": None,
+        "results": [
+            {
+                "id": index,
+                "customer": f"Customer {rng.randint(1, 5000)}",
+                "amount": Decimal(rng.randint(500, 250_000)) / 100,
+                "status": "paid",
+                "created_at": start + timedelta(seconds=rng.randint(0, 365 * 86400), microseconds=rng.randint(0, 999_999)),
+            }
+            for index in range(1, rows + 1)
+        ],
+    }
+
+
+def _cpu_ms(call, repeat: int) -> tuple[float, object]:
+    """Best-of-``repeat`` process CPU time of ``call()`` in milliseconds, plus its result."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.process_time()
+        result = call()
+        best = min(best, time.process_time() - started)
+    return round(best * 1000, 3), result
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare stdlib JSONRenderer with the orjson renderer and gzip/brotli compression "
+        "on synthetic order pages: bytes on the wire and CPU per response."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, nargs="+", default=[50, 10_000], help="Payload sizes to measure.")
+        parser.add_argument("--repeat", type=int, default=20, help="Runs per measurement (best is reported).")
+        parser.add_argument("--output", help="Also write the results as JSON to this path.")
+
+    def handle(self, *args, **options):
+        results = [self._measure(rows, options["repeat"]) for rows in options["rows"]]
+
+        for result in results:
+            self.stdout.write(self.style.MIGRATE_HEADING(f"== {result['rows']} rows =="))
+            for name, entry in result["variants"].items():
+                self.stdout.write(f"{name:<24} {entry['bytes']:>11,} B  {entry['cpu_ms']:>9.3f} ms CPU")
+
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps(results, indent=2) + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+
+    def _measure(self, rows: int, repeat: int) -> dict:
+        payload = order_page(rows)
+        variants = {}
+
+        cpu, stdlib_body = _cpu_ms(lambda: JSONRenderer().render(payload), repeat)
+        variants["json (stdlib)"] = {"bytes": len(stdlib_body), "cpu_ms": cpu}
+        body = stdlib_body
+        if orjson is not None:
+            cpu, body = _cpu_ms(lambda: FastJSONRenderer().render(payload), repeat)
+            variants["json (orjson)"] = {"bytes": len(body), "cpu_ms": cpu}
+
+        cpu, gzipped = _cpu_ms(lambda: gzip.compress(body, compresslevel=GZIP_LEVEL), repeat)
+        variants[f"+ gzip -{GZIP_LEVEL}"] = {"bytes": len(gzipped), "cpu_ms": cpu}
+        if compression.brotli is not None:
+            quality = compression.BROTLI_QUALITY
+            cpu, compressed = _cpu_ms(lambda: compression.brotli.compress(body, quality=quality), repeat)
+            variants[f"+ brotli q{quality}"] = {"bytes": len(compressed), "cpu_ms": cpu}
+
+        return {"rows": rows, "variants": variants}
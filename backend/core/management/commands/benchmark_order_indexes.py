@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import random
+import statistics
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from analytics.views.order_views import paid_orders
+from core.models import Customer, Order
+from core.services.kpi_service import daily_order_totals, paid_orders_in, plan_range
+
+INDEX_NAME = "core_order_paid_created_idx"
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Print EXPLAIN plans and timings for the paid-orders-by-time queries with and "
+        "without the partial index. Never run this against production: the 'before' "
+        "pass drops the index inside a transaction that is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Append this many synthetic orders before measuring (e.g. 3000000).",
+        )
+        parser.add_argument("--days", type=int, default=365, help="Spread seeded orders over N days.")
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument("--repeat", type=int, default=5, help="Timed runs per query.")
+
+    def handle(self, *args, **options):
+        if options["seed"]:
+            self._seed(options["seed"], options["days"], options["batch_size"])
+
+        if not Order.objects.exists():
+            raise CommandError("No orders to benchmark; pass --seed N.")
+
+        queries = self._queries()
+        repeat = options["repeat"]
+
+        try:
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute(f"DROP INDEX {connection.ops.quote_name(INDEX_NAME)}")
+                self._analyze()
+                self._report("WITHOUT index", queries, repeat)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        self._analyze()
+        self._report(f"WITH {INDEX_NAME}", queries, repeat)
+
+    def _queries(self):
+        now = timezone.now()
+        totals = {"revenue": Sum("amount"), "orders": Count("id")}
+        queries = {}
+        for days in (30, 365):
+            # The order aggregate kpis() runs for the days its rollups do not cover.
+            segments = plan_range(now - timedelta(days=days), now).raw_segments
+            if segments:
+                queries[f"kpis() last {days} days (raw segments)"] = (
+                    lambda segments=segments: paid_orders_in(segments).aggregate(**totals)
+                )
+        yesterday = (now - timedelta(days=1)).date()
+        queries["generate_daily_report (1 day)"] = lambda: daily_order_totals(yesterday, yesterday)
+        queries["OrderListView page 1"] = lambda: list(paid_orders()[:50])
+        return queries
+
+    def _report(self, label: str, queries, repeat: int) -> None:
+        self.stdout.write(self.style.MIGRATE_HEADING(f"== {label} =="))
+        for name, run in queries.items():
+            captured: list[tuple[str, tuple]] = []
+
+            def capture(execute, sql, params, many, context, captured=captured):
+                captured.append((sql, params))
+                return execute(sql, params, many, context)
+
+            with connection.execute_wrapper(capture):
+                run()
+
+            samples = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                run()
+                samples.append((time.perf_counter() - started) * 1000)
+
+            self.stdout.write(
+                f"-- {name}: median {statistics.median(samples):.2f} ms "
+                f"(min {min(samples):.2f} ms, {repeat} runs)"
+            )
+            self.stdout.write(self._explain(*captured[-1]))
+
+    def _explain(self, sql: str, params) -> str:
+        if connection.vendor == "postgresql":
+            prefix = "EXPLAIN (ANALYZE, BUFFERS) "
+        elif connection.vendor == "sqlite":
+            prefix = "EXPLAIN QUERY PLAN "
+        else:
+            prefix = "EXPLAIN "
+        with connection.cursor() as cursor:
+            cursor.execute(prefix + sql, params)
+            return "\n".join("  " + " ".join(str(col) for col in row) for row in cursor.fetchall())
+
+    def _analyze(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def _seed(self, total: int, days: int, batch_size: int) -> None:
+        customer, _ = Customer.objects.get_or_create(
+            email="benchmark@example.com", defaults={"name": "Benchmark"}
+        )
+        rng = random.Random(42)
+        now = timezone.now()
+        span = days * 86_400
+        created = 0
+        while created < total:
+            size = min(batch_size, total - created)
+            Order.objects.bulk_create(
+                Order(
+                    customer=customer,
+                    amount=Decimal(rng.randint(500, 50_000)) / 100,
+                    status="paid" if rng.random() < 0.9 else "pending",
+                    created_at=now - timedelta(seconds=rng.randrange(span)),
+                )
+                for _ in range(size)
+            )
+            created += size
+            self.stdout.write(f"seeded {created}/{total}", ending="\r")
+        self.stdout.write("")
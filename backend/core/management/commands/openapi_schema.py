@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from revalyt.schema import generate_schema, schema_file
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the OpenAPI schema served by /api/schema/ to OPENAPI_SCHEMA_FILE. "
+        "--check only compares and fails when the stored file is out of date."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Exit non-zero if the stored schema differs from the generated one.",
+        )
+
+    def handle(self, *args, **options):
+        path = schema_file()
+        generated = generate_schema()
+
+        if options["check"]:
+            if not path.exists() or path.read_bytes() != generated:
+                raise CommandError(f"{path} is out of date; run `python manage.py openapi_schema`.")
+            self.stdout.write(self.style.SUCCESS(f"{path} is up to date."))
+            return
+
+        path.write_bytes(generated)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {path}"))
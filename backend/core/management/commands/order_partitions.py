@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import NotSupportedError
+
+from core.services import order_partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "Manage monthly range partitions of core_order (PostgreSQL only). Without options, "
+        "list the attached partitions. --convert rebuilds the existing table as a partitioned "
+        "one (writes are blocked while rows are copied; run it in a maintenance window after "
+        "`migrate`). --maintain does what the nightly beat task does. --explain reports how "
+        "many partitions the KPI and orders-feed queries read."
+    )
+
+    def add_arguments(self, parser):
+        actions = parser.add_mutually_exclusive_group()
+        actions.add_argument("--convert", action="store_true", help="Partition the existing core_order table.")
+        actions.add_argument(
+            "--maintain",
+            action="store_true",
+            help="Create partitions ahead of time and detach ones past ORDER_PARTITION_RETAIN_MONTHS.",
+        )
+        actions.add_argument("--explain", action="store_true", help="Check partition pruning of the hot queries.")
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=getattr(settings, "ORDER_PARTITION_MONTHS_AHEAD", 3),
+            help="Future months to create partitions for with --convert.",
+        )
+        parser.add_argument("--database", default=None, help="Database alias (default: the router's choice).")
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        try:
+            if options["convert"]:
+                created = order_partitions.convert(options["months_ahead"], using)
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Partitioned {order_partitions.PARENT} into {len(created)} partitions; the old table "
+                        f"is kept as {order_partitions.UNPARTITIONED} until you drop it."
+                    )
+                )
+            elif options["maintain"]:
+                result = order_partitions.maintain(using)
+                self.stdout.write(f"created: {', '.join(result['created']) or '-'}")
+                self.stdout.write(f"detached: {', '.join(result['detached']) or '-'}")
+            elif options["explain"]:
+                self._explain(using)
+            else:
+                self._list(using)
+        except NotSupportedError as exc:
+            raise CommandError(str(exc)) from exc
+
+    def _list(self, using) -> None:
+        if not order_partitions.is_partitioned(using):
+            raise CommandError(f"{order_partitions.PARENT} is not partitioned; see --convert.")
+        for month, name in sorted(order_partitions.partitions(using).items()):
+            start, end = order_partitions.month_bounds(month)
+            self.stdout.write(f"{name}  [{start.isoformat()}, {end.isoformat()})")
+        self.stdout.write(f"{order_partitions.DEFAULT_PARTITION}  (everything else)")
+
+    def _explain(self, using) -> None:
+        pruned = True
+        for row in order_partitions.pruning_report(using):
+            scanned, total = len(row["scanned"]), row["total"]
+            pruned &= scanned < total or total <= 1
+            self.stdout.write(f"-- {row['query']}: {scanned}/{total} partitions read")
+            for name in row["scanned"]:
+                self.stdout.write(f"  {name}")
+        if not pruned:
+            raise CommandError("At least one query read every partition.")
@@ -1,15 +1,19 @@
 from __future__ import annotations
 
 import random
+import time
+from datetime import timedelta
 from decimal import Decimal
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 from django.utils import timezone
 
-from core.models import Customer, Order, OrderItem, Product
+from analytics.tasks import month_chunks, rebuild_daily_kpis
+from core.models import Customer, Order, OrderItem
+from core.services.demo_data import ensure_catalog, generate_scale_dataset, truncate_sales_data
 
 
 class Command(BaseCommand):
@@ -21,6 +25,21 @@ class Command(BaseCommand):
             action="store_true",
             help="Do not raise if the seed already exists; exit quietly instead.",
         )
+        parser.add_argument(
+            "--orders",
+            type=int,
+            help="Scale mode: replace all sales data with this many synthetic orders.",
+        )
+        parser.add_argument("--days", type=int, default=365, help="Scale mode: spread orders over this many days.")
+        parser.add_argument("--customers", type=int, default=10_000, help="Scale mode: number of customers.")
+        parser.add_argument(
+            "--skew",
+            type=float,
+            default=1.1,
+            help="Scale mode: Zipf exponent for customer/product popularity (0 = uniform).",
+        )
+        parser.add_argument("--batch-size", type=int, default=50_000, help="Scale mode: orders per insert batch.")
+        parser.add_argument("--seed", type=int, default=42, help="Scale mode: random seed.")
 
     def handle(self, *args, **options):
         if not getattr(settings, "ENABLE_DEMO_SEED", True):
@@ -69,6 +88,10 @@ class Command(BaseCommand):
             )
             self.stdout.write(f"Created demo user {demo_user.username} / {demo_password}")
 
+        if options["orders"]:
+            self._seed_scale(options)
+            return
+
         with transaction.atomic():
             customers = []
             for i in range(10):
@@ -81,24 +104,7 @@ class Command(BaseCommand):
                 )
                 customers.append(customer)
 
-            catalog = [
-                ("SKU-101", "Starter Plan", Decimal("19.00")),
-                ("SKU-201", "Pro Plan", Decimal("49.00")),
-                ("SKU-301", "Enterprise Plan", Decimal("99.00")),
-                ("SKU-401", "Add-on: Reports", Decimal("9.00")),
-                ("SKU-501", "Add-on: Priority Support", Decimal("15.00")),
-            ]
-            products = []
-            for sku, title, price in catalog:
-                product, _ = Product.objects.get_or_create(
-                    sku=sku,
-                    defaults={
-                        "title": title,
-                        "unit_price": price,
-                        "created_at": timezone.now(),
-                    },
-                )
-                products.append(product)
+            products = ensure_catalog()
 
             OrderItem.objects.all().delete()
             Order.objects.all().delete()
@@ -133,3 +139,35 @@ class Command(BaseCommand):
                     order.save(update_fields=["amount"])
 
         self.stdout.write(self.style.SUCCESS("Demo dataset loaded."))
+
+    def _seed_scale(self, options):
+        if options["orders"] < 0 or options["days"] < 1 or options["customers"] < 1 or options["batch_size"] < 1:
+            raise CommandError("--orders must be >= 0; --days, --customers and --batch-size must be >= 1.")
+
+        started = time.monotonic()
+        truncate_sales_data()
+        self.stdout.write("Cleared orders, customers and rollups.")
+
+        def progress(loaded: int, total: int) -> None:
+            self.stdout.write(f"  {loaded:,}/{total:,} orders ({time.monotonic() - started:.1f}s)")
+
+        counts = generate_scale_dataset(
+            orders=options["orders"],
+            days=options["days"],
+            customers=options["customers"],
+            skew=options["skew"],
+            batch_size=options["batch_size"],
+            seed=options["seed"],
+            progress=progress,
+        )
+
+        today = timezone.localdate()
+        for chunk_first, chunk_last in month_chunks(today - timedelta(days=options["days"]), today):
+            rebuild_daily_kpis(chunk_first, chunk_last)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Scale dataset loaded: {counts['orders']:,} orders, {counts['items']:,} items, "
+                f"{counts['customers']:,} customers in {time.monotonic() - started:.1f}s."
+            )
+        )
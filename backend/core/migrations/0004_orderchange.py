@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_order_paid_created_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OrderChange",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("order_id", models.BigIntegerField()),
+                ("day", models.DateField()),
+                ("revenue_delta", models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ("orders_delta", models.IntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "indexes": [models.Index(fields=["day"], name="core_orderchange_day_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:16
+
+from importlib import import_module
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+AddIndexConcurrentlyOnPostgres = import_module(
+    "core.migrations.0003_order_paid_created_idx"
+).AddIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("core", "0004_orderchange"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customer",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, db_default=django.db.models.functions.datetime.Now(), db_index=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="order",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, db_default=django.db.models.functions.datetime.Now()
+            ),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name="order",
+            index=models.Index(fields=["updated_at"], name="core_order_updated_idx"),
+        ),
+    ]
@@ -1,11 +1,14 @@
 from __future__ import annotations
-from django.db import models
+from django.db import models, router, transaction
+from django.db.models.functions import Now
 from django.utils import timezone
 
 class Customer(models.Model):
     name = models.CharField(max_length=120)
     email = models.EmailField(unique=True)
     created_at = models.DateTimeField(default=timezone.now)
+    # Fingerprinted by the order list's ETag (customer names are listed).
+    updated_at = models.DateTimeField(auto_now=True, db_default=Now(), db_index=True)
 
     def __str__(self) -> str:
         return self.name
@@ -24,10 +27,32 @@ class Order(models.Model):
     amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
     status = models.CharField(max_length=20, choices=[("paid","Paid"),("pending","Pending")], default="paid")
     created_at = models.DateTimeField(default=timezone.now)
+    # The database default covers COPY loads that do not name the column.
+    updated_at = models.DateTimeField(auto_now=True, db_default=Now())
+
+    class Meta:
+        indexes = [
+            # Hot path for KPIs, the orders feed and the nightly rollup: paid
+            # orders ranged/sorted by time. `amount` is a key column so SUMs
+            # can be answered by an index-only scan on every backend.
+            models.Index(
+                fields=["created_at", "amount"],
+                condition=models.Q(status="paid"),
+                name="core_order_paid_created_idx",
+            ),
+            # MAX(updated_at) for the order list's ETag.
+            models.Index(fields=["updated_at"], name="core_order_updated_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"Order #{self.pk} - {self.customer.name}"
 
+    def save(self, *args, **kwargs):
+        # The OrderChange row written by core.signals must commit with the order.
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+
 class OrderItem(models.Model):
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name="items")
     product = models.ForeignKey(Product, on_delete=models.PROTECT, related_name="items")
@@ -37,3 +62,22 @@ class OrderItem(models.Model):
     @property
     def line_total(self):
         return self.qty * self.unit_price
+
+
+class OrderChange(models.Model):
+    """
+    Append-only change log of paid-order contributions per day, written in the
+    same transaction as the order. Drained by ``analytics.tasks.apply_order_changes``.
+    """
+
+    order_id = models.BigIntegerField()
+    day = models.DateField()
+    revenue_delta = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    orders_delta = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["day"], name="core_orderchange_day_idx")]
+
+    def __str__(self) -> str:
+        return f"{self.day} order={self.order_id} revenue={self.revenue_delta:+} orders={self.orders_delta:+}"
@@ -0,0 +1,102 @@
+from __future__ import annotations
+from datetime import datetime
+from decimal import Decimal
+from django.conf import settings
+from django.db import connections, router
+from django.utils import timezone
+from core.models import Order
+
+
+def _month(value) -> tuple[int, int]:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.year, value.month
+
+
+def _month_label(year: int, month: int) -> str:
+    return f"{year:04d}-{month:02d}"
+
+
+def _months_between(start: tuple[int, int], end: tuple[int, int]) -> int:
+    return (end[0] - start[0]) * 12 + end[1] - start[1]
+
+
+def cohort_rows(start: datetime, end: datetime) -> list[tuple[tuple[int, int], tuple[int, int], int, Decimal]]:
+    """
+    ``(cohort_month, order_month, active_customers, revenue)`` for customers whose
+    first paid order falls in ``[start, end)``, from one grouped query: a
+    first-order-per-customer CTE joined back to their orders.
+    """
+    using = router.db_for_read(Order)
+    connection = connections[using]
+    ops = connection.ops
+    qn = ops.quote_name
+    table = qn(Order._meta.db_table)
+    tzname = timezone.get_current_timezone_name() if settings.USE_TZ else None
+
+    cohort_sql, cohort_params = ops.datetime_trunc_sql("month", "f.first_at", (), tzname)
+    period_sql, period_params = ops.datetime_trunc_sql("month", "o.created_at", (), tzname)
+    sql = f"""
+        WITH firsts AS (
+            SELECT customer_id, MIN(created_at) AS first_at
+            FROM {table}
+            WHERE status = %s
+            GROUP BY customer_id
+        )
+        SELECT {cohort_sql} AS cohort,
+               {period_sql} AS period,
+               COUNT(DISTINCT o.customer_id) AS customers,
+               SUM(o.amount) AS revenue
+        FROM {table} o
+        JOIN firsts f ON f.customer_id = o.customer_id
+        WHERE o.status = %s AND f.first_at >= %s AND f.first_at < %s AND o.created_at < %s
+        GROUP BY 1, 2
+        ORDER BY 1, 2
+    """
+    params = [
+        "paid",
+        *cohort_params,
+        *period_params,
+        "paid",
+        ops.adapt_datetimefield_value(start),
+        ops.adapt_datetimefield_value(end),
+        ops.adapt_datetimefield_value(end),
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [
+            (_month(cohort), _month(period), int(customers), Decimal(str(revenue or 0)))
+            for cohort, period, customers, revenue in cursor.fetchall()
+        ]
+
+
+def cohort_matrix(start: datetime, end: datetime) -> dict[str, list]:
+    """
+    Cohort × months-since-first-order matrix of active customers, retention and
+    revenue. Cohorts are first-paid-order months inside ``[start, end)``; every
+    cohort is zero-filled up to the month containing ``end``.
+    """
+    last_month = _month(timezone.localtime(end))
+    cohorts: dict[tuple[int, int], dict[int, tuple[int, Decimal]]] = {}
+    for cohort, period, customers, revenue in cohort_rows(start, end):
+        cohorts.setdefault(cohort, {})[_months_between(cohort, period)] = (customers, revenue)
+
+    matrix = []
+    for cohort in sorted(cohorts):
+        periods = cohorts[cohort]
+        size = periods.get(0, (0, Decimal("0")))[0]
+        row = []
+        for offset in range(_months_between(cohort, last_month) + 1):
+            customers, revenue = periods.get(offset, (0, Decimal("0")))
+            year, month = divmod(cohort[0] * 12 + cohort[1] - 1 + offset, 12)
+            row.append(
+                {
+                    "period": offset,
+                    "month": _month_label(year, month + 1),
+                    "customers": customers,
+                    "retention": round(customers / size, 4) if size else 0.0,
+                    "revenue": float(revenue),
+                }
+            )
+        matrix.append({"cohort": _month_label(*cohort), "customers": size, "periods": row})
+    return {"cohorts": matrix}
@@ -0,0 +1,82 @@
+from __future__ import annotations
+from datetime import date
+from decimal import Decimal
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from analytics.models import DailyOrderAggregate
+from core.models import Order
+
+
+def enabled() -> bool:
+    """Whether ``kpis()`` reads whole days from the view instead of ``DailyKPI``."""
+    return getattr(settings, "KPI_ROLLUP_SOURCE", "daily_kpi") == "order_view"
+
+
+def refresh_daily_order_view(using: str | None = None) -> str:
+    """
+    Recompute ``DailyOrderAggregate``. On Postgres this is ``REFRESH
+    MATERIALIZED VIEW CONCURRENTLY``, which swaps in the new rows without
+    blocking readers (the very first refresh of the empty view cannot be
+    concurrent). Elsewhere the table is rewritten in one transaction from the
+    same grouped aggregate. Days whose totals changed are invalidated in the
+    KPI cache once the refresh commits. Returns how the refresh was done.
+    """
+    using = using or router.db_for_write(DailyOrderAggregate)
+    before = _totals(using)
+    mode = _refresh(using)
+    after = _totals(using)
+    changed = [day for day in before.keys() | after.keys() if before.get(day) != after.get(day)]
+    if changed:
+        # Imported here: kpi_cache -> kpi_service -> this module.
+        from core.services import kpi_cache
+
+        transaction.on_commit(lambda: kpi_cache.invalidate_days(sorted(changed)), using=using)
+    return mode
+
+
+def _totals(using: str) -> dict[date, tuple[Decimal, int]]:
+    rows = DailyOrderAggregate.objects.using(using).values_list("date", "revenue", "orders")
+    return {day: (revenue, orders) for day, revenue, orders in rows}
+
+
+def _refresh(using: str) -> str:
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        table = connection.ops.quote_name(DailyOrderAggregate._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT ispopulated FROM pg_matviews WHERE matviewname = %s",
+                [DailyOrderAggregate._meta.db_table],
+            )
+            row = cursor.fetchone()
+            concurrently = bool(row and row[0])
+            cursor.execute(f"REFRESH MATERIALIZED VIEW {'CONCURRENTLY ' if concurrently else ''}{table}")
+        return "concurrent" if concurrently else "full"
+
+    with transaction.atomic(using=using):
+        refreshed_at = timezone.now()
+        totals = (
+            Order.objects.using(using)
+            .filter(status="paid")
+            .annotate(day=TruncDate("created_at"))
+            .values("day")
+            .annotate(revenue=Sum("amount"), orders=Count("id"))
+            .order_by()
+        )
+        DailyOrderAggregate.objects.using(using).all().delete()
+        DailyOrderAggregate.objects.using(using).bulk_create(
+            (
+                DailyOrderAggregate(
+                    date=row["day"],
+                    revenue=row["revenue"] or Decimal("0"),
+                    orders=row["orders"],
+                    refreshed_at=refreshed_at,
+                )
+                for row in totals
+            ),
+            batch_size=500,
+        )
+    return "table"
@@ -0,0 +1,195 @@
+from __future__ import annotations
+import random
+from collections.abc import Callable
+from datetime import timedelta
+from decimal import Decimal
+from itertools import accumulate
+from django.core.management.color import no_style
+from django.db import connections, router, transaction
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Now
+from django.utils import timezone
+from analytics.models import DailyKPI, DailyProductKPI
+from core.models import Customer, Order, OrderChange, OrderItem, Product
+
+DEMO_CATALOG = [
+    ("SKU-101", "Starter Plan", Decimal("19.00")),
+    ("SKU-201", "Pro Plan", Decimal("49.00")),
+    ("SKU-301", "Enterprise Plan", Decimal("99.00")),
+    ("SKU-401", "Add-on: Reports", Decimal("9.00")),
+    ("SKU-501", "Add-on: Priority Support", Decimal("15.00")),
+]
+
+
+def ensure_catalog() -> list[Product]:
+    products = []
+    for sku, title, price in DEMO_CATALOG:
+        product, _ = Product.objects.get_or_create(
+            sku=sku,
+            defaults={"title": title, "unit_price": price, "created_at": timezone.now()},
+        )
+        products.append(product)
+    return products
+
+
+def truncate_sales_data(using: str | None = None) -> None:
+    """
+    Remove orders, items, customers, the change log and rollups without
+    per-row cascades or signals: one TRUNCATE on Postgres, one DELETE per
+    table elsewhere. On Postgres the TRUNCATE also takes any other table
+    still referencing customers, such as the ``core_order_unpartitioned``
+    heap and detached months left by order partitioning.
+    """
+    using = using or router.db_for_write(Order)
+    connection = connections[using]
+    models = [OrderItem, OrderChange, DailyProductKPI, DailyKPI, Order, Customer]
+    tables = [connection.ops.quote_name(model._meta.db_table) for model in models]
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT DISTINCT c.relname FROM pg_constraint k JOIN pg_class c ON c.oid = k.conrelid "
+                "WHERE k.confrelid = %s::regclass AND k.contype = 'f' AND NOT c.relispartition",
+                [Customer._meta.db_table],
+            )
+            referencing = {connection.ops.quote_name(row[0]) for row in cursor.fetchall()}
+            tables += sorted(referencing - set(tables))
+            cursor.execute(f"TRUNCATE {', '.join(tables)} RESTART IDENTITY")
+        else:
+            for table in tables:
+                cursor.execute(f"DELETE FROM {table}")
+
+
+def _zipf_cum_weights(count: int, skew: float) -> list[float]:
+    """Cumulative weights where rank ``r`` is picked with probability ~ 1 / r**skew."""
+    return list(accumulate(1 / (rank**skew) for rank in range(1, count + 1)))
+
+
+def _next_id(model, using: str) -> int:
+    last = model.objects.using(using).order_by("-id").values_list("id", flat=True).first()
+    return (last or 0) + 1
+
+
+def _copy_rows(connection, model, columns: list[str], rows) -> None:
+    table = connection.ops.quote_name(model._meta.db_table)
+    column_sql = ", ".join(connection.ops.quote_name(column) for column in columns)
+    with connection.cursor() as cursor:
+        with cursor.cursor.copy(f"COPY {table} ({column_sql}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
+
+
+def _insert_rows(connection, model, columns: list[str], rows, use_copy: bool) -> None:
+    if use_copy:
+        _copy_rows(connection, model, columns, rows)
+        return
+    model.objects.using(connection.alias).bulk_create(
+        (model(**dict(zip(columns, row))) for row in rows),
+        batch_size=2000,
+    )
+
+
+def generate_scale_dataset(
+    orders: int,
+    days: int = 365,
+    customers: int = 10_000,
+    skew: float = 1.1,
+    batch_size: int = 50_000,
+    seed: int = 42,
+    using: str | None = None,
+    progress: Callable[[int, int], None] | None = None,
+) -> dict[str, int]:
+    """
+    Load a synthetic dataset of ``orders`` paid/pending orders spread over the
+    last ``days`` days, built batch by batch.
+
+    Rows get explicit ids and are written with Postgres ``COPY`` (``bulk_create``
+    elsewhere); signals are bypassed. ``Order.amount`` is then filled with one
+    ``UPDATE ... SET amount = (SELECT SUM(qty * unit_price) ...)`` statement.
+    Customer and product popularity follow a Zipf-like ``skew`` (0 = uniform).
+    """
+    using = using or router.db_for_write(Order)
+    connection = connections[using]
+    use_copy = connection.vendor == "postgresql"
+    rng = random.Random(seed)
+    now = timezone.now()
+    span = days * 86_400
+
+    products = ensure_catalog()
+    product_weights = _zipf_cum_weights(len(products), skew)
+
+    with transaction.atomic(using=using):
+        first_customer = _next_id(Customer, using)
+        _insert_rows(
+            connection,
+            Customer,
+            ["id", "name", "email", "created_at"],
+            (
+                (
+                    first_customer + i,
+                    f"Customer {first_customer + i}",
+                    f"customer{first_customer + i}@scale.example.com",
+                    now - timedelta(seconds=rng.randrange(span)),
+                )
+                for i in range(customers)
+            ),
+            use_copy,
+        )
+        customer_ids = range(first_customer, first_customer + customers)
+        customer_weights = _zipf_cum_weights(customers, skew)
+
+        first_order = order_id = _next_id(Order, using)
+        first_item = item_id = _next_id(OrderItem, using)
+        loaded = 0
+        while loaded < orders:
+            size = min(batch_size, orders - loaded)
+            chosen = rng.choices(customer_ids, cum_weights=customer_weights, k=size)
+            order_rows = []
+            item_rows = []
+            for customer_id in chosen:
+                order_rows.append(
+                    (
+                        order_id,
+                        customer_id,
+                        Decimal("0"),
+                        "paid" if rng.random() < 0.95 else "pending",
+                        now - timedelta(seconds=rng.randrange(span)),
+                    )
+                )
+                for product in rng.choices(products, cum_weights=product_weights, k=rng.randint(1, 3)):
+                    item_rows.append((item_id, order_id, product.id, rng.randint(1, 5), product.unit_price))
+                    item_id += 1
+                order_id += 1
+
+            _insert_rows(connection, Order, ["id", "customer_id", "amount", "status", "created_at"], order_rows, use_copy)
+            _insert_rows(
+                connection,
+                OrderItem,
+                ["id", "order_id", "product_id", "qty", "unit_price"],
+                item_rows,
+                use_copy,
+            )
+            loaded += size
+            if progress:
+                progress(loaded, orders)
+
+        line_totals = (
+            OrderItem.objects.filter(order_id=OuterRef("pk"))
+            .order_by()
+            .values("order_id")
+            .annotate(total=Sum(F("qty") * F("unit_price")))
+            .values("total")
+        )
+        Order.objects.using(using).filter(id__gte=first_order).update(
+            amount=Coalesce(
+                Subquery(line_totals),
+                Value(Decimal("0")),
+                output_field=DecimalField(max_digits=12, decimal_places=2),
+            ),
+            updated_at=Now(),
+        )
+
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [Customer, Order, OrderItem]):
+                cursor.execute(sql)
+
+    return {"customers": customers, "orders": orders, "items": item_id - first_item}
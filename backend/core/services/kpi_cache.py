@@ -0,0 +1,304 @@
+from __future__ import annotations
+import hashlib
+import logging
+import math
+import time
+from collections.abc import Awaitable, Callable
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from typing import Any
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+from core.services.kpi_service import akpis, compare_kpis, comparison_window, kpis
+from revalyt.db_router import primary_reads
+from revalyt.metrics import observe_cache
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "kpis"
+HITS_KEY = f"{KEY_PREFIX}:stats:hits"
+MISSES_KEY = f"{KEY_PREFIX}:stats:misses"
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+# Extra windows a cached value depends on, derived from the cached range.
+Related = Callable[[datetime, datetime], list[tuple[datetime, datetime]]]
+
+# Generation scope bumped by a write to any day, for values that depend on
+# all of history (e.g. cohorts, which start at each customer's first order).
+ANY_DAY = "any"
+
+
+def _cache():
+    return caches[getattr(settings, "KPI_CACHE_ALIAS", "default")]
+
+
+def _bucket_seconds() -> int:
+    return max(int(getattr(settings, "KPI_CACHE_BUCKET_SECONDS", 300)), 1)
+
+
+def bucket_now() -> datetime:
+    """
+    The current time rounded *up* to a bucket boundary. Pass it as ``now`` to
+    ``parse_range`` so that default "last 30 days" requests made within the
+    same bucket share one key; the window still contains every order up to
+    now, and orders landing later in the bucket invalidate the entry through
+    signals. Explicit ranges are cached for exactly the bounds asked for.
+    """
+    step = timedelta(seconds=_bucket_seconds())
+    return _EPOCH - (_EPOCH - timezone.now()) // step * step
+
+
+def _generation_key(scope: str) -> str:
+    return f"{KEY_PREFIX}:gen:{scope}"
+
+
+def _days(start: datetime, end: datetime) -> list[date]:
+    first = timezone.localtime(start).date()
+    last = timezone.localtime(end - timedelta(microseconds=1)).date()
+    return [first + timedelta(days=offset) for offset in range((last - first).days + 1)]
+
+
+def _recent_key(scope: str) -> str:
+    return f"{KEY_PREFIX}:recent:{scope}"
+
+
+def _replica_window() -> int:
+    """
+    Seconds a replica may still lack a write; 0 when reads never go to replicas.
+    A replica is measured at most ``DATABASE_REPLICA_MAX_LAG`` behind but then
+    used until its next lag check, so it can fall a check interval further back.
+    """
+    if not getattr(settings, "DATABASE_REPLICAS", None):
+        return 0
+    max_lag = getattr(settings, "DATABASE_REPLICA_MAX_LAG", 10)
+    interval = getattr(settings, "DATABASE_REPLICA_LAG_CHECK_INTERVAL", 5)
+    return math.ceil(max_lag + interval) + 1
+
+
+def _scopes(start: datetime, end: datetime, related: Related | None, history: bool = False) -> list[str]:
+    """Generation scopes a cached value depends on: its days, or any day with ``history``."""
+    if history:
+        return [ANY_DAY]
+    days = set(_days(start, end))
+    for window in related(start, end) if related else ():
+        days.update(_days(*window))
+    return [day.isoformat() for day in sorted(days)]
+
+
+def _cache_key(namespace: str, start: datetime, end: datetime, scopes: list[str]) -> str:
+    generations = _cache().get_many([_generation_key(scope) for scope in scopes])
+    return _key_for(namespace, start, end, scopes, generations)
+
+
+async def _acache_key(namespace: str, start: datetime, end: datetime, scopes: list[str]) -> str:
+    generations = await _cache().aget_many([_generation_key(scope) for scope in scopes])
+    return _key_for(namespace, start, end, scopes, generations)
+
+
+def _key_for(namespace: str, start: datetime, end: datetime, scopes: list[str], generations: dict) -> str:
+    stamp = ",".join(str(generations.get(_generation_key(scope), 0)) for scope in scopes)
+    digest = hashlib.sha1(stamp.encode()).hexdigest()[:16]
+    return f"{KEY_PREFIX}:{namespace}:{start.isoformat()}:{end.isoformat()}:{digest}"
+
+
+def _generation_seed() -> int:
+    # Counters start from the clock rather than 0, so one recreated after an
+    # eviction or flush cannot repeat a value a client already holds in an ETag.
+    return time.time_ns()
+
+
+def _bump(key: str, initial: int = 1) -> None:
+    cache = _cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, initial, timeout=None):
+            cache.incr(key)
+
+
+async def _abump(key: str) -> None:
+    cache = _cache()
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        if not await cache.aadd(key, 1, timeout=None):
+            await cache.aincr(key)
+
+
+def invalidate_day(day: date) -> None:
+    """
+    Invalidate every cached range that covers ``day``, and every value cached
+    with ``history`` (one atomic INCR each). With read replicas the day is also
+    marked as recently written, so refills read from the primary until any
+    replica within the allowed lag has the write.
+    """
+    try:
+        for scope in (day.isoformat(), ANY_DAY):
+            _bump(_generation_key(scope), initial=_generation_seed())
+        window = _replica_window()
+        if window:
+            _cache().set_many({_recent_key(day.isoformat()): 1, _recent_key(ANY_DAY): 1}, timeout=window)
+    except Exception:  # pragma: no cover - cache outage must not fail writes
+        logger.warning("Could not invalidate KPI cache for %s", day, exc_info=True)
+
+
+def invalidate_days(days) -> None:
+    for day in days:
+        invalidate_day(day)
+
+
+def invalidate_moment(moment: datetime | None) -> None:
+    if moment is not None:
+        invalidate_day(timezone.localtime(moment).date())
+
+
+def generation_token(start: datetime, end: datetime, related: Related | None = None) -> str:
+    """
+    Fingerprint of the generations behind ``[start, end)`` and ``related``:
+    it moves whenever an entry cached for the range would be invalidated, at
+    the cost of one ``get_many`` and no query. Usable as a ``Watermark`` token.
+    """
+    cache = _cache()
+    keys = [_generation_key(scope) for scope in _scopes(start, end, related)]
+    try:
+        generations = cache.get_many(keys)
+        missing = [key for key in keys if key not in generations]
+        if missing:
+            seed = _generation_seed()
+            for key in missing:
+                cache.add(key, seed, timeout=None)
+            generations.update(cache.get_many(missing))
+    except Exception:  # pragma: no cover - a token that never matches: no 304s while the cache is down
+        logger.warning("KPI cache unavailable; not revalidating", exc_info=True)
+        return f"uncached:{_generation_seed()}"
+    return ",".join(str(generations.get(key, 0)) for key in keys)
+
+
+def cached_for_range(
+    namespace: str,
+    start: datetime,
+    end: datetime,
+    compute: Callable[[datetime, datetime], Any],
+    timeout: int | None = None,
+    related: Related | None = None,
+    history: bool = False,
+) -> tuple[Any, bool]:
+    """
+    Return ``(value, hit)`` for ``compute`` over ``[start, end)``, computing
+    and storing it on a miss.
+
+    Keys embed a generation counter per covered day, so an order write bumps only
+    the days it touches and every range containing that day misses once.
+    ``related`` names further windows (e.g. a comparison period) whose days
+    must also invalidate the entry; ``history`` ties it to writes on any day
+    instead, for values that depend on all of history.
+    """
+    cache = _cache()
+    scopes = _scopes(start, end, related, history)
+
+    try:
+        key = _cache_key(namespace, start, end, scopes)
+        data = cache.get(key)
+    except Exception:  # pragma: no cover - serve uncached while the cache is down
+        logger.warning("KPI cache unavailable; computing directly", exc_info=True)
+        return compute(start, end), False
+
+    if data is not None:
+        _bump(HITS_KEY)
+        observe_cache(namespace, True)
+        return data, True
+
+    _bump(MISSES_KEY)
+    observe_cache(namespace, False)
+    if _replica_window() and cache.get_many([_recent_key(scope) for scope in scopes]):
+        with primary_reads():
+            data = compute(start, end)
+    else:
+        data = compute(start, end)
+    if timeout is None:
+        timeout = getattr(settings, "KPI_CACHE_TTL", 900)
+    cache.set(key, data, timeout=timeout)
+    return data, False
+
+
+async def acached_for_range(
+    namespace: str,
+    start: datetime,
+    end: datetime,
+    compute: Callable[[datetime, datetime], Awaitable[Any]],
+    timeout: int | None = None,
+) -> tuple[Any, bool]:
+    """Async :func:`cached_for_range`; ``compute`` is a coroutine function."""
+    cache = _cache()
+    scopes = _scopes(start, end, None)
+
+    try:
+        key = await _acache_key(namespace, start, end, scopes)
+        data = await cache.aget(key)
+    except Exception:  # pragma: no cover - serve uncached while the cache is down
+        logger.warning("KPI cache unavailable; computing directly", exc_info=True)
+        return await compute(start, end), False
+
+    if data is not None:
+        await _abump(HITS_KEY)
+        observe_cache(namespace, True)
+        return data, True
+
+    await _abump(MISSES_KEY)
+    observe_cache(namespace, False)
+    if _replica_window() and await cache.aget_many([_recent_key(scope) for scope in scopes]):
+        with primary_reads():
+            data = await compute(start, end)
+    else:
+        data = await compute(start, end)
+    if timeout is None:
+        timeout = getattr(settings, "KPI_CACHE_TTL", 900)
+    await cache.aset(key, data, timeout=timeout)
+    return data, False
+
+
+def _comparison(mode: str) -> Related:
+    return lambda start, end: [comparison_window(start, end, mode)]
+
+
+def kpis_token(start: datetime, end: datetime, compare: str | None = None) -> str:
+    """
+    :func:`generation_token` of the days :func:`cached_kpis`, or with
+    ``compare`` :func:`cached_compare_kpis`, depends on.
+    """
+    return generation_token(start, end, _comparison(compare) if compare else None)
+
+
+def cached_compare_kpis(start: datetime, end: datetime, mode: str) -> tuple[dict, bool]:
+    """Return ``(comparison, hit)``; invalidated by writes to either window."""
+    return cached_for_range(
+        f"compare:{mode}",
+        start,
+        end,
+        lambda start, end: compare_kpis(start, end, mode),
+        related=_comparison(mode),
+    )
+
+
+def cached_kpis(start: datetime, end: datetime) -> tuple[dict[str, float | int], bool]:
+    """Return ``(kpis, hit)`` for ``[start, end)``; see :func:`cached_for_range`."""
+    return cached_for_range("totals", start, end, kpis)
+
+
+async def acached_kpis(start: datetime, end: datetime) -> tuple[dict[str, float | int], bool]:
+    """Async :func:`cached_kpis`; shares its cache entries."""
+    return await acached_for_range("totals", start, end, akpis)
+
+
+def stats() -> dict[str, int | float]:
+    """Hit/miss counters shared by every worker using the cache."""
+    counters = _cache().get_many([HITS_KEY, MISSES_KEY])
+    hits = int(counters.get(HITS_KEY, 0))
+    misses = int(counters.get(MISSES_KEY, 0))
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / total, 4) if total else 0.0,
+    }
@@ -1,31 +1,387 @@
 from __future__ import annotations
-from datetime import datetime
-from django.db.models import Sum, Count
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta, tzinfo
+from decimal import Decimal
+from dateutil.relativedelta import relativedelta
+from django.db.models import Q, Sum, Count
+from django.db.models.functions import TruncDate, TruncDay, TruncHour, TruncMonth, TruncWeek
+from django.utils import timezone
+from analytics.models import DailyKPI, DailyOrderAggregate
 from core.models import Order
+from core.services import daily_order_view
 
 
-def kpis(start: datetime, end: datetime) -> dict[str, float | int]:
+@dataclass
+class RangePlan:
     """
-    Compute key business KPIs (Key Performance Indicators)
-    for all paid orders within the given date range.
+    How a ``[start, end)`` window is answered: whole days come from daily
+    rollups (see :func:`_rollup_queryset`), everything else is aggregated from
+    raw orders.
     """
-    qs = Order.objects.filter(
-        created_at__gte=start,
-        created_at__lt=end,
-        status="paid",
-    )
 
-    totals = qs.aggregate(
-        revenue=Sum("amount"),
-        orders=Count("id"),
-    )
+    rollups: dict[date, tuple[Decimal, int]] = field(default_factory=dict)
+    raw_segments: list[tuple[datetime, datetime]] = field(default_factory=list)
+
+
+def day_start(day: date) -> datetime:
+    """Return the aware datetime at which ``day`` begins (same boundary as the nightly task)."""
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _first_boundary_at_or_after(moment: datetime) -> date:
+    local = timezone.localtime(moment)
+    day = local.date()
+    if day_start(day) < moment:
+        day += timedelta(days=1)
+    return day
+
+
+def _rollup_window(start: datetime, end: datetime) -> tuple[date, date] | None:
+    """``[first_day, last_day)`` of whole days inside the range, or ``None`` when there are none."""
+    if end <= start:
+        return None
+    first_day = _first_boundary_at_or_after(start)
+    last_day = timezone.localtime(end).date()  # exclusive: the day `end` falls in
+    return (first_day, last_day) if first_day < last_day else None
+
+
+# Orders are stamped before they commit; a view refresh only trusts days that
+# ended at least this long before it started.
+ORDER_VIEW_SETTLE = timedelta(minutes=1)
+
+
+def _rollup_queryset():
+    """Per-day ``(date, revenue, orders[, refreshed_at])`` rows from the configured rollup source."""
+    if daily_order_view.enabled():
+        return DailyOrderAggregate.objects.values_list("date", "revenue", "orders", "refreshed_at")
+    return DailyKPI.objects.values_list("date", "revenue", "orders")
+
+
+def _rollup_rows(first_day: date, last_day: date):
+    return _rollup_queryset().filter(date__gte=first_day, date__lt=last_day)
+
+
+def _available(rows) -> dict[date, tuple[Decimal, int]]:
+    """
+    Usable rollups by day. View rows for days that had not ended (plus the
+    settle margin) when the view was refreshed are dropped, so those days are
+    aggregated from raw orders instead.
+    """
+    available = {}
+    for row_date, revenue, orders, *refreshed in rows:
+        if refreshed and day_start(row_date + timedelta(days=1)) + ORDER_VIEW_SETTLE > refreshed[0]:
+            continue
+        available[row_date] = (revenue, orders)
+    return available
+
+
+def _build_plan(
+    start: datetime,
+    end: datetime,
+    window: tuple[date, date] | None,
+    available: dict[date, tuple[Decimal, int]],
+) -> RangePlan:
+    plan = RangePlan()
+    if end <= start:
+        return plan
+    if window is None:
+        plan.raw_segments.append((start, end))
+        return plan
+
+    first_day, last_day = window
+    segment_start = start
+    day = first_day
+    while day < last_day:
+        if day in available:
+            boundary = day_start(day)
+            if segment_start < boundary:
+                plan.raw_segments.append((segment_start, boundary))
+            plan.rollups[day] = available[day]
+            segment_start = day_start(day + timedelta(days=1))
+        day += timedelta(days=1)
+    if segment_start < end:
+        plan.raw_segments.append((segment_start, end))
+    return plan
 
-    revenue = float(totals.get("revenue") or 0)
-    orders = int(totals.get("orders") or 0)
-    aov = round(revenue / orders, 2) if orders else 0.0
 
+def plan_range(start: datetime, end: datetime) -> RangePlan:
+    """
+    Split ``[start, end)`` into whole days that have a rollup row and raw
+    segments (leading/trailing partial days plus any day missing a rollup).
+    """
+    window = _rollup_window(start, end)
+    available = _available(_rollup_rows(*window)) if window is not None else {}
+    return _build_plan(start, end, window, available)
+
+
+async def aplan_range(start: datetime, end: datetime) -> RangePlan:
+    """Async :func:`plan_range`."""
+    window = _rollup_window(start, end)
+    available = _available([row async for row in _rollup_rows(*window)]) if window is not None else {}
+    return _build_plan(start, end, window, available)
+
+
+def _summarise(revenue: Decimal | float, orders: int) -> dict[str, float | int]:
+    revenue = float(revenue or 0)
+    orders = int(orders or 0)
+    aov = round(revenue / orders, 2) if orders else 0.0
     return {
         "revenue": revenue,
         "orders": orders,
         "aov": aov,
     }
+
+
+def _order_totals() -> dict:
+    return {"revenue": Sum("amount"), "orders": Count("id")}
+
+
+def _segments_q(segments: list[tuple[datetime, datetime]]) -> Q:
+    window = Q()
+    for seg_start, seg_end in segments:
+        window |= Q(created_at__gte=seg_start, created_at__lt=seg_end)
+    return window
+
+
+def paid_orders_in(segments: list[tuple[datetime, datetime]]):
+    """Return paid orders falling into any of the given ``[start, end)`` segments."""
+    return Order.objects.filter(_segments_q(segments), status="paid")
+
+
+def order_kpis(start: datetime, end: datetime) -> dict[str, float | int]:
+    """
+    Compute KPIs straight from paid orders, ignoring rollups.
+    Used by the tasks that build the rollups themselves.
+    """
+    totals = paid_orders_in([(start, end)]).aggregate(
+        revenue=Sum("amount"),
+        orders=Count("id"),
+    )
+    return _summarise(totals.get("revenue"), totals.get("orders"))
+
+
+def daily_order_totals(first: date, last: date) -> dict[date, tuple[Decimal, int]]:
+    """
+    Paid revenue and order count per day for ``first..last`` (inclusive) in a
+    single ``GROUP BY date`` query. Days without orders are absent.
+    """
+    rows = (
+        paid_orders_in([(day_start(first), day_start(last + timedelta(days=1)))])
+        .annotate(day=TruncDate("created_at"))
+        .values("day")
+        .annotate(revenue=Sum("amount"), orders=Count("id"))
+        .order_by("day")
+    )
+    return {row["day"]: (row["revenue"] or Decimal("0"), row["orders"]) for row in rows}
+
+
+def kpis(start: datetime, end: datetime) -> dict[str, float | int]:
+    """
+    Compute key business KPIs (Key Performance Indicators)
+    for all paid orders within the given date range.
+
+    Whole days are read from ``DailyKPI`` (or from the ``DailyOrderAggregate``
+    view with ``KPI_ROLLUP_SOURCE=order_view``); partial days and days without
+    a rollup are aggregated from ``Order``, so cost scales with days, not orders.
+    """
+    plan = plan_range(start, end)
+    totals = paid_orders_in(plan.raw_segments).aggregate(**_order_totals()) if plan.raw_segments else {}
+    return _combine(plan, totals)
+
+
+async def akpis(start: datetime, end: datetime) -> dict[str, float | int]:
+    """Async :func:`kpis` on the async ORM (``async for`` and ``aaggregate``)."""
+    plan = await aplan_range(start, end)
+    totals = {}
+    if plan.raw_segments:
+        totals = await paid_orders_in(plan.raw_segments).aaggregate(**_order_totals())
+    return _combine(plan, totals)
+
+
+def _combine(plan: RangePlan, totals: dict) -> dict[str, float | int]:
+    revenue = sum((day_revenue for day_revenue, _ in plan.rollups.values()), Decimal("0"))
+    orders = sum(day_orders for _, day_orders in plan.rollups.values())
+    revenue += totals.get("revenue") or 0
+    orders += totals.get("orders") or 0
+    return _summarise(revenue, orders)
+
+
+COMPARE_MODES = ("previous", "yoy")
+
+
+def comparison_window(start: datetime, end: datetime, mode: str) -> tuple[datetime, datetime]:
+    """The window ``[start, end)`` is compared against: the one right before it, or a year earlier."""
+    if mode == "previous":
+        return start - (end - start), start
+    if mode == "yoy":
+        return start - relativedelta(years=1), end - relativedelta(years=1)
+    raise ValueError(f"Unsupported comparison: {mode}")
+
+
+def _deltas(current: dict, previous: dict) -> tuple[dict, dict]:
+    delta, delta_pct = {}, {}
+    for metric in ("revenue", "orders", "aov"):
+        change = current[metric] - previous[metric]
+        delta[metric] = change if metric == "orders" else round(change, 2)
+        delta_pct[metric] = round(change / previous[metric] * 100, 2) if previous[metric] else None
+    return delta, delta_pct
+
+
+def compare_kpis(start: datetime, end: datetime, mode: str = "previous") -> dict:
+    """
+    KPIs for ``[start, end)`` next to the comparison window from
+    :func:`comparison_window`, with absolute and percentage deltas
+    (``None`` when the previous value is zero).
+
+    Rollups for both windows come from one rollup query and every raw
+    segment from one aggregate with ``Sum(..., filter=Q(...))`` per window, so
+    the comparison costs the same two queries as a single :func:`kpis` call.
+    """
+    previous_start, previous_end = comparison_window(start, end, mode)
+    windows = {"current": (start, end), "previous": (previous_start, previous_end)}
+    rollup_windows = {name: _rollup_window(*window) for name, window in windows.items()}
+
+    available = {}
+    days = Q()
+    for window in filter(None, rollup_windows.values()):
+        days |= Q(date__gte=window[0], date__lt=window[1])
+    if days:
+        available = _available(_rollup_queryset().filter(days))
+    plans = {
+        name: _build_plan(*windows[name], rollup_windows[name], available) for name in windows
+    }
+
+    aggregates = {}
+    for name, plan in plans.items():
+        if plan.raw_segments:
+            condition = _segments_q(plan.raw_segments)
+            aggregates[f"{name}_revenue"] = Sum("amount", filter=condition)
+            aggregates[f"{name}_orders"] = Count("id", filter=condition)
+    totals = {}
+    if aggregates:
+        segments = [segment for plan in plans.values() for segment in plan.raw_segments]
+        totals = paid_orders_in(segments).aggregate(**aggregates)
+
+    current, previous = (
+        _combine(plans[name], {"revenue": totals.get(f"{name}_revenue"), "orders": totals.get(f"{name}_orders")})
+        for name in ("current", "previous")
+    )
+    delta, delta_pct = _deltas(current, previous)
+    return {
+        **current,
+        "compare": mode,
+        "previous": {**previous, "start": previous_start.isoformat(), "end": previous_end.isoformat()},
+        "delta": delta,
+        "delta_pct": delta_pct,
+    }
+
+
+SERIES_GRANULARITIES = {
+    "hour": TruncHour,
+    "day": TruncDay,
+    "week": TruncWeek,
+    "month": TruncMonth,
+}
+MAX_SERIES_BUCKETS = 5000
+
+
+def _bucket_floor(moment: datetime, granularity: str) -> datetime:
+    """Truncate a naive local datetime the same way the matching ``Trunc*`` does."""
+    if granularity == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    floored = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == "week":
+        return floored - timedelta(days=floored.weekday())
+    if granularity == "month":
+        return floored.replace(day=1)
+    return floored
+
+
+_BUCKET_STEP = {
+    "hour": relativedelta(hours=1),
+    "day": relativedelta(days=1),
+    "week": relativedelta(weeks=1),
+    "month": relativedelta(months=1),
+}
+
+
+def _local_naive(moment: datetime, tz: tzinfo) -> datetime:
+    return moment.astimezone(tz).replace(tzinfo=None)
+
+
+def series_buckets(start: datetime, end: datetime, granularity: str, tz: tzinfo) -> list[datetime]:
+    """Return the naive local start of every bucket overlapping ``[start, end)``."""
+    if end <= start:
+        return []
+    bucket = _bucket_floor(_local_naive(start, tz), granularity)
+    last = _local_naive(end, tz)
+    buckets = []
+    while bucket < last:
+        buckets.append(bucket)
+        if len(buckets) > MAX_SERIES_BUCKETS:
+            raise ValueError(f"Range produces more than {MAX_SERIES_BUCKETS} buckets.")
+        bucket += _BUCKET_STEP[granularity]
+    return buckets
+
+
+def _grouped_orders(segments: list[tuple[datetime, datetime]], granularity: str, tz: tzinfo):
+    trunc = SERIES_GRANULARITIES[granularity]
+    return (
+        paid_orders_in(segments)
+        .annotate(bucket=trunc("created_at", tzinfo=tz))
+        .values("bucket")
+        .annotate(revenue=Sum("amount"), orders=Count("id"))
+        .order_by("bucket")
+    )
+
+
+def _uses_rollup_days(tz: tzinfo) -> bool:
+    # DailyKPI rows are cut at midnight in the active timezone, so they can only
+    # be re-bucketed when the series is requested in that same timezone.
+    current = timezone.get_current_timezone()
+    return getattr(tz, "key", str(tz)) == getattr(current, "key", str(current))
+
+
+def kpi_series(
+    start: datetime,
+    end: datetime,
+    granularity: str = "day",
+    tz: tzinfo | None = None,
+) -> list[dict[str, str | float | int]]:
+    """
+    Revenue / orders / AOV per ``granularity`` bucket over ``[start, end)``.
+
+    Hourly series come from one grouped ``Trunc*`` query over orders. Daily and
+    coarser series reuse the rollup planner: whole days come from ``DailyKPI``
+    and the remaining raw segments from one grouped query. Empty buckets are
+    zero-filled.
+    """
+    if granularity not in SERIES_GRANULARITIES:
+        raise ValueError(f"Unsupported granularity: {granularity}")
+    tz = tz or timezone.get_current_timezone()
+    buckets = series_buckets(start, end, granularity, tz)
+    if not buckets:
+        return []
+    totals: dict[datetime, list] = {bucket: [Decimal("0"), 0] for bucket in buckets}
+
+    if granularity != "hour" and _uses_rollup_days(tz):
+        plan = plan_range(start, end)
+        for day, (revenue, orders) in plan.rollups.items():
+            bucket = totals[_bucket_floor(datetime.combine(day, time.min), granularity)]
+            bucket[0] += revenue
+            bucket[1] += orders
+        segments = plan.raw_segments
+    else:
+        segments = [(start, end)]
+
+    if segments:
+        for row in _grouped_orders(segments, granularity, tz):
+            # setdefault: a DST transition can yield a bucket the naive walk skipped.
+            bucket = totals.setdefault(_local_naive(row["bucket"], tz), [Decimal("0"), 0])
+            bucket[0] += row["revenue"] or 0
+            bucket[1] += row["orders"] or 0
+
+    return [
+        {"bucket": timezone.make_aware(bucket, tz).isoformat(), **_summarise(revenue, orders)}
+        for bucket, (revenue, orders) in sorted(totals.items())
+    ]
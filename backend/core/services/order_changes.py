@@ -0,0 +1,83 @@
+from __future__ import annotations
+from datetime import datetime
+from decimal import Decimal
+from django.db import connections, router
+from django.utils import timezone
+from core.models import Order, OrderChange
+
+
+def lock_order_changes(using: str | None = None) -> None:
+    """
+    Serialise change-log consumers and rollup rebuilds against order writers.
+
+    Must be called inside a transaction. On Postgres this takes a SHARE ROW
+    EXCLUSIVE lock: order transactions wait to append until the caller commits,
+    so every committed change row it sees is also visible in its raw aggregates
+    and nothing is applied twice. SQLite already serialises writers.
+    """
+    using = using or router.db_for_write(OrderChange)
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"LOCK TABLE {connection.ops.quote_name(OrderChange._meta.db_table)} "
+                "IN SHARE ROW EXCLUSIVE MODE"
+            )
+
+
+def read_one_snapshot(using: str | None = None) -> None:
+    """
+    Make every read in the current transaction see one snapshot, so aggregates
+    over orders agree with the ``OrderChange`` rows written alongside them.
+
+    Must be the first statement of the transaction. On Postgres this switches
+    it to REPEATABLE READ; SQLite transactions already read one snapshot.
+    """
+    using = using or router.db_for_write(OrderChange)
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+
+
+def _contribution(status: str | None, amount, created_at: datetime | None):
+    if status != "paid" or created_at is None:
+        return None
+    return timezone.localtime(created_at).date(), Decimal(amount or 0)
+
+
+def record_order_change(order_id: int, before: dict | None, after: dict | None) -> None:
+    """
+    Append the per-day delta between two order states (``None`` = absent).
+    States are dicts with ``status``, ``amount`` and ``created_at``.
+    """
+    deltas: dict = {}
+    for state, sign in ((before, -1), (after, 1)):
+        if not state:
+            continue
+        contribution = _contribution(state["status"], state["amount"], state["created_at"])
+        if contribution is None:
+            continue
+        day, amount = contribution
+        revenue, orders = deltas.get(day, (Decimal("0"), 0))
+        deltas[day] = (revenue + sign * amount, orders + sign)
+
+    OrderChange.objects.bulk_create(
+        OrderChange(order_id=order_id, day=day, revenue_delta=revenue, orders_delta=orders)
+        for day, (revenue, orders) in deltas.items()
+        if revenue or orders
+    )
+
+
+def record_order_items_change(order: Order) -> None:
+    """
+    Mark the paid order's day as changed without moving its totals, so the
+    next ``apply_order_changes`` run rebuilds that day's product rollups.
+    """
+    contribution = _contribution(order.status, order.amount, order.created_at)
+    if contribution is not None:
+        OrderChange.objects.create(order_id=order.pk, day=contribution[0])
+
+
+def order_state(order: Order) -> dict:
+    return {"status": order.status, "amount": order.amount, "created_at": order.created_at}
@@ -0,0 +1,370 @@
+"""
+Monthly range partitioning of ``core_order`` by ``created_at`` (Postgres only).
+
+Partitions are named ``core_order_pYYYYMM`` and cover one calendar month in
+``TIME_ZONE``, so the day and month ranges ``kpis()`` and the rollups ask for
+never straddle more partitions than they have to. ``core_order_default``
+catches every row outside the monthly partitions (backdated or seeded orders,
+detached months, dates past the horizon if beat has been down), so no write
+ever fails for lack of a partition; ``ensure_partitions`` creates months
+ahead of time (daily, from beat) and moves rows of a new month out of the
+default partition as it attaches it.
+
+A partitioned table's unique indexes must include the partition key, so the
+primary key becomes ``(id, created_at)``. ``id`` stays unique in practice
+(one sequence feeds every partition) and the ORM keeps treating it as the
+primary key. Nothing can reference ``id`` alone any more, so ``convert``
+drops the foreign keys pointing at ``core_order`` (``OrderItem.order``);
+Django still cascades deletes itself.
+
+On any other backend (and on Postgres before ``convert`` has run) everything
+here except ``convert`` is a no-op.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import date, datetime, timedelta
+
+from django.conf import settings
+from django.db import NotSupportedError, connections, router, transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from core.models import Customer, Order
+
+PARENT = Order._meta.db_table
+PARTITION_PREFIX = f"{PARENT}_p"
+STAGING = f"{PARENT}_partitioned"
+DEFAULT_PARTITION = f"{PARENT}_default"
+UNPARTITIONED = f"{PARENT}_unpartitioned"
+PAID_INDEX = "core_order_paid_created_idx"
+UPDATED_INDEX = "core_order_updated_idx"
+LOCK_SQL = f'LOCK TABLE "{PARENT}" IN EXCLUSIVE MODE'
+
+
+def _quote(name: str) -> str:
+    return '"%s"' % name.replace('"', '""')
+
+
+def month_start(value: date | datetime) -> date:
+    """First day of the ``TIME_ZONE`` month containing ``value``."""
+    if isinstance(value, datetime):
+        value = timezone.localtime(value, timezone.get_default_timezone()).date()
+    return value.replace(day=1)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def months_between(first: date, last: date) -> list[date]:
+    """Every month start from ``first`` through ``last``, inclusive."""
+    months, month = [], month_start(first)
+    while month <= last:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+def partition_name(month: date) -> str:
+    return f"{PARTITION_PREFIX}{month:%Y%m}"
+
+
+def partition_month(name: str) -> date | None:
+    """Inverse of ``partition_name``; ``None`` for tables that are not monthly partitions."""
+    suffix = name.removeprefix(PARTITION_PREFIX)
+    if suffix == name or len(suffix) != 6 or not suffix.isdigit():
+        return None
+    return date(int(suffix[:4]), int(suffix[4:]), 1)
+
+
+def month_bounds(month: date) -> tuple[datetime, datetime]:
+    """``[start, end)`` of a partition as aware datetimes in ``TIME_ZONE``."""
+    tz = timezone.get_default_timezone()
+    start = datetime(month.year, month.month, 1, tzinfo=tz)
+    following = add_months(month, 1)
+    return start, datetime(following.year, following.month, 1, tzinfo=tz)
+
+
+def create_partition_sql(month: date, parent: str = PARENT) -> str:
+    start, end = month_bounds(month)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {_quote(partition_name(month))} PARTITION OF {_quote(parent)} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+def _columns() -> str:
+    return ", ".join(_quote(field.column) for field in Order._meta.concrete_fields)
+
+
+def attach_partition_sql(month: date) -> list[str]:
+    """
+    Statements adding ``month`` to a partitioned ``core_order`` that has a
+    default partition: rows of that month already sitting in the default
+    partition move into the new table before it is attached. Meant for one
+    transaction, which first locks the default partition against writes so
+    no order of that month lands there between the move and the attach
+    (which would make the attach fail); reads carry on.
+    """
+    name, default, parent = _quote(partition_name(month)), _quote(DEFAULT_PARTITION), _quote(PARENT)
+    start, end = (bound.isoformat() for bound in month_bounds(month))
+    columns = _columns()
+    return [
+        f"LOCK TABLE {default} IN SHARE ROW EXCLUSIVE MODE",
+        f"CREATE TABLE IF NOT EXISTS {name} (LIKE {parent} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)",
+        f"WITH moved AS (DELETE FROM {default} WHERE \"created_at\" >= '{start}' AND \"created_at\" < '{end}' "
+        f"RETURNING {columns}) INSERT INTO {name} ({columns}) SELECT {columns} FROM moved",
+        f"ALTER TABLE {parent} ATTACH PARTITION {name} FOR VALUES FROM ('{start}') TO ('{end}')",
+    ]
+
+
+def detach_partition_sql(name: str) -> str:
+    return f"ALTER TABLE {_quote(PARENT)} DETACH PARTITION {_quote(name)}"
+
+
+def conversion_sql(months: list[date]) -> list[str]:
+    """
+    Statements that rebuild ``core_order`` as a partitioned table with one
+    partition per month in ``months``. Meant to run in one transaction that
+    already holds ``LOCK_SQL``, which keeps writers out (readers carry on)
+    until the copy is swapped in; the old heap is kept as
+    ``core_order_unpartitioned``.
+    """
+    staging, parent = _quote(STAGING), _quote(PARENT)
+    sequence = f"{STAGING}_id_seq"
+    columns = _columns()
+    customer = Customer._meta
+    return [
+        f"CREATE TABLE {staging} (LIKE {parent} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        f'PARTITION BY RANGE ("created_at")',
+        f'CREATE SEQUENCE {_quote(sequence)} OWNED BY {staging}."id"',
+        f"ALTER TABLE {staging} ALTER COLUMN \"id\" SET DEFAULT nextval('{sequence}')",
+        f'ALTER TABLE {staging} ADD CONSTRAINT {_quote(STAGING + "_pkey")} PRIMARY KEY ("id", "created_at")',
+        *(create_partition_sql(month, STAGING) for month in months),
+        f"CREATE TABLE {_quote(DEFAULT_PARTITION)} PARTITION OF {staging} DEFAULT",
+        f"INSERT INTO {staging} ({columns}) SELECT {columns} FROM {parent}",
+        f"SELECT setval('{sequence}', COALESCE(MAX(\"id\"), 0) + 1, false) FROM {staging}",
+        f"ALTER INDEX {_quote(PAID_INDEX)} RENAME TO {_quote(UNPARTITIONED + '_paid_created_idx')}",
+        f'CREATE INDEX {_quote(PAID_INDEX)} ON {staging} ("created_at", "amount") WHERE "status" = \'paid\'',
+        f"ALTER INDEX {_quote(UPDATED_INDEX)} RENAME TO {_quote(UNPARTITIONED + '_updated_idx')}",
+        f'CREATE INDEX {_quote(UPDATED_INDEX)} ON {staging} ("updated_at")',
+        f'CREATE INDEX {_quote(STAGING + "_customer_id_idx")} ON {staging} ("customer_id")',
+        f'ALTER TABLE {staging} ADD CONSTRAINT {_quote(STAGING + "_customer_id_fk")} '
+        f'FOREIGN KEY ("customer_id") REFERENCES {_quote(customer.db_table)} ({_quote(customer.pk.column)}) '
+        f"DEFERRABLE INITIALLY DEFERRED",
+        f"ALTER TABLE {parent} RENAME TO {_quote(UNPARTITIONED)}",
+        f"ALTER TABLE {staging} RENAME TO {parent}",
+    ]
+
+
+def _connection(using: str | None):
+    return connections[using or router.db_for_write(Order)]
+
+
+def is_partitioned(using: str | None = None) -> bool:
+    connection = _connection(using)
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = %s AND pg_table_is_visible(c.oid)",
+            [PARENT],
+        )
+        return cursor.fetchone() is not None
+
+
+def partitions(using: str | None = None) -> dict[date, str]:
+    """Attached monthly partitions by month start; empty when not partitioned."""
+    if not is_partitioned(using):
+        return {}
+    with _connection(using).cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits i "
+            "JOIN pg_class parent ON parent.oid = i.inhparent "
+            "JOIN pg_class child ON child.oid = i.inhrelid "
+            "WHERE parent.relname = %s AND pg_table_is_visible(parent.oid)",
+            [PARENT],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    return {month: name for name in names if (month := partition_month(name)) is not None}
+
+
+def ensure_partitions(months_ahead: int, using: str | None = None) -> list[str]:
+    """
+    Create any missing partition from the current month to ``months_ahead``
+    months out, each in its own transaction with the matching rows moved out
+    of the default partition.
+    """
+    if not is_partitioned(using):
+        return []
+    current = month_start(timezone.now())
+    existing = partitions(using)
+    missing = [m for m in months_between(current, add_months(current, months_ahead)) if m not in existing]
+    connection = _connection(using)
+    for month in missing:
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            for statement in attach_partition_sql(month):
+                cursor.execute(statement)
+    return [partition_name(month) for month in missing]
+
+
+def _retained_from(retain_months: int) -> date:
+    return add_months(month_start(timezone.now()), -retain_months)
+
+
+def retention_cutoff(using: str | None = None) -> date | None:
+    """
+    First day whose orders ``maintain`` keeps attached under
+    ``ORDER_PARTITION_RETAIN_MONTHS``; ``None`` when nothing is detached.
+    Rollups of earlier days must not be recomputed from ``core_order``.
+    """
+    retain_months = getattr(settings, "ORDER_PARTITION_RETAIN_MONTHS", 0)
+    if retain_months <= 0 or not is_partitioned(using):
+        return None
+    return _retained_from(retain_months)
+
+
+def detach_partitions(retain_months: int, using: str | None = None) -> list[str]:
+    """
+    Detach partitions entirely older than the last ``retain_months`` months
+    (``0`` keeps everything). Detached tables are left in place for archiving
+    or dropping; their rows disappear from ``core_order`` while the daily
+    rollups keep the totals: rebuilds skip days before ``retention_cutoff``
+    and later changes to them are applied as deltas. Their ``OrderItem`` rows
+    are not touched. Orders written later for a detached month land in the
+    default partition.
+
+    A default partition rules out ``DETACH ... CONCURRENTLY``; the plain
+    detach holds an exclusive lock on ``core_order`` only for the catalog
+    change, since no rows are scanned or moved.
+    """
+    if retain_months <= 0 or not is_partitioned(using):
+        return []
+    cutoff = _retained_from(retain_months)
+    connection = _connection(using)
+    detached = []
+    with connection.cursor() as cursor:
+        for month, name in sorted(partitions(using).items()):
+            if month < cutoff:
+                cursor.execute(detach_partition_sql(name))
+                detached.append(name)
+    return detached
+
+
+def maintain(using: str | None = None) -> dict[str, list[str]]:
+    """One beat run: ``ORDER_PARTITION_MONTHS_AHEAD`` / ``ORDER_PARTITION_RETAIN_MONTHS``."""
+    return {
+        "created": ensure_partitions(getattr(settings, "ORDER_PARTITION_MONTHS_AHEAD", 3), using),
+        "detached": detach_partitions(getattr(settings, "ORDER_PARTITION_RETAIN_MONTHS", 0), using),
+    }
+
+
+def _dependent_views(cursor) -> list[tuple[str, str, str, list[str]]]:
+    """``(name, kind, definition, index definitions)`` of views reading ``core_order``."""
+    cursor.execute(
+        "SELECT DISTINCT c.relname, c.relkind, pg_get_viewdef(c.oid) FROM pg_depend d "
+        "JOIN pg_rewrite r ON r.oid = d.objid JOIN pg_class c ON c.oid = r.ev_class "
+        "WHERE d.refobjid = %s::regclass AND c.relname <> %s",
+        [PARENT, PARENT],
+    )
+    views = []
+    for name, kind, definition in cursor.fetchall():
+        cursor.execute("SELECT indexdef FROM pg_indexes WHERE tablename = %s", [name])
+        views.append((name, kind, definition.rstrip().rstrip(";"), [row[0] for row in cursor.fetchall()]))
+    return views
+
+
+def convert(months_ahead: int, using: str | None = None) -> list[str]:
+    """
+    Turn the plain ``core_order`` heap into a partitioned table, copying every
+    row; returns the monthly partitions created. Foreign keys referencing
+    ``core_order`` are dropped, and views over it (the daily order aggregate)
+    are recreated against the new table.
+    """
+    connection = _connection(using)
+    if connection.vendor != "postgresql":
+        raise NotSupportedError("Order partitioning requires PostgreSQL.")
+    if is_partitioned(using):
+        raise NotSupportedError(f"{PARENT} is already partitioned.")
+
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(LOCK_SQL)
+        cursor.execute(
+            "SELECT conrelid::regclass::text, conname FROM pg_constraint "
+            "WHERE confrelid = %s::regclass AND contype = 'f'",
+            [PARENT],
+        )
+        for table, constraint in cursor.fetchall():
+            cursor.execute(f"ALTER TABLE {table} DROP CONSTRAINT {_quote(constraint)}")
+
+        oldest = Order.objects.using(connection.alias).aggregate(first=Min("created_at"))["first"]
+        current = month_start(timezone.now())
+        months = months_between(month_start(oldest) if oldest else current, add_months(current, months_ahead))
+
+        views = _dependent_views(cursor)
+        for name, kind, _definition, _indexes in views:
+            cursor.execute(f"DROP {'MATERIALIZED VIEW' if kind == 'm' else 'VIEW'} {_quote(name)}")
+        for statement in conversion_sql(months):
+            cursor.execute(statement)
+        for name, kind, definition, indexes in views:
+            cursor.execute(f"CREATE {'MATERIALIZED VIEW' if kind == 'm' else 'VIEW'} {_quote(name)} AS {definition}")
+            for index in indexes:
+                cursor.execute(index)
+        cursor.execute(f"ANALYZE {_quote(PARENT)}")
+    return [partition_name(month) for month in months]
+
+
+def pruning_queries() -> dict[str, object]:
+    """The hot ``core_order`` queries whose plans should only touch recent partitions."""
+    from analytics.views.order_views import paid_orders
+    from core.services.kpi_service import paid_orders_in
+
+    now = timezone.now()
+    week_ago = now - timedelta(days=7)
+    return {
+        "kpis() raw segment, last 7 days": paid_orders_in([(week_ago, now)]).values("amount"),
+        "OrderListView page 1": paid_orders()[:50],
+        "OrderListView cursor page, 90 days back": paid_orders().filter(
+            created_at__lt=now - timedelta(days=90)
+        )[:50],
+    }
+
+
+def _scanned(plan: dict) -> set[str]:
+    """Partitions a plan node tree actually executed (``Actual Loops`` > 0)."""
+    found = set()
+    relation = plan.get("Relation Name", "")
+    is_partition = relation == DEFAULT_PARTITION or partition_month(relation) is not None
+    if is_partition and plan.get("Actual Loops", 0) > 0:
+        found.add(relation)
+    for child in plan.get("Plans", ()):
+        found |= _scanned(child)
+    return found
+
+
+def pruning_report(using: str | None = None) -> list[dict]:
+    """
+    ``EXPLAIN ANALYZE`` each of ``pruning_queries`` and report how many of the
+    attached partitions it read. Plan-time pruning (``kpis()``) and run-time
+    pruning of an ordered ``LIMIT`` (the orders feed, which stops after the
+    newest partitions) both show up as ``scanned`` < ``total``.
+    """
+    connection = _connection(using)
+    if not is_partitioned(using):
+        raise NotSupportedError(f"{PARENT} is not partitioned.")
+    total = len(partitions(using)) + 1  # the default partition
+    report = []
+    with connection.cursor() as cursor:
+        for name, queryset in pruning_queries().items():
+            sql, params = queryset.using(connection.alias).query.sql_with_params()
+            cursor.execute(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            scanned = _scanned(plan[0]["Plan"])
+            report.append({"query": name, "scanned": sorted(scanned), "total": total})
+    return report
@@ -0,0 +1,133 @@
+from __future__ import annotations
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Q, Sum
+from django.db.models.functions import TruncDate
+from analytics.models import DailyProductKPI
+from core.models import OrderItem, Product
+from core.services.kpi_service import day_start, plan_range
+
+TOP_PRODUCT_METRICS = ("revenue", "units", "orders")
+
+LINE_TOTAL = ExpressionWrapper(
+    F("qty") * F("unit_price"),
+    output_field=DecimalField(max_digits=14, decimal_places=2),
+)
+
+
+def _paid_items_in(segments: list[tuple[datetime, datetime]]):
+    window = Q()
+    for seg_start, seg_end in segments:
+        window |= Q(order__created_at__gte=seg_start, order__created_at__lt=seg_end)
+    return OrderItem.objects.filter(window, order__status="paid")
+
+
+def _item_totals():
+    return {
+        "units": Sum("qty"),
+        "revenue": Sum(LINE_TOTAL),
+        "orders": Count("order_id", distinct=True),
+    }
+
+
+def _day_segments(days) -> list[tuple[datetime, datetime]]:
+    """Merge days into contiguous ``[start, end)`` datetime segments."""
+    segments: list[tuple[datetime, datetime]] = []
+    for day in sorted(set(days)):
+        start, end = day_start(day), day_start(day + timedelta(days=1))
+        if segments and segments[-1][1] == start:
+            segments[-1] = (segments[-1][0], end)
+        else:
+            segments.append((start, end))
+    return segments
+
+
+def daily_product_totals(days) -> list[dict]:
+    """
+    Units, revenue (``qty * unit_price``) and distinct orders per product per
+    day for the given days, in a single grouped SQL aggregate.
+    """
+    segments = _day_segments(days)
+    if not segments:
+        return []
+    return list(
+        _paid_items_in(segments)
+        .annotate(day=TruncDate("order__created_at"))
+        .values("day", "product_id")
+        .annotate(**_item_totals())
+        .order_by("day", "product_id")
+    )
+
+
+def _product_plan(start: datetime, end: datetime) -> tuple[list[date], list[tuple[datetime, datetime]]]:
+    """
+    Whole days answered from ``DailyProductKPI`` and the raw segments for the
+    rest. ``plan_range`` only knows about ``DailyKPI``; a day counts as covered
+    for products when it has product rollup rows, or when its order rollup
+    shows no paid orders (so no product rows are expected). Other days, such
+    as history from before product rollups existed, are aggregated raw.
+    """
+    plan = plan_range(start, end)
+    covered = set(
+        DailyProductKPI.objects.filter(date__in=list(plan.rollups))
+        .values_list("date", flat=True)
+        .distinct()
+    )
+    covered.update(day for day, (_revenue, orders) in plan.rollups.items() if not orders)
+    missing = [day for day in plan.rollups if day not in covered]
+    return sorted(covered), plan.raw_segments + _day_segments(missing)
+
+
+def top_products(
+    start: datetime,
+    end: datetime,
+    limit: int = 10,
+    by: str = "revenue",
+) -> list[dict[str, str | float | int]]:
+    """
+    Best-selling products over ``[start, end)``.
+
+    Whole days with product rollups come from ``DailyProductKPI`` (one
+    grouped query); partial or uncovered days are aggregated from ``OrderItem``.
+    """
+    if by not in TOP_PRODUCT_METRICS:
+        raise ValueError(f"Unsupported metric: {by}")
+
+    rollup_days, raw_segments = _product_plan(start, end)
+    totals: dict[int, list] = {}
+
+    def add(product_id: int, units, revenue, orders) -> None:
+        entry = totals.setdefault(product_id, [0, Decimal("0"), 0])
+        entry[0] += units or 0
+        entry[1] += revenue or 0
+        entry[2] += orders or 0
+
+    if rollup_days:
+        rolled = (
+            DailyProductKPI.objects.filter(date__in=rollup_days)
+            .values("product_id")
+            .annotate(units=Sum("units"), revenue=Sum("revenue"), orders=Sum("orders"))
+        )
+        for row in rolled:
+            add(row["product_id"], row["units"], row["revenue"], row["orders"])
+
+    if raw_segments:
+        raw = _paid_items_in(raw_segments).values("product_id").annotate(**_item_totals()).order_by()
+        for row in raw:
+            add(row["product_id"], row["units"], row["revenue"], row["orders"])
+
+    index = TOP_PRODUCT_METRICS.index(by)
+    ranked = sorted(totals.items(), key=lambda item: (item[1][index], -item[0]), reverse=True)[:limit]
+    products = Product.objects.in_bulk([product_id for product_id, _ in ranked])
+
+    return [
+        {
+            "product_id": product_id,
+            "sku": products[product_id].sku,
+            "title": products[product_id].title,
+            "units": int(units),
+            "revenue": float(revenue),
+            "orders": int(orders),
+        }
+        for product_id, (units, revenue, orders) in ranked
+    ]
@@ -0,0 +1,70 @@
+from __future__ import annotations
+import hashlib
+from datetime import date, datetime
+from typing import NamedTuple
+from django.db.models import BigIntegerField, CharField, Count, Max, Value
+from analytics.models import DailyKPI
+from core.models import Customer, Order, OrderChange
+
+
+class Watermark(NamedTuple):
+    """Cheap fingerprint of the order data behind a response."""
+
+    token: str
+    last_modified: datetime | None
+
+    def etag(self, *parts: object) -> str:
+        """Weak ETag over the watermark and whatever else shapes the representation."""
+        digest = hashlib.sha1("|".join(map(str, (self.token, *parts))).encode()).hexdigest()[:24]
+        return f'W/"{digest}"'
+
+
+def _summary(queryset, source: str, stamp, last_id, rows=None):
+    return (
+        queryset.order_by()
+        .annotate(source=Value(source, output_field=CharField()))
+        .values("source")
+        .annotate(stamp=stamp, last_id=last_id, rows=Count("id") if rows is None else rows)
+    )
+
+
+def _watermark(*summaries) -> Watermark:
+    # One round trip: every aggregate as one row of a UNION ALL.
+    rows = {row["source"]: row for row in summaries[0].union(*summaries[1:], all=True)}
+    stamps = [row["stamp"] for row in rows.values() if row["stamp"] is not None]
+    token = ":".join(
+        str(rows[source][field]) for source in sorted(rows) for field in ("stamp", "last_id", "rows")
+    )
+    return Watermark(token, max(stamps) if stamps else None)
+
+
+def _paid_order_summaries(first: date | None, last: date | None) -> list:
+    rollups = DailyKPI.objects.all()
+    changes = OrderChange.objects.all()
+    if first is not None:
+        rollups, changes = rollups.filter(date__gte=first), changes.filter(day__gte=first)
+    if last is not None:
+        rollups, changes = rollups.filter(date__lte=last), changes.filter(day__lte=last)
+    return [
+        _summary(rollups, "rollup", Max("updated_at"), Value(0, output_field=BigIntegerField())),
+        _summary(changes, "change", Max("created_at"), Max("id")),
+    ]
+
+
+def order_list_watermark() -> Watermark:
+    """
+    Watermark of the order listing.
+
+    Every order write appends an ``OrderChange`` row for the days it touches,
+    and draining or rebuilding those rows stamps ``DailyKPI.updated_at``; the
+    newest ``updated_at`` of orders and customers adds customer renames,
+    reassigned orders and ``bulk_create`` loads. Every aggregate is read from
+    an index. ``QuerySet.update()`` calls must set ``updated_at``.
+    """
+    # No COUNT: unlike the day-keyed rows above, these tables are scanned by it.
+    zero = Value(0, output_field=BigIntegerField())
+    return _watermark(
+        *_paid_order_summaries(None, None),
+        _summary(Order.objects.all(), "order", Max("updated_at"), zero, zero),
+        _summary(Customer.objects.all(), "customer", Max("updated_at"), zero, zero),
+    )
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core.models import Order, OrderItem
+from core.services import kpi_cache
+from core.services.order_changes import order_state, record_order_change, record_order_items_change
+
+
+def _invalidate_on_commit(*moments) -> None:
+    # Bump after commit so a concurrent reader cannot cache pre-commit totals
+    # under the new generation.
+    def invalidate():
+        for moment in moments:
+            kpi_cache.invalidate_moment(moment)
+
+    transaction.on_commit(invalidate)
+
+
+@receiver(pre_save, sender=Order)
+def remember_previous_order_state(sender, instance: Order, raw=False, **kwargs) -> None:
+    instance._previous_state = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    # Runs inside the atomic block Order.save opens: lock the row so a
+    # concurrent save cannot log a delta against the same previous state.
+    instance._previous_state = (
+        Order.objects.using(kwargs.get("using")).select_for_update().filter(pk=instance.pk)
+        .values("status", "amount", "created_at")
+        .first()
+    )
+
+
+@receiver(post_save, sender=Order)
+def capture_order_save(sender, instance: Order, raw=False, **kwargs) -> None:
+    if raw:
+        return
+    previous = getattr(instance, "_previous_state", None)
+    record_order_change(instance.pk, previous, order_state(instance))
+    _invalidate_on_commit(instance.created_at, previous and previous["created_at"])
+
+
+@receiver(post_delete, sender=Order)
+def capture_order_delete(sender, instance: Order, **kwargs) -> None:
+    record_order_change(instance.pk, order_state(instance), None)
+    _invalidate_on_commit(instance.created_at)
+
+
+@receiver(post_save, sender=OrderItem)
+@receiver(post_delete, sender=OrderItem)
+def capture_order_item_change(sender, instance: OrderItem, raw=False, **kwargs) -> None:
+    if raw:
+        return
+    order = Order.objects.using(kwargs.get("using")).filter(pk=instance.order_id).first()
+    if order is not None:
+        record_order_items_change(order)
+        _invalidate_on_commit(order.created_at)
@@ -0,0 +1,89 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from revalyt.authentication import TokenCache, token_cache
+
+User = get_user_model()
+
+
+class TokenCacheTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="cached", password="pass1234")
+        self.client.post("/api/auth/token/", {"username": "cached", "password": "pass1234"}, format="json")
+
+    def _user_queries(self) -> int:
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/api/auth/me/")
+        self.assertEqual(response.status_code, 200)
+        return sum('FROM "auth_user"' in query["sql"] for query in ctx.captured_queries)
+
+    def test_second_request_skips_the_user_query(self):
+        self.assertEqual(self._user_queries(), 1)
+        self.assertEqual(self._user_queries(), 0)
+        self.assertEqual(len(token_cache), 1)
+
+    def test_deactivation_invalidates(self):
+        self._user_queries()
+        self.user.is_active = False
+        self.user.save(update_fields=["is_active"])
+
+        self.assertEqual(self.client.get("/api/auth/me/").status_code, 401)
+
+    def test_password_change_invalidates(self):
+        self._user_queries()
+        self.user.set_password("new-pass-5678")
+        self.user.save()
+
+        self.assertEqual(self._user_queries(), 1)
+
+    def test_version_bump_from_another_process_is_honoured(self):
+        from django.core.cache import cache
+
+        self._user_queries()
+        cache.set(f"auth:user-version:{self.user.pk}", 99)
+
+        self.assertEqual(self._user_queries(), 1)
+
+    def test_logout_drops_the_token(self):
+        self._user_queries()
+        response = self.client.post("/api/auth/logout/")
+
+        self.assertEqual(response.status_code, 205)
+        self.assertEqual(len(token_cache), 0)
+
+    def test_logout_revokes_the_token_in_other_processes(self):
+        raw = self.client.cookies["revalyt_access"].value
+        self._user_queries()
+        cached = token_cache.get(TokenCache.key(raw))
+        self.client.post("/api/auth/logout/")
+
+        # Another process still holding the entry drops it on its next use.
+        token_cache.set(TokenCache.key(raw), cached[0], cached[1], 0)
+        self.assertIsNone(token_cache.get(TokenCache.key(raw)))
+        self.assertEqual(self.client.get("/api/auth/me/", HTTP_AUTHORIZATION=f"Bearer {raw}").status_code, 401)
+
+    def test_request_user_is_a_copy(self):
+        self._user_queries()
+        raw = self.client.cookies["revalyt_access"].value
+        user, _ = token_cache.get(TokenCache.key(raw))
+        user.username = "mutated"
+
+        self.assertEqual(token_cache.get(TokenCache.key(raw))[0].username, "cached")
+
+    @override_settings(AUTH_CACHE_MAX_ENTRIES=2)
+    def test_lru_is_bounded(self):
+        token_cache.set("key-0", self.user, {"exp": 2**40}, 0)
+        token_cache.set("key-1", self.user, {"exp": 2**40}, 0)
+        token_cache.get("key-0")
+        token_cache.set("key-2", self.user, {"exp": 2**40}, 0)
+
+        self.assertEqual(len(token_cache), 2)
+        self.assertIsNone(token_cache.get("key-1"))
+        self.assertIsNotNone(token_cache.get("key-0"))
+
+    def test_expired_entries_are_not_served(self):
+        token_cache.set("expired", self.user, {"exp": 1}, 0)
+        self.assertIsNone(token_cache.get("expired"))
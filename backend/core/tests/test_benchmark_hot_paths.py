@@ -0,0 +1,51 @@
+import json
+import tempfile
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from core.models import Customer, Order
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class HotPathBenchmarkTests(TestCase):
+    def test_writes_json_report_for_every_scenario(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output = Path(tmp) / "bench.json"
+            call_command(
+                "benchmark_hot_paths",
+                seed=True,
+                orders=300,
+                days=20,
+                customers=20,
+                repeat=2,
+                output=str(output),
+                stdout=StringIO(),
+            )
+            report = json.loads(output.read_text())
+
+            out = StringIO()
+            call_command("benchmark_hot_paths", repeat=1, output=str(output), compare=str(output), stdout=out)
+
+        self.assertEqual(report["dataset"]["orders"], 300)
+        results = report["results"]
+        for name in ("kpis() 30d", "generate_daily_report", "orders page 1", "auth cookie login", "auth cookie refresh"):
+            self.assertIn(name, results)
+            self.assertGreaterEqual(results[name]["p95_ms"], results[name]["p50_ms"])
+            self.assertGreater(results[name]["peak_kib"], 0)
+        self.assertTrue(any(name.startswith("orders cursor at page") for name in results))
+        self.assertGreaterEqual(results["orders page 1"]["queries"], 2)
+        self.assertIn("p50", out.getvalue())
+        self.assertFalse(get_user_model().objects.get(username="benchmark").has_usable_password())
+
+    def test_creates_the_benchmark_user_only_when_seeding(self):
+        customer = Customer.objects.create(name="Bench", email="bench@example.com")
+        Order.objects.create(customer=customer, amount=Decimal("5.00"))
+
+        with self.assertRaisesMessage(CommandError, 'No "benchmark" user'):
+            call_command("benchmark_hot_paths", repeat=1, stdout=StringIO())
+        self.assertFalse(get_user_model().objects.exists())
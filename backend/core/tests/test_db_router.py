@@ -0,0 +1,81 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITransactionTestCase
+
+from analytics.models import DailyKPI
+from core.models import Customer, Order
+from core.services import kpi_cache
+from revalyt.db_router import replica_reads
+
+User = get_user_model()
+
+replicas_on = override_settings(DATABASE_REPLICAS=["replica1"])
+
+
+@skipUnless("replica1" in settings.DATABASES, "set DATABASE_REPLICA_URLS to a second database")
+class ReplicaRoutingTests(APITransactionTestCase):
+    """Two databases holding different orders show where each read went."""
+
+    databases = {"default", "replica1"}
+
+    def setUp(self):
+        customer = Customer.objects.create(name="Primary", email="primary@example.com")
+        Order.objects.create(customer=customer, amount=Decimal("10.00"))
+        self.customer = customer
+
+        replica_customer = Customer.objects.using("replica1").create(name="Replica", email="replica@example.com")
+        Order.objects.using("replica1").bulk_create(
+            Order(customer=replica_customer, amount=Decimal(amount)) for amount in ("1.00", "2.00", "3.00")
+        )
+
+    @replicas_on
+    def test_analytics_reads_in_a_request_go_to_the_replica(self):
+        self.client.force_authenticate(User.objects.create_user(username="reader", password="pass1234"))
+
+        response = self.client.get("/api/analytics/orders/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 3)
+        self.assertEqual({row["customer"] for row in response.data["results"]}, {"Replica"})
+
+    @replicas_on
+    def test_writes_pin_the_rest_of_the_request_to_the_primary(self):
+        with replica_reads():
+            self.assertEqual(Order.objects.count(), 3)
+            self.assertEqual(User.objects.count(), 0)  # auth tables are never routed
+
+            Order.objects.create(customer=self.customer, amount=Decimal("5.00"))
+            self.assertEqual(Order.objects.count(), 2)
+            self.assertEqual(Order.objects.using("replica1").count(), 3)
+
+        with replica_reads(pinned=True):
+            self.assertEqual(Order.objects.count(), 2)
+
+    @replicas_on
+    def test_background_work_reads_from_the_primary(self):
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertFalse(DailyKPI.objects.exists())
+
+    @replicas_on
+    def test_lagging_replica_falls_back_to_the_primary(self):
+        with mock.patch("revalyt.db_router.measure_lag", return_value=60.0) as measure, replica_reads():
+            self.assertEqual(Order.objects.count(), 1)
+            self.assertEqual(Order.objects.count(), 1)
+        measure.assert_called_once_with("replica1")
+
+    @replicas_on
+    def test_kpi_cache_refills_from_the_primary_right_after_a_write(self):
+        now = timezone.now()
+        start, end = now - timedelta(hours=1), now + timedelta(hours=1)
+        with replica_reads():
+            self.assertEqual(kpi_cache.cached_kpis(start, end)[0]["orders"], 3)
+
+            kpi_cache.invalidate_moment(now)
+            totals, hit = kpi_cache.cached_kpis(start, end)
+        self.assertFalse(hit)
+        self.assertEqual(totals["orders"], 1)
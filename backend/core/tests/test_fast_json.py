@@ -0,0 +1,96 @@
+import gzip
+import json
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock, skipUnless
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+from revalyt import compression
+from revalyt.renderers import FastJSONRenderer, dumps, orjson
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    @skipUnless(orjson, "orjson is not installed")
+    def test_matches_the_stock_renderer(self):
+        payload = {
+            "amount": Decimal("12.50"),
+            "created_at": datetime(2025, 3, 1, 12, 30, 5, 120, tzinfo=dt_timezone.utc),
+            "day": date(2025, 3, 1),
+            "label": gettext_lazy("Revenue"),
+            "note": "line\u2028separator ✓",
+            "rows": [{"id": 1}, (2, 3)],
+        }
+        self.assertEqual(FastJSONRenderer().render(payload), JSONRenderer().render(payload))
+
+    def test_indent_falls_back_to_the_stock_renderer(self):
+        rendered = FastJSONRenderer().render({"a": 1}, "application/json; indent=2")
+        self.assertEqual(rendered, b'{\n  "a": 1\n}')
+
+    def test_none_renders_empty(self):
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+
+@override_settings(RESPONSE_COMPRESSION_MIN_BYTES=1024)
+class APICompressionTests(SimpleTestCase):
+    def _response(self, size: int, accept_encoding: str = "gzip, br"):
+        return self.client.get(
+            "/api/schema/?format=json" if size else "/health/live/",
+            HTTP_ACCEPT_ENCODING=accept_encoding,
+        )
+
+    def test_large_api_responses_are_gzipped(self):
+        response = self._response(1, "gzip")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertTrue(response["ETag"].startswith('W/"'))
+        self.assertEqual(json.loads(gzip.decompress(response.content))["openapi"], "3.0.3")
+
+    def test_small_responses_are_left_alone(self):
+        response = self._response(0)
+        self.assertNotIn("Content-Encoding", response)
+
+    def test_brotli_is_preferred_when_installed(self):
+        fake = mock.Mock()
+        fake.compress.return_value = b"tiny"
+        with mock.patch.object(compression, "brotli", fake):
+            response = self._response(1)
+
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(response.content, b"tiny")
+        self.assertEqual(fake.compress.call_args.kwargs, {"quality": compression.BROTLI_QUALITY})
+
+    def test_non_api_content_types_are_skipped(self):
+        response = self.client.get("/api/docs/", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertNotIn("Content-Encoding", response)
+
+
+class BenchmarkJSONRenderingTests(SimpleTestCase):
+    @skipUnless(orjson, "orjson is not installed")
+    def test_reports_bytes_and_cpu_per_variant(self):
+        with TemporaryDirectory() as tmp:
+            output = Path(tmp) / "json.json"
+            call_command("benchmark_json_rendering", "--rows", "5", "--repeat", "1", "--output", str(output), stdout=StringIO())
+            report = json.loads(output.read_text())
+
+        variants = report[0]["variants"]
+        self.assertEqual(report[0]["rows"], 5)
+        self.assertEqual(variants["json (stdlib)"]["bytes"], variants["json (orjson)"]["bytes"])
+        self.assertLess(variants["+ gzip -6"]["bytes"], variants["json (orjson)"]["bytes"])
+        self.assertEqual(dumps([1]), b"[1]")
+
+    def test_without_orjson_only_the_stdlib_variant_is_reported(self):
+        with TemporaryDirectory() as tmp, mock.patch("core.management.commands.benchmark_json_rendering.orjson", None):
+            output = Path(tmp) / "json.json"
+            call_command("benchmark_json_rendering", "--rows", "5", "--repeat", "1", "--output", str(output), stdout=StringIO())
+            variants = json.loads(output.read_text())[0]["variants"]
+
+        self.assertNotIn("json (orjson)", variants)
+        self.assertLess(variants["+ gzip -6"]["bytes"], variants["json (stdlib)"]["bytes"])
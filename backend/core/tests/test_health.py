@@ -0,0 +1,70 @@
+import threading
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from revalyt import health
+
+
+def _slow(result: bool, delay: float = 0.2):
+    def check() -> bool:
+        time.sleep(delay)
+        return result
+
+    return check
+
+
+class HealthTests(SimpleTestCase):
+    def setUp(self):
+        health.reset()
+        self.addCleanup(health.reset)
+
+    def test_liveness_touches_no_dependency(self):
+        with mock.patch.dict(health.PROBES, {"database": mock.Mock(side_effect=AssertionError)}):
+            response = self.client.get("/health/live/")
+        self.assertEqual(response.json(), {"status": "ok"})
+
+    def test_probes_run_concurrently_and_results_are_cached(self):
+        probes = {"database": _slow(True), "redis": _slow(True), "celery": _slow(False)}
+        with mock.patch.dict(health.PROBES, probes):
+            started = time.monotonic()
+            first = self.client.get("/health/")
+            self.assertLess(time.monotonic() - started, 0.5)
+
+            started = time.monotonic()
+            second = self.client.get("/health/ready/")
+            self.assertLess(time.monotonic() - started, 0.1)
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.json()["celery"], False)
+        self.assertEqual(second.json()["status"], "ok")
+
+    @override_settings(HEALTH_CHECK_TTL=0)
+    def test_stale_results_are_served_while_refreshing_in_background(self):
+        refreshed = threading.Event()
+
+        def database() -> bool:
+            if health._results is not None:
+                refreshed.set()
+                return False
+            return True
+
+        with mock.patch.dict(health.PROBES, {"database": database, "redis": _slow(True, 0), "celery": _slow(True, 0)}):
+            self.assertEqual(self.client.get("/health/").status_code, 200)
+            self.assertEqual(self.client.get("/health/").status_code, 200)  # stale, refresh started
+            self.assertTrue(refreshed.wait(2))
+            deadline = time.monotonic() + 2
+            while health._refreshing and time.monotonic() < deadline:
+                time.sleep(0.01)
+            response = self.client.get("/health/")
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()["status"], "degraded")
+
+    def test_hung_probe_counts_as_failed(self):
+        with mock.patch.object(health, "PROBE_TIMEOUT", 0.05), mock.patch.dict(
+            health.PROBES, {"database": _slow(True, 0), "redis": _slow(True, 0.5), "celery": _slow(True, 0)}
+        ):
+            results = health.probe()
+        self.assertEqual(results, {"database": True, "redis": False, "celery": True})
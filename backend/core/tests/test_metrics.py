@@ -0,0 +1,72 @@
+import time
+from types import SimpleNamespace
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from prometheus_client import REGISTRY
+from rest_framework.test import APITestCase
+
+from analytics.tasks import generate_daily_report
+from revalyt import metrics
+
+User = get_user_model()
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class MetricsEndpointTests(APITestCase):
+    def setUp(self):
+        self.client.force_authenticate(User.objects.create_user(username="metrics", password="pass1234"))
+
+    def test_requests_and_cache_lookups_are_exported(self):
+        route = {"method": "GET", "route": "/api/analytics/kpis/", "status": "200"}
+        before = _sample("revalyt_http_request_duration_seconds_count", **route)
+        misses = _sample("revalyt_kpi_cache_requests_total", namespace="totals", result="miss")
+
+        self.client.get("/api/analytics/kpis/")
+        self.client.get("/api/analytics/kpis/")
+
+        self.assertEqual(_sample("revalyt_http_request_duration_seconds_count", **route), before + 2)
+        self.assertEqual(_sample("revalyt_kpi_cache_requests_total", namespace="totals", result="miss"), misses + 1)
+        self.assertGreater(_sample("revalyt_http_request_db_queries_sum", route="/api/analytics/kpis/"), 0)
+
+        with override_settings(DEBUG=True):
+            body = self.client.get("/metrics").content.decode()
+        self.assertIn('revalyt_http_request_duration_seconds_bucket{le="0.005",method="GET",route="/api/analytics/kpis/"', body)
+        self.assertIn("revalyt_kpi_cache_hit_ratio 0.5", body)
+
+    @override_settings(METRICS_TOKEN="s3cret")
+    def test_token_protects_the_endpoint(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 401)
+        self.assertEqual(self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer s3cret").status_code, 200)
+
+    @override_settings(METRICS_TOKEN="")
+    def test_endpoint_is_closed_without_a_token_outside_debug(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+        with override_settings(DEBUG=True):
+            self.assertEqual(self.client.get("/metrics").status_code, 200)
+
+
+class CeleryMetricsTests(APITestCase):
+    def test_task_runtime_and_queue_wait_are_recorded(self):
+        task = generate_daily_report.name
+        runs = _sample("revalyt_celery_task_duration_seconds_count", task=task, state="SUCCESS")
+
+        generate_daily_report.apply(args=["2024-01-01"])
+
+        self.assertEqual(_sample("revalyt_celery_task_duration_seconds_count", task=task, state="SUCCESS"), runs + 1)
+
+        waits = _sample("revalyt_celery_task_queue_wait_seconds_count", task=task)
+        fake = SimpleNamespace(name=task, request=SimpleNamespace(headers={"revalyt_published_at": time.time() - 2}))
+        metrics._on_prerun(task_id="queued", task=fake)
+        metrics._on_postrun(task_id="queued", task=fake, state="SUCCESS")
+        self.assertEqual(_sample("revalyt_celery_task_queue_wait_seconds_count", task=task), waits + 1)
+        self.assertGreaterEqual(_sample("revalyt_celery_task_queue_wait_seconds_sum", task=task), 2)
+
+    def test_retries_are_counted(self):
+        task = generate_daily_report.name
+        retries = _sample("revalyt_celery_task_retries_total", task=task)
+        metrics._on_retry(sender=generate_daily_report)
+        self.assertEqual(_sample("revalyt_celery_task_retries_total", task=task), retries + 1)
@@ -0,0 +1,51 @@
+import json
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, override_settings
+
+from revalyt import schema
+
+
+class OpenAPISchemaTests(SimpleTestCase):
+    def setUp(self):
+        schema.reset()
+        self.addCleanup(schema.reset)
+
+    def test_stored_schema_is_up_to_date(self):
+        # Fails after an API change until `manage.py openapi_schema` is re-run.
+        call_command("openapi_schema", "--check", stdout=mock.Mock())
+
+    def test_check_fails_on_a_stale_file(self):
+        with mock.patch("core.management.commands.openapi_schema.generate_schema", return_value=b"{}\n"):
+            with self.assertRaisesMessage(CommandError, "out of date"):
+                call_command("openapi_schema", "--check")
+
+    def test_served_from_the_stored_file_without_introspection(self):
+        with mock.patch.object(schema, "generate_schema") as generate:
+            first = self.client.get("/api/schema/?format=json")
+            second = self.client.get("/api/schema/", HTTP_ACCEPT="application/vnd.oai.openapi")
+
+        generate.assert_not_called()
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(json.loads(first.content)["info"]["title"], "RevalytIQ API")
+        self.assertIn("max-age=3600", first["Cache-Control"])
+        self.assertTrue(second.content.startswith(b"openapi:"))
+        self.assertNotEqual(first["ETag"], second["ETag"])
+
+    def test_if_none_match_returns_304(self):
+        etag = self.client.get("/api/schema/?format=json")["ETag"]
+
+        response = self.client.get("/api/schema/?format=json", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertIn("public", response["Cache-Control"])
+
+    @override_settings(DEBUG=True)
+    def test_debug_generates_once_per_process(self):
+        with mock.patch.object(schema, "generate_schema", return_value=b'{"openapi": "3.0.3"}') as generate:
+            self.client.get("/api/schema/?format=json")
+            self.client.get("/api/schema/?format=yaml")
+
+        generate.assert_called_once()
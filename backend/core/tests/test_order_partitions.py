@@ -0,0 +1,89 @@
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+
+from django.core.management import CommandError, call_command
+from django.db import NotSupportedError
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from analytics.tasks import maintain_order_partitions
+from core.models import Customer, Order, OrderItem, Product
+from core.services import order_partitions
+
+
+class PartitionSQLTests(SimpleTestCase):
+    def test_month_helpers(self):
+        self.assertEqual(order_partitions.add_months(date(2025, 11, 1), 3), date(2026, 2, 1))
+        self.assertEqual(order_partitions.add_months(date(2025, 1, 1), -1), date(2024, 12, 1))
+        self.assertEqual(
+            order_partitions.months_between(date(2025, 11, 20), date(2026, 1, 1)),
+            [date(2025, 11, 1), date(2025, 12, 1), date(2026, 1, 1)],
+        )
+        self.assertEqual(order_partitions.partition_name(date(2025, 3, 1)), "core_order_p202503")
+        self.assertEqual(order_partitions.partition_month("core_order_p202503"), date(2025, 3, 1))
+        self.assertIsNone(order_partitions.partition_month("core_order_unpartitioned"))
+
+    @override_settings(TIME_ZONE="Europe/Berlin")
+    def test_partitions_follow_local_months(self):
+        late_utc = datetime(2025, 3, 31, 23, 30, tzinfo=dt_timezone.utc)
+        self.assertEqual(order_partitions.month_start(late_utc), date(2025, 4, 1))
+        self.assertEqual(
+            order_partitions.create_partition_sql(date(2025, 3, 1)),
+            'CREATE TABLE IF NOT EXISTS "core_order_p202503" PARTITION OF "core_order" '
+            "FOR VALUES FROM ('2025-03-01T00:00:00+01:00') TO ('2025-04-01T00:00:00+02:00')",
+        )
+
+    def test_conversion_copies_rows_and_swaps_tables_last(self):
+        statements = order_partitions.conversion_sql([date(2025, 1, 1), date(2025, 2, 1)])
+
+        self.assertIn('PARTITION BY RANGE ("created_at")', statements[0])
+        self.assertIn('PRIMARY KEY ("id", "created_at")', " ".join(statements))
+        partitions = [s for s in statements if "PARTITION OF" in s]
+        self.assertEqual(len(partitions), 3)
+        self.assertIn('"core_order_default" PARTITION OF "core_order_partitioned" DEFAULT', partitions[-1])
+        copy = next(s for s in statements if s.startswith("INSERT"))
+        self.assertIn('"customer_id"', copy)
+        self.assertEqual(
+            statements[-2:],
+            [
+                'ALTER TABLE "core_order" RENAME TO "core_order_unpartitioned"',
+                'ALTER TABLE "core_order_partitioned" RENAME TO "core_order"',
+            ],
+        )
+
+
+    def test_new_months_take_their_rows_from_the_default_partition(self):
+        lock, create, move, attach = order_partitions.attach_partition_sql(date(2025, 3, 1))
+
+        self.assertEqual(lock, 'LOCK TABLE "core_order_default" IN SHARE ROW EXCLUSIVE MODE')
+
+        self.assertIn('CREATE TABLE IF NOT EXISTS "core_order_p202503" (LIKE "core_order"', create)
+        self.assertIn('DELETE FROM "core_order_default"', move)
+        self.assertIn('INSERT INTO "core_order_p202503"', move)
+        self.assertTrue(attach.startswith('ALTER TABLE "core_order" ATTACH PARTITION "core_order_p202503"'))
+        self.assertEqual(
+            order_partitions.detach_partition_sql("core_order_p202401"),
+            'ALTER TABLE "core_order" DETACH PARTITION "core_order_p202401"',
+        )
+
+
+class PartitionMaintenanceOffPostgresTests(TestCase):
+    def test_maintenance_is_a_noop_when_not_partitioned(self):
+        self.assertFalse(order_partitions.is_partitioned())
+        self.assertEqual(maintain_order_partitions.run(), {"created": [], "detached": []})
+
+    def test_conversion_requires_postgres(self):
+        with self.assertRaises(NotSupportedError):
+            order_partitions.convert(3)
+        with self.assertRaisesMessage(CommandError, "requires PostgreSQL"):
+            call_command("order_partitions", "--convert")
+        with self.assertRaisesMessage(CommandError, "is not partitioned"):
+            call_command("order_partitions")
+
+    def test_deleting_an_order_still_removes_its_items(self):
+        customer = Customer.objects.create(name="Part", email="part@example.com")
+        product = Product.objects.create(sku="P-1", title="Widget", unit_price=Decimal("5.00"))
+        order = Order.objects.create(customer=customer, amount=Decimal("5.00"))
+        OrderItem.objects.create(order=order, product=product, qty=1, unit_price=Decimal("5.00"))
+
+        order.delete()
+        self.assertFalse(OrderItem.objects.exists())
@@ -0,0 +1,62 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APITestCase
+
+from revalyt.middleware import _record_query, install_query_recorder
+
+User = get_user_model()
+
+
+def _timings(header: str) -> dict[str, float]:
+    return {name: float(value) for name, value in re.findall(r"(\w+);dur=([\d.]+)", header)}
+
+
+class RequestTimingTests(APITestCase):
+    def setUp(self):
+        User.objects.create_user(username="timer", password="pass1234")
+        self.client.post("/api/auth/token/", {"username": "timer", "password": "pass1234"}, format="json")
+
+    def test_server_timing_splits_db_auth_view_and_render(self):
+        response = self.client.get("/api/analytics/kpis/")
+
+        self.assertEqual(response.status_code, 200)
+        header = response["Server-Timing"]
+        timings = _timings(header)
+        self.assertEqual(set(timings), {"db", "auth", "view", "render", "total"})
+        self.assertRegex(header, r'db;dur=[\d.]+;desc="[1-9]\d* queries"')
+        self.assertGreater(timings["auth"], 0)
+        self.assertGreaterEqual(timings["total"], timings["view"])
+
+    @override_settings(REQUEST_TIMING_LOG_THRESHOLD_MS=0)
+    def test_slow_requests_are_logged_with_structured_fields(self):
+        with self.assertLogs("revalyt.requests", level="WARNING") as logs:
+            self.client.get("/api/analytics/kpis/")
+
+        record = logs.records[-1]
+        self.assertIn("path=/api/analytics/kpis/", record.getMessage())
+        self.assertEqual(record.request_timing["status"], 200)
+        self.assertGreaterEqual(record.request_timing["queries"], 1)
+
+    @override_settings(SERVER_TIMING_HEADER=False, REQUEST_TIMING_LOG_THRESHOLD_MS=-1)
+    def test_header_and_log_can_be_disabled(self):
+        with self.assertNoLogs("revalyt.requests"):
+            response = self.client.get("/api/analytics/kpis/")
+        self.assertNotIn("Server-Timing", response)
+
+
+class QueryRecorderInstallTests(SimpleTestCase):
+    def test_recorder_survives_an_active_execute_wrapper(self):
+        def outer(execute, sql, params, many, context):
+            return execute(sql, params, many, context)
+
+        saved = connection.execute_wrappers[:]
+        connection.execute_wrappers[:] = []
+        try:
+            with connection.execute_wrapper(outer):
+                install_query_recorder(connection)
+            self.assertEqual(connection.execute_wrappers, [_record_query])
+        finally:
+            connection.execute_wrappers[:] = saved
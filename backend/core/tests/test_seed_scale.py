@@ -0,0 +1,45 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models import Count, F, Sum
+from django.test import TestCase
+from django.utils import timezone
+
+from analytics.models import DailyKPI
+from core.models import Customer, Order, OrderChange, OrderItem
+from core.services.kpi_service import order_kpis
+
+
+class SeedScaleTests(TestCase):
+    def test_scale_mode_replaces_data_and_computes_amounts_in_sql(self):
+        stale = Customer.objects.create(name="Old", email="old@example.com", created_at=timezone.now())
+        Order.objects.create(customer=stale, amount=Decimal("5.00"), status="paid", created_at=timezone.now())
+
+        out = StringIO()
+        call_command("seed_demo", orders=500, days=30, customers=40, batch_size=120, stdout=out)
+
+        self.assertIn("Scale dataset loaded: 500 orders", out.getvalue())
+        self.assertFalse(Customer.objects.filter(email="old@example.com").exists())
+        self.assertEqual(Customer.objects.count(), 40)
+        self.assertEqual(Order.objects.count(), 500)
+        self.assertFalse(OrderChange.objects.exists())
+
+        order = Order.objects.order_by("id").first()
+        expected = OrderItem.objects.filter(order=order).aggregate(total=Sum(F("qty") * F("unit_price")))["total"]
+        self.assertEqual(order.amount, expected)
+
+        today = timezone.localdate()
+        self.assertEqual(DailyKPI.objects.filter(date__gte=today - timedelta(days=30)).count(), 31)
+        raw = order_kpis(timezone.now() - timedelta(days=31), timezone.now() + timedelta(days=1))
+        rolled = DailyKPI.objects.aggregate(orders=Sum("orders"))["orders"]
+        self.assertEqual(raw["orders"], rolled)
+
+    def test_skew_concentrates_orders_on_top_customers(self):
+        call_command("seed_demo", orders=400, days=10, customers=50, skew=1.5, stdout=StringIO())
+        counts = sorted(
+            Order.objects.values("customer_id").annotate(n=Count("id")).values_list("n", flat=True),
+            reverse=True,
+        )
+        self.assertGreater(counts[0], 400 / 50 * 3)
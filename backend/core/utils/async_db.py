@@ -0,0 +1,35 @@
+from __future__ import annotations
+from collections.abc import Callable
+from typing import TypeVar
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections, connections
+
+T = TypeVar("T")
+
+
+def _in_transaction() -> bool:
+    return any(connection.in_atomic_block for connection in connections.all(initialized_only=True))
+
+
+def _isolated(call: Callable[[], T]) -> Callable[[], T]:
+    def run() -> T:
+        try:
+            return call()
+        finally:
+            close_old_connections()
+
+    return run
+
+
+async def run_parallel(call: Callable[[], T]) -> T:
+    """
+    Run a blocking ORM call on its own worker thread (and so its own DB
+    connection) so several can be awaited together with ``asyncio.gather``.
+
+    Inside an open transaction other connections cannot see its writes, so the
+    call then runs on the request's own thread instead. Pool threads keep their
+    connection for ``CONN_MAX_AGE``; the executor size bounds how many exist.
+    """
+    if await sync_to_async(_in_transaction)():
+        return await sync_to_async(call)()
+    return await sync_to_async(_isolated(call), thread_sensitive=False)()
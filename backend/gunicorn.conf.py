@@ -0,0 +1,24 @@
+"""
+Gunicorn hooks for Prometheus multiprocess mode.
+
+When ``PROMETHEUS_MULTIPROC_DIR`` is set, each worker writes its metrics to
+that directory and ``/metrics`` sums them. The master wipes stale files on
+start and marks exited workers dead so their live gauges are dropped.
+"""
+
+import os
+
+_multiproc_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+
+def on_starting(server):
+    from revalyt.metrics import reset_multiprocess_dir
+
+    reset_multiprocess_dir()
+
+
+def child_exit(server, worker):
+    if _multiproc_dir:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
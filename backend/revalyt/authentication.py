@@ -1,23 +1,173 @@
 from __future__ import annotations
 
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, NamedTuple
+
 from django.conf import settings
+from django.core.cache import cache
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .middleware import add_timing
+
+_VERSION_KEY = "auth:user-version:{}"
+_REVOKED_KEY = "auth:revoked-token:{}"
+
+
+class _Entry(NamedTuple):
+    token: Any
+    user: Any
+    version: int
+    expires_at: float
+
+
+class TokenCache:
+    """
+    Bounded, thread-safe LRU of validated access tokens, keyed by a SHA-256 of
+    the raw token. Entries live until the token expires or ``AUTH_CACHE_TTL``
+    passes, whichever comes first.
+
+    The map is per process, so revocation goes through the shared Django
+    cache: a password change or deactivation bumps a per-user version counter,
+    and logout marks the token itself as revoked until it expires. Every
+    process drops affected entries on their next use, and a revoked token is
+    refused even where it was never cached. A hit therefore costs one
+    ``get_many`` instead of the user query and the signature check.
+    """
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(raw_token: str | bytes) -> str:
+        if isinstance(raw_token, str):
+            raw_token = raw_token.encode()
+        return hashlib.sha256(raw_token).hexdigest()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        version, revoked = auth_state(entry.user.pk, key)
+        if revoked or entry.version != version:
+            self.discard(key)
+            return None
+        # Views may mutate request.user; never hand out the cached instance.
+        return copy.copy(entry.user), entry.token
+
+    def set(self, key: str, user, token, version: int) -> None:
+        max_entries = getattr(settings, "AUTH_CACHE_MAX_ENTRIES", 1024)
+        if max_entries <= 0:
+            return
+        expires_at = min(float(token["exp"]), time.time() + getattr(settings, "AUTH_CACHE_TTL", 300))
+        with self._lock:
+            self._entries[key] = _Entry(token, copy.copy(user), version, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def discard_user(self, user_id) -> None:
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry.user.pk == user_id]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+token_cache = TokenCache()
+
+
+def user_version(user_id) -> int:
+    return cache.get(_VERSION_KEY.format(user_id), 0)
+
+
+def auth_state(user_id, key: str) -> tuple[int, bool]:
+    """``(user version, token revoked)`` for a ``TokenCache.key`` in one cache round trip."""
+    version_key, revoked_key = _VERSION_KEY.format(user_id), _REVOKED_KEY.format(key)
+    values = cache.get_many([version_key, revoked_key])
+    return values.get(version_key, 0), revoked_key in values
+
+
+def invalidate_user(user_id) -> None:
+    """Drop every cached token of ``user_id`` in this and (via the shared version) every other process."""
+    key = _VERSION_KEY.format(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+    token_cache.discard_user(user_id)
+
+
+def invalidate_token(token) -> None:
+    """Revoke a validated access token in every process until it expires (logout)."""
+    if token is None:
+        return
+    key = TokenCache.key(token.token)
+    remaining = int(float(token["exp"]) - time.time()) + 1
+    if remaining > 0:
+        cache.set(_REVOKED_KEY.format(key), 1, timeout=remaining)
+    token_cache.discard(key)
 
 
 class CookieJWTAuthentication(JWTAuthentication):
     """
     Extend SimpleJWT authentication to read access tokens from httpOnly cookies.
+    Validated tokens and their users are kept in ``token_cache``.
     """
 
     def authenticate(self, request):
+        started = time.perf_counter()
+        try:
+            return self._authenticate(request)
+        finally:
+            add_timing(request, "auth", time.perf_counter() - started)
+
+    def _authenticate(self, request):
+        raw_token = self.get_raw_token_from_request(request)
+        if raw_token is None:
+            return None
+
+        key = TokenCache.key(raw_token)
+        cached = token_cache.get(key)
+        if cached is not None:
+            return cached
+
+        validated_token = self.get_validated_token(raw_token)
+        # Read the version before the user so a concurrent revocation is not lost.
+        version, revoked = auth_state(validated_token.get(api_settings.USER_ID_CLAIM), key)
+        if revoked:
+            raise InvalidToken("Token has been revoked.")
+        user = self.get_user(validated_token)
+        token_cache.set(key, user, validated_token, version)
+        return user, validated_token
+
+    def get_raw_token_from_request(self, request):
         header = self.get_header(request)
-        if header is None:
-            cookie_name = settings.SIMPLE_JWT.get("AUTH_COOKIE")
-            if not cookie_name:
-                return None
-            raw_token = request.COOKIES.get(cookie_name)
-            if raw_token is None:
-                return None
-            validated_token = self.get_validated_token(raw_token)
-            return self.get_user(validated_token), validated_token
-        return super().authenticate(request)
+        if header is not None:
+            return self.get_raw_token(header)
+        cookie_name = settings.SIMPLE_JWT.get("AUTH_COOKIE")
+        if not cookie_name:
+            return None
+        return request.COOKIES.get(cookie_name)
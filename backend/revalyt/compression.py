@@ -0,0 +1,62 @@
+"""
+Response compression for API payloads.
+
+Django's ``GZipMiddleware`` compresses anything over 200 bytes, static files
+included. This variant only touches API content types, skips bodies under
+``RESPONSE_COMPRESSION_MIN_BYTES`` (where the CPU cost outweighs the bytes
+saved), and prefers Brotli when the ``brotli`` package is installed and the
+client accepts it. Streaming exports keep Django's incremental gzip.
+"""
+
+from __future__ import annotations
+
+import re
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/vnd.oai.openapi",
+    "application/x-ndjson",
+    "text/csv",
+)
+BROTLI_QUALITY = 5
+
+_accepts_brotli = re.compile(r"\bbr\b")
+
+
+def _compressible(response) -> bool:
+    return response.get("Content-Type", "").startswith(COMPRESSIBLE_TYPES)
+
+
+class APICompressionMiddleware(GZipMiddleware):
+    def process_response(self, request, response):
+        if not _compressible(response) or response.has_header("Content-Encoding"):
+            return response
+        if not response.streaming and len(response.content) < getattr(
+            settings, "RESPONSE_COMPRESSION_MIN_BYTES", 1024
+        ):
+            return response
+
+        accept_encoding = request.META.get("HTTP_ACCEPT_ENCODING", "")
+        if brotli is None or response.streaming or not _accepts_brotli.search(accept_encoding):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        compressed = brotli.compress(response.content, quality=BROTLI_QUALITY)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers["Content-Length"] = str(len(compressed))
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = "br"
+        return response
@@ -0,0 +1,146 @@
+"""
+Read-replica routing.
+
+Reads of the analytics tables (apps in ``DATABASE_REPLICA_APPS``: orders,
+rollups, the change log) made while serving a request go to one of
+``DATABASE_REPLICAS``. Everything else stays on ``default``: every write, the
+auth, session and token tables, Celery tasks and management commands (which
+build rollups and must not read stale rows). Within a request:
+
+* unsafe methods (POST, PUT, PATCH, DELETE) read from the primary throughout;
+* the first write pins the rest of the request to the primary, so it reads
+  what it just wrote;
+* reads inside a transaction on the primary stay on the primary;
+* a replica more than ``DATABASE_REPLICA_MAX_LAG`` seconds behind, or one
+  that cannot be reached, is skipped until its next lag check; with no
+  replica left, reads fall back to the primary.
+
+Streaming response bodies are produced after the request scope has closed
+and so read from the primary.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+PRIMARY = DEFAULT_DB_ALIAS
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Seconds since the last replayed transaction, or 0 when the replica has
+# replayed everything it received (an idle primary must not look like lag).
+LAG_SQL = (
+    "SELECT CASE WHEN NOT pg_is_in_recovery() "
+    "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class RoutingState:
+    """Per-request routing flags; shared (not copied) with worker threads of async views."""
+
+    __slots__ = ("pinned", "forced")
+
+    def __init__(self, pinned: bool = False):
+        self.pinned = pinned
+        self.forced = 0
+
+
+_state: ContextVar[RoutingState | None] = ContextVar("db_routing", default=None)
+
+_lock = threading.Lock()
+_lag: dict[str, tuple[float, float]] = {}
+
+
+@contextmanager
+def replica_reads(pinned: bool = False):
+    """Allow replica reads for the duration of the block (one request)."""
+    token = _state.set(RoutingState(pinned))
+    try:
+        yield
+    finally:
+        _state.reset(token)
+
+
+def pin_to_primary() -> None:
+    """Send the rest of the current request's reads to the primary."""
+    state = _state.get()
+    if state is not None:
+        state.pinned = True
+
+
+@contextmanager
+def primary_reads():
+    """Read from the primary within the block, e.g. to refill a cache right after a write."""
+    state = _state.get()
+    if state is None:
+        yield
+        return
+    state.forced += 1
+    try:
+        yield
+    finally:
+        state.forced -= 1
+
+
+def measure_lag(alias: str) -> float:
+    connection = connections[alias]
+    if connection.vendor != "postgresql":
+        return 0.0
+    with connection.cursor() as cursor:
+        cursor.execute(LAG_SQL)
+        return float(cursor.fetchone()[0])
+
+
+def replica_lag(alias: str) -> float:
+    """Replication lag in seconds, re-measured every ``DATABASE_REPLICA_LAG_CHECK_INTERVAL``."""
+    now = time.monotonic()
+    with _lock:
+        cached = _lag.get(alias)
+    if cached is not None and now - cached[1] < getattr(settings, "DATABASE_REPLICA_LAG_CHECK_INTERVAL", 5):
+        return cached[0]
+    try:
+        lag = measure_lag(alias)
+    except DatabaseError:
+        lag = float("inf")
+    with _lock:
+        _lag[alias] = (lag, now)
+    return lag
+
+
+def reset_lag() -> None:
+    """Forget measured lag (tests, or after reconfiguring replicas)."""
+    with _lock:
+        _lag.clear()
+
+
+def healthy_replicas() -> list[str]:
+    max_lag = getattr(settings, "DATABASE_REPLICA_MAX_LAG", 10)
+    return [alias for alias in getattr(settings, "DATABASE_REPLICAS", ()) if replica_lag(alias) <= max_lag]
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or state.pinned or state.forced:
+            return None
+        if model._meta.app_label not in getattr(settings, "DATABASE_REPLICA_APPS", ()):
+            return None
+        if connections[PRIMARY].in_atomic_block:
+            return None
+        replicas = healthy_replicas()
+        return random.choice(replicas) if replicas else None
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
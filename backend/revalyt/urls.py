@@ -1,16 +1,18 @@
 from django.contrib import admin
 from django.urls import include, path
 from django.views.generic import RedirectView
-from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
+from drf_spectacular.views import SpectacularRedocView, SpectacularSwaggerView
 
-from .health import health
+from .health import health, live
+from .metrics import metrics_view
+from .schema import schema_view
 
 urlpatterns = [
     path("", RedirectView.as_view(url="/api/docs/", permanent=False)),
     path("admin/", admin.site.urls),
     path("api/analytics/", include("analytics.urls")),
     path("api/auth/", include("users.urls")),
-    path("api/schema/", SpectacularAPIView.as_view(), name="api-schema"),
+    path("api/schema/", schema_view, name="api-schema"),
     path(
         "api/docs/",
         SpectacularSwaggerView.as_view(url_name="api-schema"),
@@ -22,4 +24,7 @@ urlpatterns = [
         name="redoc",
     ),
     path("health/", health, name="health"),
+    path("health/ready/", health, name="health-ready"),
+    path("health/live/", live, name="health-live"),
+    path("metrics", metrics_view, name="metrics"),
 ]
@@ -0,0 +1,87 @@
+"""
+Refresh-token blacklist kept in the cache (Redis in production).
+
+A revoked token is stored as one key per JTI, expiring when the token itself
+would, so the store never needs pruning and a lookup is a single ``GET``.
+This replaces simplejwt's ``OutstandingToken``/``BlacklistedToken`` tables,
+which gain two rows per refresh and are never cleaned up.
+
+While ``JWT_BLACKLIST_DB_TABLES`` is on, tokens revoked before the switch are
+still honoured from those tables; ``manage.py migrate_token_blacklist`` copies
+them into the cache so the tables can be dropped.
+"""
+
+from __future__ import annotations
+
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import BlacklistMixin, RefreshToken
+
+KEY_PREFIX = "jwt:blacklist"
+
+
+def _store():
+    return caches[getattr(settings, "JWT_BLACKLIST_CACHE_ALIAS", "default")]
+
+
+def _key(jti: str) -> str:
+    return f"{KEY_PREFIX}:{jti}"
+
+
+def db_tables_enabled() -> bool:
+    return "rest_framework_simplejwt.token_blacklist" in settings.INSTALLED_APPS
+
+
+def blacklist_jti(jti: str, exp: float) -> bool:
+    """Revoke ``jti`` until ``exp`` (epoch seconds); already-expired tokens are skipped."""
+    remaining = int(exp - time.time()) + 1
+    if remaining <= 0:
+        return False
+    _store().set(_key(jti), 1, timeout=remaining)
+    return True
+
+
+def is_blacklisted(jti: str) -> bool:
+    if _store().get(_key(jti)) is not None:
+        return True
+    if db_tables_enabled():
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+    return False
+
+
+class CacheBlacklistRefreshToken(RefreshToken):
+    """
+    ``RefreshToken`` whose blacklist lives in the cache. Nothing is written on
+    issue or rotation; only revocation stores a key. Cache errors propagate, so
+    an unreachable store rejects refreshes rather than accepting revoked tokens.
+    """
+
+    def verify(self, *args, **kwargs) -> None:
+        self.check_blacklist()
+        super(BlacklistMixin, self).verify(*args, **kwargs)
+
+    def check_blacklist(self) -> None:
+        if is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self) -> bool:
+        return blacklist_jti(self.payload[api_settings.JTI_CLAIM], self.payload["exp"])
+
+    def outstand(self) -> None:
+        return None
+
+    @classmethod
+    def for_user(cls, user):
+        return super(BlacklistMixin, cls).for_user(user)
+
+
+class CacheBlacklistRefreshSerializer(TokenRefreshSerializer):
+    token_class = CacheBlacklistRefreshToken
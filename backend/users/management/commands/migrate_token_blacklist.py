@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from users.blacklist import blacklist_jti, db_tables_enabled
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy unexpired entries of simplejwt's BlacklistedToken table into the cache "
+        "blacklist. --flush then empties the token tables so they can be dropped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--flush",
+            action="store_true",
+            help="Delete every OutstandingToken/BlacklistedToken row once the copy succeeds.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        if not db_tables_enabled():
+            raise CommandError("rest_framework_simplejwt.token_blacklist is not installed; nothing to migrate.")
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+        revoked = (
+            BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+            .values_list("token__jti", "token__expires_at")
+            .iterator(chunk_size=options["batch_size"])
+        )
+        copied = sum(blacklist_jti(jti, expires_at.timestamp()) for jti, expires_at in revoked)
+        if options["flush"]:
+            deleted, _ = OutstandingToken.objects.all().delete()
+            self.stdout.write(f"Deleted {deleted} token table rows.")
+        self.stdout.write(self.style.SUCCESS(f"Copied {copied} revoked refresh tokens to the cache blacklist."))
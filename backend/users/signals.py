@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from revalyt.authentication import invalidate_user
+
+
+def _invalidate_now_and_on_commit(user_id) -> None:
+    # Bumping again after commit stops a concurrent request from re-caching the
+    # pre-commit row under the new version.
+    invalidate_user(user_id)
+    transaction.on_commit(lambda: invalidate_user(user_id))
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def _invalidate_cached_tokens(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Any change to a user (password, ``is_active``, profile fields) drops the
+    cached authentications that carry a copy of it. ``last_login`` updates from
+    logging in are the one write that cannot make a cached copy unsafe.
+    """
+    if created or (update_fields is not None and set(update_fields) <= {"last_login"}):
+        return
+    _invalidate_now_and_on_commit(instance.pk)
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def _invalidate_deleted_user(sender, instance, **kwargs):
+    _invalidate_now_and_on_commit(instance.pk)
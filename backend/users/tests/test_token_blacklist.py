@@ -0,0 +1,87 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from users.blacklist import CacheBlacklistRefreshToken, _key, is_blacklisted
+
+User = get_user_model()
+
+REFRESH_URL = "/api/auth/token/refresh/"
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class CacheBlacklistTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="rotator", password="pass1234")
+        self.client.post("/api/auth/token/", {"username": "rotator", "password": "pass1234"}, format="json")
+        self.refresh = self.client.cookies["revalyt_refresh"].value
+
+    def test_rotation_blacklists_in_cache_without_token_rows(self):
+        response = self.client.post(REFRESH_URL, {"refresh": self.refresh}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(OutstandingToken.objects.count(), 0)
+        self.assertEqual(BlacklistedToken.objects.count(), 0)
+        jti = CacheBlacklistRefreshToken(response.cookies["revalyt_refresh"].value, verify=False)["jti"]
+        self.assertFalse(is_blacklisted(jti))
+
+    def test_rotated_token_cannot_be_replayed(self):
+        self.client.post(REFRESH_URL, {"refresh": self.refresh}, format="json")
+
+        replay = self.client.post(REFRESH_URL, {"refresh": self.refresh}, format="json")
+
+        self.assertEqual(replay.status_code, 401)
+
+    def test_entry_expires_with_the_token(self):
+        token = CacheBlacklistRefreshToken(self.refresh)
+
+        self.assertTrue(token.blacklist())
+        self.assertTrue(is_blacklisted(token["jti"]))
+        token.set_jti()
+        token.set_exp(lifetime=timedelta(seconds=-1))
+        self.assertFalse(token.blacklist())
+        self.assertFalse(is_blacklisted(token["jti"]))
+
+    def test_check_is_cache_only_once_the_tables_are_gone(self):
+        with mock.patch("users.blacklist.db_tables_enabled", return_value=False):
+            with self.assertNumQueries(0):
+                CacheBlacklistRefreshToken(self.refresh)
+
+    def test_logout_blacklists_the_refresh_cookie(self):
+        response = self.client.post("/api/auth/logout/")
+
+        self.assertEqual(response.status_code, 205)
+        self.assertTrue(is_blacklisted(CacheBlacklistRefreshToken(self.refresh, verify=False)["jti"]))
+
+    def test_tokens_revoked_in_the_db_tables_stay_revoked(self):
+        legacy = RefreshToken.for_user(self.user)
+        legacy.blacklist()
+
+        response = self.client.post(REFRESH_URL, {"refresh": str(legacy)}, format="json")
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_migrate_command_copies_and_flushes(self):
+        legacy = RefreshToken.for_user(self.user)
+        legacy.blacklist()
+        expired = RefreshToken.for_user(self.user)
+        expired.blacklist()
+        OutstandingToken.objects.filter(jti=expired["jti"]).update(expires_at=timezone.now() - timedelta(days=1))
+
+        out = StringIO()
+        call_command("migrate_token_blacklist", "--flush", stdout=out)
+
+        self.assertIn("Copied 1 revoked refresh tokens", out.getvalue())
+        self.assertEqual(OutstandingToken.objects.count(), 0)
+        self.assertIsNotNone(cache.get(_key(legacy["jti"])))
+        self.assertIsNone(cache.get(_key(expired["jti"])))
+        self.assertTrue(is_blacklisted(legacy["jti"]))
@@ -16,9 +16,11 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.exceptions import TokenError, InvalidToken
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
+from revalyt.authentication import invalidate_token
+from users.blacklist import CacheBlacklistRefreshSerializer, CacheBlacklistRefreshToken
+
 
 def _normalize_host(raw_value: Optional[str]) -> Optional[str]:
     if not raw_value:
@@ -133,9 +135,8 @@ def _set_auth_cookies(
 
 def _clear_auth_cookies(response: Response, request: HttpRequest) -> None:
     cfg = settings.SIMPLE_JWT
+    # delete_cookie() derives ``secure`` from SameSite=None itself.
     cookie_kwargs = {
-        "secure": cfg.get("AUTH_COOKIE_SECURE", not settings.DEBUG),
-        "httponly": cfg.get("AUTH_COOKIE_HTTP_ONLY", True),
         "samesite": cfg.get("AUTH_COOKIE_SAMESITE", "None"),
         "domain": _cookie_domain(request),
         "path": cfg.get("AUTH_COOKIE_PATH", "/"),
@@ -150,6 +151,8 @@ class EmailOrUsernameTokenSerializer(TokenObtainPairSerializer):
     Allow logging in with either the username or e-mail address.
     """
 
+    token_class = CacheBlacklistRefreshToken
+
     def validate(self, attrs):
         attrs = attrs.copy()
         username_input = attrs.get(self.username_field)
@@ -195,6 +198,7 @@ class CookieTokenRefreshView(TokenRefreshView):
     """
 
     permission_classes = [permissions.AllowAny]
+    serializer_class = CacheBlacklistRefreshSerializer
 
     def post(self, request, *args, **kwargs):
         refresh_cookie = settings.SIMPLE_JWT.get("AUTH_COOKIE_REFRESH")
@@ -229,9 +233,10 @@ class CookieTokenLogoutView(APIView):
         response = Response({"detail": "Logged out."}, status=status.HTTP_205_RESET_CONTENT)
         if refresh_token:
             try:
-                token = RefreshToken(refresh_token)
+                token = CacheBlacklistRefreshToken(refresh_token)
                 token.blacklist()
             except (TokenError, InvalidToken):
                 pass
+        invalidate_token(request.auth)
         _clear_auth_cookies(response, request)
         return response